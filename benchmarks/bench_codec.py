@@ -0,0 +1,101 @@
+"""
+Benchmark JSON encode/decode and compression cost on /chat/history bodies.
+
+Usage:
+    python benchmarks/bench_codec.py [--sessions 30] [--messages 20] [--repeat 200]
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import timeit
+import uuid
+import zlib
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from services import codec  # noqa: E402
+
+WORDS = (
+    "the model returns a detailed answer about deployment latency caching "
+    "streaming tokens users question context session history python api "
+    "gateway lambda cold start retry budget circuit breaker unicode ✓ café"
+).split()
+
+def build_history(sessions: int, messages: int, seed: int = 7) -> dict:
+    """
+    Build a realistic /chat/history response body.
+
+    Args:
+        sessions: Number of chat sessions
+        messages: Messages per session
+        seed: Random seed for reproducible bodies
+
+    Returns:
+        dict: Response body with a ``sessions`` list
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    body = []
+
+    for i in range(sessions):
+        created = start + timedelta(hours=i)
+        history = []
+        for j in range(messages):
+            role = "user" if j % 2 == 0 else "assistant"
+            length = rng.randint(8, 40) if role == "user" else rng.randint(80, 400)
+            history.append({
+                "role": role,
+                "content": " ".join(rng.choice(WORDS) for _ in range(length)),
+                "timestamp": (created + timedelta(seconds=30 * j)).isoformat()
+            })
+        body.append({
+            "session_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "created_at": created.isoformat(),
+            "messages": history
+        })
+
+    return {"sessions": body}
+
+def bench(label: str, fn, repeat: int) -> float:
+    """Time a function and print the mean duration in milliseconds."""
+    seconds = min(timeit.repeat(fn, number=repeat, repeat=3)) / repeat
+    print(f"  {label:<28} {seconds * 1000:8.3f} ms")
+    return seconds
+
+def main():
+    """Run the codec benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=30)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    body = build_history(args.sessions, args.messages)
+    raw = json.dumps(body).encode("utf-8")
+    gzipped = gzip.compress(raw, compresslevel=5)
+    deflated = zlib.compress(raw)
+
+    print(f"History body: {args.sessions} sessions x {args.messages} messages")
+    print(f"  identity {len(raw):>10,} bytes")
+    print(f"  gzip     {len(gzipped):>10,} bytes ({len(gzipped) / len(raw):.1%})")
+    print(f"  deflate  {len(deflated):>10,} bytes ({len(deflated) / len(raw):.1%})")
+    print(f"Codec backend: {codec.JSON_BACKEND}")
+
+    print("Encode")
+    bench("stdlib json.dumps", lambda: json.dumps(body).encode("utf-8"), args.repeat)
+    bench("codec.dumps", lambda: codec.dumps(body), args.repeat)
+
+    print("Decode")
+    bench("requests-style json.loads", lambda: json.loads(raw.decode("utf-8")), args.repeat)
+    bench("codec.loads", lambda: codec.loads(raw), args.repeat)
+    bench("gunzip + codec.loads", lambda: codec.loads(gzip.decompress(gzipped)), args.repeat)
+
+    print("Compress request body")
+    bench("codec.encode_body(gzip)", lambda: codec.encode_body(body, compress=True), args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark per-rerun Cognito client construction cost before and after sharing.
+
+Before: every rerun built ``AuthenticationManager`` twice (``ChatApplication``
+and ``Sidebar``), each creating a fresh ``boto3.client('cognito-idp')``.
+After: ``get_cognito_client`` returns one cached client per region.
+
+Usage:
+    python benchmarks/bench_cognito_client.py [--reruns 50] [--region us-west-2]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import boto3  # noqa: E402
+
+from services.cognito import get_cognito_client  # noqa: E402
+
+CLIENTS_PER_RERUN = 2
+
+def measure(label: str, build, reruns: int):
+    """Time and trace allocations of building the clients for each rerun."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _ in range(reruns):
+        for _ in range(CLIENTS_PER_RERUN):
+            build()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  {label:<8} {elapsed / reruns * 1000:9.3f} ms/rerun   peak alloc {peak / 1024:10.1f} KiB")
+
+def main():
+    """Run the client construction benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reruns", type=int, default=50)
+    parser.add_argument("--region", default=os.environ.get("AWS_REGION", "us-west-2"))
+    args = parser.parse_args()
+
+    # Warm imports and the shared client so only steady-state cost is measured
+    boto3.client("cognito-idp", region_name=args.region)
+    get_cognito_client(args.region)
+
+    print(f"{args.reruns} reruns, {CLIENTS_PER_RERUN} AuthenticationManager instances each")
+    measure("before", lambda: boto3.client("cognito-idp", region_name=args.region), args.reruns)
+    measure("after", lambda: get_cognito_client(args.region), args.reruns)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Compare the adaptive concurrency limiter with a fixed limit under a surge.
+
+A simulated backend serves requests in ``--base-latency`` seconds while at
+most ``--capacity`` are in flight and proportionally slower beyond that,
+failing requests that would take longer than ``--timeout``. Client
+threads send requests back to back through either a fixed limit or the
+AIMD limiter, and the run reports throughput, latency percentiles as seen
+by clients (including queueing), failures and shed requests.
+
+Usage:
+    python benchmarks/bench_concurrency.py [--clients 200] [--capacity 20]
+        [--duration 10] [--base-latency 0.05] [--timeout 1.0] [--fixed 100]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from services.concurrency_limiter import AdaptiveConcurrencyLimiter  # noqa: E402
+from utils.exceptions import OverloadedError  # noqa: E402
+
+class SimulatedBackend:
+    """Backend whose latency grows once more than ``capacity`` requests are in flight."""
+    def __init__(self, capacity: int, base_latency: float, timeout: float):
+        self.capacity = capacity
+        self.base_latency = base_latency
+        self.timeout = timeout
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def call(self) -> bool:
+        """Serve one request; returns False if it timed out."""
+        with self._lock:
+            self._in_flight += 1
+            load = self._in_flight
+        latency = self.base_latency * max(1.0, load / self.capacity)
+        time.sleep(min(latency, self.timeout))
+        with self._lock:
+            self._in_flight -= 1
+        return latency <= self.timeout
+
+class FixedLimiter(AdaptiveConcurrencyLimiter):
+    """The same queueing and shedding with a limit that never adapts."""
+    def __init__(self, limit: int, **kwargs):
+        super().__init__(initial_limit=limit, min_limit=limit, max_limit=limit, **kwargs)
+
+def run(limiter, backend: SimulatedBackend, clients: int, duration: float) -> dict:
+    """Drive the backend through a limiter from many client threads."""
+    latencies, failures, shed = [], [0], [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            try:
+                attempt_started = limiter.acquire()
+            except OverloadedError:
+                with lock:
+                    shed[0] += 1
+                time.sleep(0.05)
+                continue
+            ok = backend.call()
+            latency = time.monotonic() - attempt_started
+            limiter.release(attempt_started, latency, ok)
+            with lock:
+                if ok:
+                    latencies.append(time.monotonic() - started)
+                else:
+                    failures[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else 0.0  # noqa: E731
+    return {
+        "ok/s": len(latencies) / duration,
+        "p50": pick(0.50),
+        "p99": pick(0.99),
+        "failed": failures[0],
+        "shed": shed[0],
+        "limit": limiter.limit,
+    }
+
+def main():
+    """Run the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--capacity", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--base-latency", type=float, default=0.05)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--fixed", type=int, default=100)
+    args = parser.parse_args()
+
+    limiters = {
+        f"fixed {args.fixed}": FixedLimiter(args.fixed),
+        "adaptive": AdaptiveConcurrencyLimiter(),
+    }
+
+    print(f"{args.clients} clients, backend capacity {args.capacity}, {args.duration:.0f}s each")
+    print(f"  {'limiter':<12} {'ok/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'failed':>7} {'shed':>7} {'limit':>6}")
+    for name, limiter in limiters.items():
+        backend = SimulatedBackend(args.capacity, args.base_latency, args.timeout)
+        r = run(limiter, backend, args.clients, args.duration)
+        print(f"  {name:<12} {r['ok/s']:8.1f} {r['p50'] * 1000:8.0f} {r['p99'] * 1000:8.0f} "
+              f"{r['failed']:7d} {r['shed']:7d} {r['limit']:6d}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark limiter store backends and check that they never over-admit.
+
+For each backend, measures the latency of a single check, then has several
+processes race to consume one shared key and verifies that exactly
+``limit`` units were granted. The redis backend runs against the local
+stand-in unless ``--redis-url`` points at a real server.
+
+Usage:
+    python benchmarks/bench_limiter.py [--checks 2000] [--procs 4] [--limit 500]
+        [--backends memory sqlite redis] [--redis-url redis://localhost:6379/0]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from utils.limiter_store import MemoryLimiterStore, RedisLimiterStore, SQLiteLimiterStore  # noqa: E402
+
+# Slow enough that nothing is replenished during a run
+INTERVAL = 3600.0
+
+def build_store(backend: str, target: str):
+    """Create a store; ``target`` is the SQLite path or Redis URL."""
+    if backend == "memory":
+        return MemoryLimiterStore()
+    if backend == "sqlite":
+        return SQLiteLimiterStore(target)
+    return RedisLimiterStore(target, key_prefix="bench:")
+
+def race(backend: str, target: str, key: str, attempts: int, limit: int, results):
+    """Consume one unit at a time until the attempts run out."""
+    store = build_store(backend, target)
+    results.put(sum(store.hit(key, 1, INTERVAL, limit).allowed for _ in range(attempts)))
+
+def run_backend(backend: str, target: str, args):
+    """Measure latency and verify the race for one backend."""
+    store = build_store(backend, target)
+    keys = [f"latency-{uuid.uuid4()}-{i % 100}" for i in range(args.checks)]
+    started = time.perf_counter()
+    for key in keys:
+        store.hit(key, 1, INTERVAL, 1000000)
+    per_check = (time.perf_counter() - started) / args.checks
+
+    # The memory store is per process, so its race runs in one process
+    procs = 1 if backend == "memory" else args.procs
+    attempts = args.limit * 2 // procs
+    key = f"race-{uuid.uuid4()}"
+    results = multiprocessing.Queue()
+    if procs == 1:
+        race(backend, target, key, attempts, args.limit, results)
+    else:
+        workers = [
+            multiprocessing.Process(target=race, args=(backend, target, key, attempts, args.limit, results))
+            for _ in range(procs)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    granted = sum(results.get() for _ in range(procs))
+
+    status = "OK" if granted == args.limit else "OVER-ADMITTED" if granted > args.limit else "UNDER-ADMITTED"
+    print(f"  {backend:<8} {per_check * 1e6:9.1f} us/check   "
+          f"{procs} procs x {attempts} attempts: granted {granted}/{args.limit} {status}")
+    return granted == args.limit
+
+def main():
+    """Run the limiter benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--checks", type=int, default=2000)
+    parser.add_argument("--procs", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--backends", nargs="*", default=["memory", "sqlite", "redis"])
+    parser.add_argument("--redis-url")
+    args = parser.parse_args()
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in args.backends:
+            target = ""
+            if backend == "sqlite":
+                target = os.path.join(tmp, "rate_limits.db")
+            elif backend == "redis":
+                target = args.redis_url
+                if not target:
+                    from redis_standin import serve_in_background
+                    host, port = serve_in_background().server_address
+                    target = f"redis://{host}:{port}/0"
+            ok = run_backend(backend, target, args) and ok
+
+    if not ok:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Summarize ``python -X importtime`` for the entry point and check a startup budget.
+
+Imports ``main`` in a fresh interpreter, reports the slowest top-level
+packages by cumulative import time, and fails if the total exceeds the
+budget or if a forbidden module (by default the AWS and JWT stacks, which
+guest sessions must not load) was imported.
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms 1500] [--top 15] [--forbid boto3 botocore jwt]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# Placeholders for required settings; nothing is contacted at import time
+DUMMY_ENV = {
+    "AWS_REGION": "us-west-2",
+    "COGNITO_USER_POOL_ID": "us-west-2_example",
+    "COGNITO_CLIENT_ID": "example",
+    "API_URL": "http://localhost:8000",
+}
+
+def run_importtime(module: str) -> str:
+    """
+    Import a module in a fresh interpreter with ``-X importtime``.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        str: The interpreter's importtime report (stderr)
+    """
+    pythonpath = os.pathsep.join(filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")]))
+    env = {**DUMMY_ENV, **os.environ, "PYTHONPATH": pythonpath}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"Importing {module} failed")
+    return result.stderr
+
+def parse_report(report: str) -> list:
+    """
+    Parse importtime lines into (module, self_us, cumulative_us, depth).
+
+    Args:
+        report: Raw importtime output
+
+    Returns:
+        list: Parsed entries in report order
+    """
+    entries = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2]
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), self_us, cumulative_us, depth))
+    return entries
+
+def main():
+    """Run the import-time report and enforce the budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--forbid", nargs="*", default=["boto3", "botocore", "jwt"])
+    args = parser.parse_args()
+
+    entries = parse_report(run_importtime(args.module))
+    # Top-level imports are the least indented entries
+    min_depth = min(depth for _, _, _, depth in entries)
+    total_us = sum(cumulative for _, _, cumulative, depth in entries if depth == min_depth)
+
+    by_package = defaultdict(int)
+    for name, self_us, _, _ in entries:
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"Import of '{args.module}': {total_us / 1000:.1f} ms total, {len(entries)} modules")
+    print(f"{'package':<30} {'self ms':>10}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<30} {self_us / 1000:>10.1f}")
+
+    failures = []
+    if total_us / 1000 > args.budget_ms:
+        failures.append(f"total {total_us / 1000:.1f} ms exceeds budget of {args.budget_ms:.0f} ms")
+    loaded = {name for name, _, _, _ in entries}
+    for module in args.forbid:
+        if module in loaded:
+            failures.append(f"'{module}' was imported but is not needed at startup")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        raise SystemExit(1)
+    print(f"OK: within {args.budget_ms:.0f} ms budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Load-test AuthenticationManager flows against the in-process Cognito fake.
+
+Runs N concurrent sessions, each repeating a flow through
+``AuthenticationManager`` and the shared Cognito worker pool for the given
+duration, then reports throughput, latency percentiles and error counts
+per operation. Nothing is sent to AWS.
+
+Flows:
+    login   log in as a pre-created user and refresh the token
+    signup  sign up, confirm, log in
+    reset   forgot password, confirm the new password, log in
+    mixed   a random choice of the above per iteration
+
+Usage:
+    python benchmarks/load_auth.py [--sessions 50] [--duration 10] [--flow mixed]
+        [--latency 0.05] [--jitter 0.05] [--error-rate 0.0] [--bad-password-rate 0.0]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+FLOWS = ("login", "signup", "reset")
+
+def configure(args):
+    """Point the app at the Cognito fake before settings are first read."""
+    os.environ.update({
+        "AWS_REGION": "us-west-2",
+        "COGNITO_USER_POOL_ID": "us-west-2_loadtest",
+        "COGNITO_CLIENT_ID": "loadtest",
+        "API_URL": "http://localhost:8000",
+        "COGNITO_FAKE": "true",
+        "COGNITO_FAKE_LATENCY_SECONDS": str(args.latency),
+        "COGNITO_FAKE_LATENCY_JITTER_SECONDS": str(args.jitter),
+        "COGNITO_FAKE_ERROR_RATE": str(args.error_rate),
+    })
+    if args.workers:
+        os.environ["COGNITO_WORKERS"] = str(args.workers)
+
+class Recorder:
+    """Collects latencies and errors per operation across threads."""
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    def call(self, operation: str, fn, *args):
+        """Time a call, recording its error code if it raises."""
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        except Exception as e:
+            with self._lock:
+                self.errors[operation][getattr(e, "error_code", None) or type(e).__name__] += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.latencies[operation].append(elapsed)
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    index = min(len(samples) - 1, max(0, int(round(pct / 100 * len(samples))) - 1))
+    return samples[index]
+
+def run_session(session: int, args, recorder: Recorder, deadline: float):
+    """Repeat the configured flow until the deadline."""
+    from components.authentication import AuthenticationManager
+    from services.cognito import run_cognito_call
+
+    rng = random.Random(session)
+    manager = AuthenticationManager()
+    fake = manager.cognito.client
+    username, password = f"user-{session}", "Password-1"
+    # No Streamlit script run here, so session state cannot identify the client
+    requester = f"loadtest:{session}"
+    iteration = 0
+
+    while time.monotonic() < deadline:
+        iteration += 1
+        flow = rng.choice(FLOWS) if args.flow == "mixed" else args.flow
+        try:
+            if flow == "login":
+                attempt = password
+                if rng.random() < args.bad_password_rate:
+                    attempt = "wrong-password"
+                result = recorder.call("login", manager.authenticate, username, attempt, requester)
+                recorder.call("refresh", run_cognito_call, manager.cognito.refresh_token, result["RefreshToken"])
+
+            elif flow == "signup":
+                new_user = f"new-{session}-{iteration}"
+                recorder.call("sign_up", manager.sign_up, new_user, f"{new_user}@example.com", password)
+                recorder.call("confirm_sign_up", run_cognito_call, manager.cognito.confirm_sign_up,
+                              new_user, fake.get_code(new_user))
+                recorder.call("login", manager.authenticate, new_user, password, requester)
+
+            else:
+                recorder.call("forgot_password", run_cognito_call, manager.cognito.forgot_password, username)
+                recorder.call("confirm_forgot_password", run_cognito_call,
+                              manager.cognito.confirm_forgot_password, username, fake.get_code(username), password)
+                recorder.call("login", manager.authenticate, username, password, requester)
+        except Exception:
+            # Already recorded; move on to the next iteration
+            continue
+
+def main():
+    """Run the load test and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--flow", choices=FLOWS + ("mixed",), default="mixed")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--bad-password-rate", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=0, help="Override COGNITO_WORKERS")
+    args = parser.parse_args()
+
+    configure(args)
+    from services.cognito import get_cognito_client
+    from utils.config import get_settings
+
+    settings = get_settings()
+    fake = get_cognito_client(settings.AWS_REGION)
+    # Exercise confirm_sign_up like a real pool would require
+    fake.auto_confirm = False
+    for session in range(args.sessions):
+        fake.add_user(f"user-{session}", "Password-1")
+
+    recorder = Recorder()
+    deadline = time.monotonic() + args.duration
+    threads = [
+        threading.Thread(target=run_session, args=(session, args, recorder, deadline), daemon=True)
+        for session in range(args.sessions)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.sessions} sessions, flow={args.flow}, {elapsed:.1f}s, "
+          f"{settings.COGNITO_WORKERS} workers, fake latency {args.latency * 1000:.0f}"
+          f"+{args.jitter * 1000:.0f} ms, error rate {args.error_rate:.0%}")
+    print(f"{'operation':<24} {'calls':>7} {'ok/s':>8} {'p50 ms':>8} {'p90 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8}  errors")
+    for operation, samples in sorted(recorder.latencies.items()):
+        samples.sort()
+        errors = recorder.errors[operation]
+        ok = len(samples) - sum(errors.values())
+        error_summary = ", ".join(f"{code}={count}" for code, count in errors.most_common()) or "-"
+        print(f"{operation:<24} {len(samples):>7} {ok / elapsed:>8.1f} "
+              f"{percentile(samples, 50) * 1000:>8.1f} {percentile(samples, 90) * 1000:>8.1f} "
+              f"{percentile(samples, 99) * 1000:>8.1f} {samples[-1] * 1000:>8.1f}  {error_summary}")
+
+    print("Cognito calls: " + ", ".join(f"{op}={count}" for op, count in sorted(fake.call_counts().items())))
+
+if __name__ == "__main__":
+    main()
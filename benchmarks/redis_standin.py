@@ -0,0 +1,196 @@
+"""
+Local stand-in for Redis that speaks enough of the protocol for the limiter.
+
+Serves RESP2 (or RESP3 after HELLO 3) over TCP and implements PING, HELLO, SELECT, CLIENT, SCRIPT LOAD,
+SCRIPT EXISTS, SCRIPT FLUSH, EVAL, EVALSHA, FLUSHALL and QUIT. Instead of
+running Lua, each known limiter script is executed by the Python function
+that defines the same transition, under one lock, so scripts are atomic
+just as in Redis.
+
+Usage:
+    python benchmarks/redis_standin.py [--host 127.0.0.1] [--port 6399]
+    RATE_LIMIT_BACKEND=redis RATE_LIMIT_REDIS_URL=redis://127.0.0.1:6399/0 streamlit run src/main.py
+"""
+import argparse
+import hashlib
+import os
+import socketserver
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from utils import limiter_store  # noqa: E402
+
+def _gcra(data: dict, keys: list, args: list) -> list:
+    """Python equivalent of ``GCRA_SCRIPT``."""
+    now, cost, interval, burst = float(args[0]), int(args[1]), float(args[2]), int(args[3])
+    allowed, tat, changed = limiter_store.apply_gcra(data.get(keys[0]), now, cost, interval, burst)
+    if changed:
+        data[keys[0]] = tat
+    return [int(allowed), f"{tat:.6f}".encode()]
+
+def _adjust(data: dict, keys: list, args: list) -> bytes:
+    """Python equivalent of ``ADJUST_SCRIPT``."""
+    now, delta, interval = float(args[0]), float(args[1]), float(args[2])
+    tat = limiter_store.apply_adjust(data.get(keys[0]), now, delta, interval)
+    if tat > now:
+        data[keys[0]] = tat
+    else:
+        data.pop(keys[0], None)
+    return f"{tat:.6f}".encode()
+
+SCRIPTS = {
+    limiter_store.GCRA_SCRIPT: _gcra,
+    limiter_store.ADJUST_SCRIPT: _adjust,
+}
+
+class StandInServer(socketserver.ThreadingTCPServer):
+    """TCP server holding the shared keyspace and loaded scripts."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address):
+        super().__init__(address, RESPHandler)
+        self.data = {}
+        self.lock = threading.Lock()
+        self.handlers = {_sha1(script): fn for script, fn in SCRIPTS.items()}
+        self.loaded = set()
+
+class RESPHandler(socketserver.StreamRequestHandler):
+    """Handles one client connection."""
+    def handle(self):
+        while True:
+            try:
+                command = self._read()
+            except (ConnectionError, ValueError):
+                return
+            if command is None:
+                return
+            name = command[0].upper()
+            if name == b"QUIT":
+                self._write(b"OK")
+                return
+            self._write(self._dispatch(name, command[1:]))
+
+    def _dispatch(self, name: bytes, args: list):
+        """Run one command and return its reply."""
+        server = self.server
+        if name == b"PING":
+            return b"PONG"
+        if name in (b"SELECT", b"CLIENT"):
+            return b"OK"
+        if name == b"HELLO":
+            proto = int(args[0]) if args else 2
+            if proto not in (2, 3):
+                return ValueError("NOPROTO unsupported protocol version")
+            info = {b"server": b"redis", b"version": b"7.0.0", b"proto": proto,
+                    b"mode": b"standalone", b"role": b"master", b"modules": []}
+            # Only the handshake differs; every other reply is the same in RESP2 and RESP3
+            return info if proto == 3 else [item for pair in info.items() for item in pair]
+        if name == b"FLUSHALL":
+            with server.lock:
+                server.data.clear()
+            return b"OK"
+        if name == b"SCRIPT":
+            sub = args[0].upper()
+            if sub == b"LOAD":
+                return self._load(args[1])
+            if sub == b"EXISTS":
+                return [int(sha.decode() in server.loaded) for sha in args[1:]]
+            if sub == b"FLUSH":
+                server.loaded.clear()
+                return b"OK"
+        if name == b"EVAL":
+            sha = self._load(args[0])
+            return sha if isinstance(sha, ValueError) else self._eval(sha.decode(), args[1:])
+        if name == b"EVALSHA":
+            return self._eval(args[0].decode().lower(), args[1:])
+        return ValueError(f"ERR unknown command '{name.decode()}'")
+
+    def _load(self, script: bytes):
+        """Register a script by its SHA1."""
+        sha = _sha1(script.decode())
+        if sha not in self.server.handlers:
+            return ValueError("ERR stand-in cannot run this script")
+        self.server.loaded.add(sha)
+        return sha.encode()
+
+    def _eval(self, sha: str, args: list):
+        """Run a loaded script atomically."""
+        if sha not in self.server.loaded:
+            return ValueError("NOSCRIPT No matching script. Please use EVAL.")
+        numkeys = int(args[0])
+        keys, argv = args[1:1 + numkeys], [arg.decode() for arg in args[1 + numkeys:]]
+        with self.server.lock:
+            return self.server.handlers[sha](self.server.data, keys, argv)
+
+    def _read(self):
+        """Read one command as a list of bulk strings."""
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # Inline command
+            return line.split()
+        items = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            items.append(self.rfile.read(size + 2)[:-2])
+        return items
+
+    def _write(self, reply):
+        """Write a reply in RESP2."""
+        self.wfile.write(_encode(reply))
+
+def _encode(reply) -> bytes:
+    """Encode a Python value; dicts use the RESP3 map type."""
+    if isinstance(reply, ValueError):
+        return b"-" + str(reply).encode() + b"\r\n"
+    if isinstance(reply, bytes) and reply in (b"OK", b"PONG"):
+        return b"+" + reply + b"\r\n"
+    if isinstance(reply, bool) or isinstance(reply, int):
+        return b":" + str(int(reply)).encode() + b"\r\n"
+    if isinstance(reply, bytes):
+        return b"$" + str(len(reply)).encode() + b"\r\n" + reply + b"\r\n"
+    if isinstance(reply, list):
+        return b"*" + str(len(reply)).encode() + b"\r\n" + b"".join(_encode(item) for item in reply)
+    if isinstance(reply, dict):
+        return (b"%" + str(len(reply)).encode() + b"\r\n"
+                + b"".join(_encode(key) + _encode(value) for key, value in reply.items()))
+    if reply is None:
+        return b"$-1\r\n"
+    raise TypeError(f"Cannot encode {type(reply).__name__}")
+
+def _sha1(script: str) -> str:
+    """SHA1 of a script, as Redis computes it."""
+    return hashlib.sha1(script.encode("utf-8")).hexdigest()
+
+def serve_in_background(host: str = "127.0.0.1", port: int = 0) -> StandInServer:
+    """
+    Start a stand-in on a background thread.
+
+    Args:
+        host: Address to bind
+        port: Port to bind, 0 for any free port
+
+    Returns:
+        StandInServer: The running server; ``server_address`` has the port
+    """
+    server = StandInServer((host, port))
+    threading.Thread(target=server.serve_forever, name="redis-standin", daemon=True).start()
+    return server
+
+def main():
+    """Run the stand-in in the foreground."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6399)
+    args = parser.parse_args()
+
+    server = StandInServer((args.host, args.port))
+    print(f"Redis stand-in listening on {args.host}:{args.port}")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,20 @@
 """
 Authentication management component using AWS Cognito.
+
+``services.cognito`` (and with it ``boto3``) and ``services.jwt_verifier``
+are imported on first use, so guest sessions never load them.
 """
 from typing import Optional, Dict
-import boto3
+import math
+import time
+import uuid
 import streamlit as st
 from utils.config import get_settings
-from services.cognito import CognitoService
+from services.login_throttle import get_login_throttle
+from services.token_refresh import get_token_refresh_scheduler
+from utils.exceptions import AuthError
+from utils.metrics import metrics
+from utils.session import clear_resumption_cookie, get_requester_id, save_resumption_cookie
 
 class AuthenticationManager:
     """
@@ -13,7 +22,15 @@ class AuthenticationManager:
     """
     def __init__(self):
         self.settings = get_settings()
-        self.cognito = CognitoService()
+        self._cognito = None
+
+    @property
+    def cognito(self):
+        """Cognito service, created on first use."""
+        if self._cognito is None:
+            from services.cognito import CognitoService
+            self._cognito = CognitoService()
+        return self._cognito
 
     def render_login_ui(self):
         """Render the login/signup interface."""
@@ -27,7 +44,8 @@ class AuthenticationManager:
 
                 if submit_button and username and password:
                     try:
-                        auth_result = self.cognito.authenticate(username, password)
+                        with st.spinner("Signing in..."):
+                            auth_result = self.authenticate(username, password)
                         self._handle_successful_auth(auth_result)
                     except Exception as e:
                         st.error(f"Login failed: {str(e)}")
@@ -45,19 +63,126 @@ class AuthenticationManager:
                         st.error("Passwords do not match")
                     elif all([new_username, email, new_password]):
                         try:
-                            self.cognito.sign_up(new_username, email, new_password)
+                            with st.spinner("Creating your account..."):
+                                self.sign_up(new_username, email, new_password)
                             st.success("Sign up successful! Please check your email for verification.")
                         except Exception as e:
                             st.error(f"Sign up failed: {str(e)}")
 
+    def authenticate(self, username: str, password: str, requester: Optional[str] = None) -> Dict:
+        """
+        Authenticate with Cognito on the shared worker pool.
+
+        Repeated failures from this client, for one username or across
+        usernames, are locked out locally, with exponentially growing
+        windows, before reaching Cognito. Repeated failures for a username
+        from any client only delay further attempts, by a bounded time.
+
+        Args:
+            username: User's username
+            password: User's password
+            requester: Identity of the client for throttling; defaults to
+                the current session's, see ``get_requester_id``
+
+        Returns:
+            Dict: Authentication result including tokens
+
+        Raises:
+            AuthError: If authentication fails, times out, the pool is busy
+                or the client is temporarily locked out
+        """
+        from services.cognito import run_cognito_call
+
+        throttle = get_login_throttle()
+        client_id = self.settings.COGNITO_CLIENT_ID
+        requester = requester or get_requester_id()
+        if (locked_for := throttle.check(client_id, username, requester)) > 0:
+            raise AuthError(
+                f"Too many failed attempts. Please try again in {math.ceil(locked_for)} seconds.",
+                error_code="LOGIN_THROTTLED",
+                details={"retry_after": locked_for}
+            )
+        if (wait := throttle.pace(client_id, username)) > 0:
+            time.sleep(wait)
+
+        try:
+            auth_result = run_cognito_call(self.cognito.authenticate, username, password)
+        except AuthError as e:
+            if e.error_code in ("NotAuthorizedException", "UserNotFoundException"):
+                throttle.record_failure(client_id, username, requester)
+            raise
+
+        throttle.record_success(client_id, username, requester)
+        return auth_result
+
+    def sign_up(self, username: str, email: str, password: str) -> Dict:
+        """
+        Register a new user with Cognito on the shared worker pool.
+
+        Args:
+            username: Desired username
+            email: User's email
+            password: Desired password
+
+        Returns:
+            Dict: Sign up result
+
+        Raises:
+            AuthError: If sign up fails, times out or the pool is busy
+        """
+        from services.cognito import run_cognito_call
+        return run_cognito_call(self.cognito.sign_up, username, email, password)
+
     def render_logout_ui(self):
         """Render the logout button and user info."""
         if st.sidebar.button("Logout"):
             self.logout()
 
     def is_authenticated(self) -> bool:
-        """Check if user is authenticated."""
-        return bool(st.session_state.get("user_token"))
+        """
+        Check if user is authenticated.
+
+        The token's signature, expiry, issuer and audience are verified
+        locally; verified claims are memoized, so this is cheap on reruns.
+        An expired token is refreshed when the session has a refresh token,
+        and kept if the refresh fails transiently so a later rerun can retry.
+        Any other token that fails verification is cleared from the session.
+
+        Returns:
+            bool: True if the session holds a valid token
+        """
+        if not st.session_state.get("user_token"):
+            return False
+
+        refresh_attempted = self._sync_refreshed_token()
+        token = st.session_state.get("user_token")
+        if not token:
+            return False
+        if not self.settings.ENABLE_LOCAL_JWT_VERIFICATION:
+            return True
+
+        from services.jwt_verifier import get_jwt_verifier
+
+        verifier = get_jwt_verifier()
+        try:
+            verifier.verify(token)
+            return True
+        except AuthError as e:
+            error_code = e.error_code
+
+        if error_code == "TOKEN_EXPIRED" and st.session_state.get("refresh_token"):
+            if refresh_attempted or not self.refresh_token():
+                return False
+            try:
+                verifier.verify(st.session_state.user_token)
+                return True
+            except AuthError as e:
+                error_code = e.error_code
+
+        # Signing keys being unreachable says nothing about the token
+        if error_code != "JWKS_UNAVAILABLE":
+            st.session_state.pop("user_token", None)
+        return False
 
     def get_username(self) -> Optional[str]:
         """Get the current user's username."""
@@ -70,37 +195,145 @@ class AuthenticationManager:
         return st.session_state.get("user_token")
 
     def logout(self):
-        """Handle user logout."""
-        if "user_token" in st.session_state:
-            del st.session_state.user_token
-        if "username" in st.session_state:
-            del st.session_state.username
+        """
+        Handle user logout.
+
+        The refresh token is revoked with Cognito, since deleting the
+        resumption cookie in this browser does not invalidate a copy of it.
+        """
+        if auth_session_key := st.session_state.get("auth_session_key"):
+            get_token_refresh_scheduler().cancel(auth_session_key)
+        self._revoke_refresh_token()
+        self._clear_auth_state()
         st.experimental_rerun()
 
-    def _handle_successful_auth(self, auth_result: Dict):
+    def _revoke_refresh_token(self):
+        """Revoke the session's refresh token, if any, with Cognito."""
+        refresh_token = st.session_state.get("refresh_token")
+        if not refresh_token:
+            return
+
+        from services.cognito import run_cognito_call
+
+        try:
+            run_cognito_call(self.cognito.revoke_token, refresh_token)
+        except Exception:
+            # Logging out locally must not depend on Cognito being reachable
+            metrics.increment_counter("auth.revoke_failed")
+
+    def _clear_auth_state(self):
+        """Remove all authentication state from the session."""
+        for key in ("user_token", "username", "refresh_token", "token_expires_at", "auth_session_key"):
+            if key in st.session_state:
+                del st.session_state[key]
+        clear_resumption_cookie()
+
+    def _handle_successful_auth(self, auth_result: Dict, rerun: bool = True):
         """
         Handle successful authentication response.
 
+        Stores the tokens and their expiry. When a refresh token is
+        available, schedules a background refresh ahead of expiry and
+        updates the session resumption cookie.
+
         Args:
-            auth_result: Authentication result from Cognito
+            auth_result: Authentication or refresh result from Cognito
+            rerun: Whether to rerun the script to update the UI
         """
         st.session_state.user_token = auth_result["AccessToken"]
-        st.session_state.username = auth_result["Username"]
-        st.experimental_rerun()
+        st.session_state.token_expires_at = time.time() + auth_result["ExpiresIn"]
+        if "Username" in auth_result:
+            st.session_state.username = auth_result["Username"]
+        if auth_result.get("RefreshToken"):
+            st.session_state.refresh_token = auth_result["RefreshToken"]
+
+        if st.session_state.get("refresh_token"):
+            self._schedule_refresh(auth_result["ExpiresIn"])
+            self._save_resumption_cookie()
+
+        if rerun:
+            st.experimental_rerun()
+
+    def _sync_refreshed_token(self) -> bool:
+        """
+        Apply tokens refreshed in the background to this session.
+
+        If no background refresh arrived and the token is about to expire,
+        for example after the session sat idle, refresh synchronously.
+
+        Returns:
+            bool: True if a synchronous refresh was attempted
+        """
+        auth_session_key = st.session_state.get("auth_session_key")
+        if auth_session_key:
+            scheduler = get_token_refresh_scheduler()
+            if result := scheduler.take_result(auth_session_key):
+                st.session_state.user_token = result["AccessToken"]
+                st.session_state.token_expires_at = result["ExpiresAt"]
+                if result.get("RefreshToken"):
+                    st.session_state.refresh_token = result["RefreshToken"]
+                self._save_resumption_cookie()
+                return False
+
+        expires_at = st.session_state.get("token_expires_at")
+        if expires_at and expires_at - time.time() < self.settings.TOKEN_REFRESH_MIN_REMAINING:
+            self.refresh_token()
+            return True
+        elif expires_at and not auth_session_key and st.session_state.get("refresh_token"):
+            # Session restored from a resumption cookie
+            self._schedule_refresh(expires_at - time.time())
+
+    def _schedule_refresh(self, expires_in: float):
+        """
+        Schedule a background refresh of this session's token.
+
+        Args:
+            expires_in: Seconds until the current access token expires
+        """
+        if "auth_session_key" not in st.session_state:
+            st.session_state.auth_session_key = str(uuid.uuid4())
+        get_token_refresh_scheduler().schedule(
+            st.session_state.auth_session_key,
+            st.session_state.refresh_token,
+            expires_in
+        )
+
+    def _save_resumption_cookie(self):
+        """Store the session's tokens in the resumption cookie."""
+        save_resumption_cookie(
+            st.session_state.get("username"),
+            st.session_state.user_token,
+            st.session_state.refresh_token,
+            st.session_state.token_expires_at
+        )
 
     def refresh_token(self) -> bool:
         """
-        Refresh the authentication token if needed.
+        Refresh the authentication token synchronously.
+
+        The session is ended only when Cognito rejects the refresh token.
+        Transient failures, such as a timeout or a busy pool, keep it, so
+        the refresh is retried later.
 
         Returns:
             bool: True if token was successfully refreshed
         """
+        refresh_token = st.session_state.get("refresh_token")
+        if not refresh_token:
+            return False
+
+        from services.cognito import run_cognito_call
+
         try:
-            refresh_token = st.session_state.get("refresh_token")
-            if refresh_token:
-                auth_result = self.cognito.refresh_token(refresh_token)
-                self._handle_successful_auth(auth_result)
-                return True
-        except Exception:
-            self.logout()
-        return False
\ No newline at end of file
+            auth_result = run_cognito_call(self.cognito.refresh_token, refresh_token)
+        except Exception as e:
+            metrics.increment_counter("auth.refresh_failures")
+            if isinstance(e, AuthError) and e.error_code == "NotAuthorizedException":
+                # Revoked or expired; there is nothing left to revoke
+                if auth_session_key := st.session_state.get("auth_session_key"):
+                    get_token_refresh_scheduler().cancel(auth_session_key)
+                self._clear_auth_state()
+            return False
+
+        self._handle_successful_auth(auth_result, rerun=False)
+        return True
\ No newline at end of file
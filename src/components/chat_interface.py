@@ -1,17 +1,43 @@
 """
 Chat interface component handling message display and input.
 """
+import time
 from typing import List, Dict, Optional
 import streamlit as st
+import streamlit.components.v1 as components
 from services.api_client import APIClient
+from utils.config import get_settings
 from utils.session import get_session_id
-from utils.rate_limit import check_rate_limit
+from utils.rate_limit import get_quota
+from utils.exceptions import CircuitOpenError, OverloadedError, RateLimitError
+
+# Counts down in the browser, so it stays accurate between reruns
+COUNTDOWN_HTML = """
+<div id="countdown" style="font-family: sans-serif; font-size: 0.9rem; color: #555;"></div>
+<script>
+const deadline = Date.now() + %d;
+const el = document.getElementById("countdown");
+function tick() {
+    const left = Math.ceil((deadline - Date.now()) / 1000);
+    if (left <= 0) {
+        el.textContent = "You can ask again now.";
+        return;
+    }
+    const h = Math.floor(left / 3600), m = Math.floor(left %% 3600 / 60), s = left %% 60;
+    el.textContent = "Next question available in "
+        + (h ? h + "h " + m + "m" : m ? m + "m " + s + "s" : s + "s");
+    setTimeout(tick, 250);
+}
+tick();
+</script>
+"""
 
 class ChatInterface:
     """
     Handles the chat interface including message display and input.
     """
     def __init__(self):
+        self.settings = get_settings()
         self.api_client = APIClient()
 
     def render(self, guest_mode: bool = False):
@@ -21,6 +47,11 @@ class ChatInterface:
         Args:
             guest_mode: Whether to show limited guest interface
         """
+        # Session-level quota helpers follow the mode the chat is shown in
+        st.session_state.guest_mode = guest_mode
+        # One store read per run; the header and input gate share its result
+        get_quota(guest_mode).refresh()
+
         # Display chat header
         self._render_header(guest_mode)
 
@@ -32,13 +63,11 @@ class ChatInterface:
 
     def _render_header(self, guest_mode: bool):
         """Render the chat interface header."""
+        quota = get_quota(guest_mode)
         col1, col2 = st.columns([3, 1])
         
         with col1:
-            if guest_mode:
-                st.info(f"Questions remaining: {self._get_remaining_questions()}/10")
-            else:
-                st.info(f"Questions remaining: {self._get_remaining_questions()}/50")
+            st.info(f"Questions remaining: {quota.remaining()}/{quota.limit}")
         
         with col2:
             if st.button("New Chat"):
@@ -58,24 +87,31 @@ class ChatInterface:
         Args:
             message: Message data including content and role
         """
-        role = message["role"]
-        content = message["content"]
-        
         with st.container():
-            if role == "user":
-                st.markdown(
-                    f"""<div class="chat-message user-message">
+            st.markdown(
+                self._format_message_html(message["role"], message["content"]),
+                unsafe_allow_html=True
+            )
+
+    @staticmethod
+    def _format_message_html(role: str, content: str) -> str:
+        """
+        Build the HTML for a single chat message bubble.
+
+        Args:
+            role: Message author role ("user" or "assistant")
+            content: Message text
+
+        Returns:
+            str: HTML markup for the message
+        """
+        if role == "user":
+            return f"""<div class="chat-message user-message">
                         🧑 {content}
-                    </div>""",
-                    unsafe_allow_html=True
-                )
-            else:
-                st.markdown(
-                    f"""<div class="chat-message assistant-message">
+                    </div>"""
+        return f"""<div class="chat-message assistant-message">
                         🤖 {content}
-                    </div>""",
-                    unsafe_allow_html=True
-                )
+                    </div>"""
 
     def _render_chat_input(self, guest_mode: bool):
         """
@@ -84,8 +120,8 @@ class ChatInterface:
         Args:
             guest_mode: Whether to show limited guest interface
         """
-        if not check_rate_limit(guest_mode):
-            st.warning("Rate limit reached. Please try again later.")
+        if get_quota(guest_mode).retry_after() > 0:
+            self._render_rate_limit_notice()
             return
 
         with st.container():
@@ -100,6 +136,13 @@ class ChatInterface:
             prompt: User's input message
             guest_mode: Whether in guest mode
         """
+        # Consume quota up front so concurrent tabs cannot overrun the limit
+        quota = get_quota(guest_mode)
+        charged = quota.estimate_cost(prompt)
+        if not quota.try_consume(charged):
+            self._render_rate_limit_notice()
+            return
+
         # Add user message to state
         if "messages" not in st.session_state:
             st.session_state.messages = []
@@ -109,43 +152,133 @@ class ChatInterface:
             "content": prompt
         })
 
+        # Only an opening guest question is free of conversation context
+        use_cache = guest_mode and len(st.session_state.messages) == 1
+
         try:
             # Get AI response
-            response = self.api_client.send_message(
-                message=prompt,
-                session_id=get_session_id(),
-                guest_mode=guest_mode
+            if self.settings.ENABLE_STREAMING:
+                response = self._stream_response(prompt, guest_mode, use_cache)
+            else:
+                response = self.api_client.send_message(
+                    message=prompt,
+                    session_id=get_session_id(),
+                    guest_mode=guest_mode,
+                    use_cache=use_cache
+                )
+        except Exception as e:
+            # No answer came back, so the question does not count
+            quota.adjust(-charged)
+            self._render_request_error(e)
+            return
+
+        # Add assistant response to state
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": response
+        })
+
+        quota.settle(charged, prompt, response, self.api_client.last_usage_tokens)
+
+        # Trigger rerun to update UI
+        st.experimental_rerun()
+
+    def _render_request_error(self, error: Exception):
+        """
+        Explain why a question got no answer.
+
+        Args:
+            error: Exception raised while getting the response
+        """
+        if isinstance(error, RateLimitError):
+            self._render_rate_limit_notice()
+        elif isinstance(error, OverloadedError):
+            st.warning(error.message)
+        elif isinstance(error, CircuitOpenError):
+            retry_after = int(error.details.get("retry_after", 0)) + 1
+            st.warning(
+                "The assistant is temporarily unavailable due to high error rates. "
+                f"Please try again in about {retry_after} seconds."
             )
+        else:
+            st.error(f"Error: {str(error)}")
 
-            # Add assistant response to state
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": response
-            })
+    def _render_rate_limit_notice(self):
+        """Show that the rate limit was reached, with a live countdown."""
+        quota = get_quota()
+        wait = quota.retry_after()
+        if wait <= 0:
+            st.warning(f"Rate limit reached. {quota.status_message()}")
+            return
 
-            # Update rate limit counter
-            self._update_question_count()
-            
-            # Trigger rerun to update UI
-            st.experimental_rerun()
+        st.warning("Rate limit reached.")
+        components.html(COUNTDOWN_HTML % int(wait * 1000), height=30)
+        st.button("Check again", key="rate_limit_check_again")
 
-        except Exception as e:
-            st.error(f"Error: {str(e)}")
+    def _stream_response(self, prompt: str, guest_mode: bool, use_cache: bool = False) -> str:
+        """
+        Stream the AI response into a placeholder as tokens arrive.
+
+        The placeholder is re-rendered at most every
+        ``STREAM_RENDER_INTERVAL`` seconds, since each render sends the
+        whole answer so far, and once more when the stream ends.
+
+        A failed stream is not re-sent as a buffered request: the backend
+        may already be generating an answer for it. Backends that do not
+        stream are handled by ``APIClient.stream_message`` itself.
+
+        Args:
+            prompt: User's input message
+            guest_mode: Whether in guest mode
+            use_cache: Whether a shared guest response may be served
+
+        Returns:
+            str: The complete AI response
+        """
+        # The prompt was added after this run displayed the history
+        self._render_message({"role": "user", "content": prompt})
+
+        placeholder = st.empty()
+        chunks: List[str] = []
+        interval = self.settings.STREAM_RENDER_INTERVAL
+        next_render = 0.0
+
+        try:
+            for chunk in self.api_client.stream_message(
+                message=prompt,
+                session_id=get_session_id(),
+                guest_mode=guest_mode,
+                use_cache=use_cache
+            ):
+                chunks.append(chunk)
+                now = time.monotonic()
+                if now < next_render:
+                    continue
+                next_render = now + interval
+                placeholder.markdown(
+                    self._format_message_html("assistant", "".join(chunks) + "▌"),
+                    unsafe_allow_html=True
+                )
+        except Exception:
+            if not chunks:
+                placeholder.empty()
+            else:
+                # Show the partial answer that arrived since the last render
+                placeholder.markdown(
+                    self._format_message_html("assistant", "".join(chunks)),
+                    unsafe_allow_html=True
+                )
+            raise
+
+        response = "".join(chunks)
+        placeholder.markdown(
+            self._format_message_html("assistant", response),
+            unsafe_allow_html=True
+        )
+        return response
 
     def _start_new_chat(self):
         """Start a new chat session."""
         st.session_state.messages = []
         st.session_state.session_id = get_session_id()
         st.experimental_rerun()
-
-    def _get_remaining_questions(self) -> int:
-        """Get remaining questions for current time window."""
-        used_questions = st.session_state.get("questions_used", 0)
-        limit = 50 if not st.session_state.get("guest_mode", True) else 10
-        return max(0, limit - used_questions)
-
-    def _update_question_count(self):
-        """Update the question counter."""
-        if "questions_used" not in st.session_state:
-            st.session_state.questions_used = 0
-        st.session_state.questions_used += 1
\ No newline at end of file
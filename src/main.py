@@ -5,7 +5,7 @@ import streamlit as st
 from components.authentication import AuthenticationManager
 from components.chat_interface import ChatInterface
 from components.sidebar import Sidebar
-from utils.config import load_config
+from utils.config import get_settings
 from utils.session import initialize_session_state
 
 class ChatApplication:
@@ -13,7 +13,7 @@ class ChatApplication:
     Main application class that coordinates all frontend components.
     """
     def __init__(self):
-        self.config = load_config()
+        self.config = get_settings()
         self.auth_manager = AuthenticationManager()
         self.chat_interface = ChatInterface()
         self.sidebar = Sidebar()
@@ -1,31 +1,76 @@
 """
 API client for interacting with the backend API Gateway.
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
+import hashlib
+import time
+import uuid
+import weakref
 import requests
-from requests.exceptions import RequestException
+from requests.exceptions import RequestException, ConnectionError, ConnectTimeout, Timeout
 import streamlit as st
 from utils.config import get_settings
-from utils.exceptions import APIError, RateLimitError
+from utils.exceptions import APIError, RateLimitError, CircuitOpenError
+from utils.metrics import metrics
+from utils.rate_limit import record_backend_rate_limit
+from services.http_pool import get_http_session
+from services.codec import encode_body, loads
+from services.circuit_breaker import get_circuit_breaker
+from services.concurrency_limiter import get_concurrency_limiter
+from services.hedging import get_hedger
+from services.response_cache import get_response_cache, GUEST_SCOPE
+from services.single_flight import get_history_flight
+from services.error_reporter import get_error_reporter
+from services.retry import RetryPolicy, get_retry_budget, parse_retry_after
+
+# Rate-limit reset values above this are Unix timestamps, not delays
+RESET_EPOCH_THRESHOLD = 1e9
+
+def get_request_headers() -> Dict[str, str]:
+    """
+    Build headers for backend API requests from the current session state.
+
+    Must be called from the Streamlit script thread, since it reads
+    ``st.session_state``.
+
+    Returns:
+        Dict[str, str]: Headers including authentication if available
+    """
+    headers = {
+        "Content-Type": "application/json",
+        "X-Client-Version": get_settings().CLIENT_VERSION,
+        "X-Session-ID": st.session_state.get("session_id", "")
+    }
+
+    # Add authentication token if available
+    if token := st.session_state.get("user_token"):
+        headers["Authorization"] = f"Bearer {token}"
+
+    return headers
 
 class APIClient:
     """
     Client for making requests to the backend API.
     
     Handles all communication with the API Gateway including authentication,
-    error handling, and retries.
+    error handling, and retries. Connections are drawn from the process-wide
+    pool returned by ``get_http_session``.
     """
     def __init__(self):
         self.settings = get_settings()
+        self.session = get_http_session()
         self.base_url = self.settings.API_URL
         self.timeout = 30
-        self.max_retries = 3
+        self.retry_policy = RetryPolicy.from_settings()
+        # Total tokens the backend reported for the last message, if any
+        self.last_usage_tokens: Optional[int] = None
 
     def send_message(
         self,
         message: str,
         session_id: str,
-        guest_mode: bool = True
+        guest_mode: bool = True,
+        use_cache: bool = False
     ) -> str:
         """
         Send a chat message to the API and get the response.
@@ -34,6 +79,8 @@ class APIClient:
             message: The user's message
             session_id: Current session identifier
             guest_mode: Whether the user is in guest mode
+            use_cache: Whether the message has no conversation context, so
+                a shared guest response may be served for it
 
         Returns:
             str: The AI's response
@@ -42,9 +89,15 @@ class APIClient:
             APIError: If the API request fails
             RateLimitError: If rate limit is exceeded
         """
-        endpoint = f"{self.base_url}/chat"
-        
+        self.last_usage_tokens = None
         headers = self._get_headers()
+
+        scope = self._cache_scope(guest_mode, use_cache, headers)
+        if scope and (cached := get_response_cache().get(scope, message)) is not None:
+            return cached
+
+        # Lets the backend deduplicate retried attempts of the same message
+        headers["Idempotency-Key"] = str(uuid.uuid4())
         
         payload = {
             "message": message,
@@ -53,29 +106,140 @@ class APIClient:
         }
 
         try:
-            response = requests.post(
-                endpoint,
-                json=payload,
-                headers=headers,
-                timeout=self.timeout
-            )
-            
-            if response.status_code == 429:
-                raise RateLimitError("Rate limit exceeded. Please try again later.")
+            response = self._hedged_chat_request(headers, payload, session_id, guest_mode, "api.chat")
+
+            with response:
+                self._observe_rate_limit(response, guest_mode)
+                response.raise_for_status()
                 
-            response.raise_for_status()
-            
-            return response.json()["response"]
+                body = loads(response.content)
+                reply = body["response"]
+                self.last_usage_tokens = self._parse_usage(body.get("usage"))
+
+            if scope:
+                get_response_cache().put(scope, message, reply)
+            return reply
             
         except RequestException as e:
             if "timeout" in str(e).lower():
                 raise APIError("Request timed out. Please try again.")
             raise APIError(f"Failed to send message: {str(e)}")
 
+    def stream_message(
+        self,
+        message: str,
+        session_id: str,
+        guest_mode: bool = True,
+        use_cache: bool = False
+    ) -> Iterator[str]:
+        """
+        Send a chat message and yield the response as it is generated.
+
+        The backend may answer with a Server-Sent Events stream, a chunked
+        plain-text body, or the regular buffered JSON body. The latter is
+        yielded as a single chunk so callers can treat all three alike.
+
+        Args:
+            message: The user's message
+            session_id: Current session identifier
+            guest_mode: Whether the user is in guest mode
+            use_cache: Whether the message has no conversation context, so
+                a shared guest response may be served for it
+
+        Yields:
+            str: Response text fragments in arrival order
+
+        Raises:
+            APIError: If the API request fails
+            RateLimitError: If rate limit is exceeded
+        """
+        self.last_usage_tokens = None
+        headers = self._get_headers()
+
+        scope = self._cache_scope(guest_mode, use_cache, headers)
+        if scope and (cached := get_response_cache().get(scope, message)) is not None:
+            yield cached
+            return
+
+        chunks = []
+        for chunk in self._stream_chunks(message, session_id, guest_mode, headers):
+            chunks.append(chunk)
+            yield chunk
+
+        if scope:
+            get_response_cache().put(scope, message, "".join(chunks))
+
+    def _stream_chunks(
+        self,
+        message: str,
+        session_id: str,
+        guest_mode: bool,
+        headers: Dict[str, str]
+    ) -> Iterator[str]:
+        """
+        Stream a chat response from the backend.
+
+        Args:
+            message: The user's message
+            session_id: Current session identifier
+            guest_mode: Whether the user is in guest mode
+            headers: Request headers
+
+        Yields:
+            str: Response text fragments in arrival order
+        """
+        headers = dict(headers)
+        headers["Idempotency-Key"] = str(uuid.uuid4())
+        headers["Accept"] = "text/event-stream, text/plain;q=0.9, application/json;q=0.8"
+
+        payload = {
+            "message": message,
+            "session_id": session_id,
+            "guest_mode": guest_mode,
+            "stream": True
+        }
+
+        try:
+            # Hedged on time to first byte; the body is then read from the winner
+            with self._hedged_chat_request(
+                headers, payload, session_id, guest_mode, "api.chat_ttfb"
+            ) as response:
+                self._observe_rate_limit(response, guest_mode)
+                response.raise_for_status()
+
+                content_type = response.headers.get("Content-Type", "")
+                if "charset" not in content_type:
+                    # requests assumes ISO-8859-1 for text/* without a charset
+                    response.encoding = "utf-8"
+
+                if content_type.startswith("text/event-stream"):
+                    for data in self._iter_sse_data(response):
+                        if data == "[DONE]":
+                            break
+                        if token := self._parse_stream_token(data):
+                            yield token
+                elif content_type.startswith("text/plain"):
+                    for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+                        if chunk:
+                            yield chunk
+                else:
+                    # Backend does not stream; fall back to the buffered body
+                    body = loads(response.content)
+                    self.last_usage_tokens = self._parse_usage(body.get("usage"))
+                    yield body["response"]
+
+        except RequestException as e:
+            if "timeout" in str(e).lower():
+                raise APIError("Request timed out. Please try again.")
+            raise APIError(f"Failed to send message: {str(e)}")
+
     def get_chat_history(self, limit: int = 30) -> list:
         """
         Retrieve chat history for authenticated users.
 
+        Identical concurrent fetches by the same user are coalesced into one
+        backend call, and the result is reused briefly for rapid reruns.
+
         Args:
             limit: Maximum number of sessions to retrieve
 
@@ -85,23 +249,37 @@ class APIClient:
         Raises:
             APIError: If the API request fails
         """
-        if not st.session_state.get("user_token"):
+        if not (token := st.session_state.get("user_token")):
             return []
 
-        endpoint = f"{self.base_url}/chat/history"
-        
         headers = self._get_headers()
         params = {"limit": limit}
+        key = (self._token_subject(token), "/chat/history", tuple(sorted(params.items())))
+
+        return get_history_flight().do(
+            key,
+            lambda: self._fetch_chat_history(headers, params),
+            name="api.chat_history"
+        )
+
+    def _fetch_chat_history(self, headers: Dict[str, str], params: Dict[str, Any]) -> list:
+        """
+        Fetch chat history from the backend.
+
+        Args:
+            headers: Request headers
+            params: Query parameters
+
+        Returns:
+            list: List of chat sessions
 
+        Raises:
+            APIError: If the API request fails
+        """
         try:
-            response = requests.get(
-                endpoint,
-                params=params,
-                headers=headers,
-                timeout=self.timeout
-            )
+            response = self._request("GET", "/chat/history", headers, params=params)
             response.raise_for_status()
-            return response.json()["sessions"]
+            return loads(response.content)["sessions"]
             
         except RequestException as e:
             raise APIError(f"Failed to fetch chat history: {str(e)}")
@@ -115,31 +293,414 @@ class APIClient:
         """
         Report an error to the backend for logging and monitoring.
 
+        The report is queued for background delivery and this call returns
+        immediately; reports are dropped rather than delaying the caller.
+
         Args:
             error_type: Type of error
             error_message: Error message
             context: Additional context about the error
         """
-        endpoint = f"{self.base_url}/error"
-        
-        headers = self._get_headers()
-        
+        if not self.settings.ENABLE_ERROR_REPORTING:
+            return
+
         payload = {
             "error_type": error_type,
             "error_message": error_message,
             "context": context
         }
 
+        get_error_reporter().submit(payload, self._get_headers())
+
+    def _token_subject(self, token: str) -> str:
+        """
+        Derive a stable identity for a bearer token.
+
+        Uses the verified ``sub`` claim when local JWT verification is
+        enabled; otherwise the token is hashed, since an unverified ``sub``
+        could be forged to read another user's cached data.
+
+        Args:
+            token: Bearer token
+
+        Returns:
+            str: Identity usable in shared cache keys
+        """
+        if self.settings.ENABLE_LOCAL_JWT_VERIFICATION:
+            # Deferred so guest sessions never load the JWT stack
+            from services.jwt_verifier import get_jwt_verifier
+            claims = get_jwt_verifier().claims_if_valid(token)
+            if claims and claims.get("sub"):
+                return f"sub:{claims['sub']}"
+        return "token:" + hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _cache_scope(
+        self,
+        guest_mode: bool,
+        use_cache: bool,
+        headers: Dict[str, str]
+    ) -> Optional[str]:
+        """
+        Get the response cache scope a request may use.
+
+        Only context-free messages from unauthenticated guests are eligible,
+        so an authenticated user's answer is never stored or served. The
+        backend must also keep no transcript for guest sessions: a cached
+        answer never reaches it, so follow-up questions would lose their
+        context.
+
+        Args:
+            guest_mode: Whether the user is in guest mode
+            use_cache: Whether the caller marked the message context-free
+            headers: Request headers
+
+        Returns:
+            Optional[str]: Cache scope, or None if caching does not apply
+        """
+        if (not self.settings.ENABLE_GUEST_RESPONSE_CACHE
+                or not self.settings.API_STATELESS_GUEST_SESSIONS
+                or not (use_cache and guest_mode)
+                or "Authorization" in headers):
+            return None
+        return GUEST_SCOPE
+
+    def _hedged_chat_request(
+        self,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        session_id: str,
+        guest_mode: bool,
+        name: str
+    ) -> requests.Response:
+        """
+        Send a ``/chat`` request, hedging it if it is slow to respond.
+
+        The time until the response headers arrive is recorded under
+        ``name`` and sets the hedge delay. Calls that fail without a
+        response, e.g. on an open circuit, are not recorded, since their
+        near-zero durations would pull the percentile down.
+
+        Args:
+            headers: Request headers, including the ``Idempotency-Key``
+            payload: Request body
+            session_id: Current session identifier
+            guest_mode: Whether the user is in guest mode
+            name: Timer and hedging metric name
+
+        Returns:
+            requests.Response: The winning response, body not yet read
+        """
+        started = time.monotonic()
+        response = get_hedger().run(
+            lambda: self._request(
+                "POST", "/chat", headers, json=payload, stream=True,
+                flow=session_id, priority=not guest_mode
+            ),
+            delay=self._hedge_delay(name),
+            name=name
+        )
+        metrics.record_timing(name, time.monotonic() - started)
+        return response
+
+    def _hedge_delay(self, name: str) -> Optional[float]:
+        """
+        Get how long a ``/chat`` call may run before it is hedged.
+
+        Args:
+            name: Timer holding the call's recent latencies
+
+        Returns:
+            Optional[float]: Seconds, or None if hedging is disabled or
+            there is not yet enough latency data
+        """
+        if not self.settings.API_HEDGE_ENABLED:
+            return None
+        return metrics.percentile(
+            name,
+            self.settings.API_HEDGE_PERCENTILE,
+            min_samples=self.settings.API_HEDGE_MIN_SAMPLES
+        )
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        headers: Dict[str, str],
+        idempotent: bool = True,
+        flow: Optional[str] = None,
+        priority: bool = False,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Perform a backend request, retrying transient failures.
+
+        Connection failures and retryable statuses are retried with the
+        client's ``RetryPolicy``, within the endpoint's process-wide retry
+        budget. ``Retry-After`` on 429/503 is honoured, and the total time
+        spent never exceeds the policy's ``max_elapsed``. Requests that are
+        not idempotent are only retried when the backend never processed
+        them, i.e. connect failures and 429/503 rejections. Every attempt
+        passes through the endpoint's circuit breaker and then takes a slot
+        from the process-wide adaptive concurrency limiter, whose queue
+        shares slots fairly across flows and serves the priority lane
+        first. A streamed response keeps its slot until it is closed, since
+        the backend is still working while the body streams.
+
+        Args:
+            method: HTTP method
+            path: API path relative to the base URL, e.g. ``/chat``
+            headers: Request headers
+            idempotent: Whether repeating the request is safe
+            flow: Flow for fair queueing, e.g. the session ID; defaults
+                to the path
+            priority: Whether to queue in the priority lane
+            **kwargs: Extra arguments passed to ``requests.Session.request``;
+                a ``json`` payload is encoded with the fast codec
+
+        Returns:
+            requests.Response: The final response, which may be an error status
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit breaker is open
+            OverloadedError: If no concurrency slot became free in time
+            RequestException: If the final attempt fails to get a response
+        """
+        policy = self.retry_policy
+        budget = get_retry_budget(path)
+        breaker = get_circuit_breaker(path)
+        limiter = get_concurrency_limiter()
+        budget.record_request()
+
+        if "json" in kwargs:
+            # Encode once so every attempt reuses the same (compressed) body
+            body, body_headers = encode_body(
+                kwargs.pop("json"),
+                compress=self.settings.API_COMPRESS_REQUESTS,
+                min_compress_bytes=self.settings.API_COMPRESS_MIN_BYTES
+            )
+            kwargs["data"] = body
+            headers = {**headers, **body_headers}
+
+        started = time.monotonic()
+        delay = policy.base_delay
+        attempt = 1
+
+        while True:
+            remaining = policy.max_elapsed - (time.monotonic() - started)
+            response = None
+            error = None
+
+            if not breaker.allow():
+                metrics.increment_counter("api.circuit_rejected", tags={"endpoint": path})
+                raise CircuitOpenError(
+                    "The assistant is temporarily unavailable. Please try again shortly.",
+                    error_code="CIRCUIT_OPEN",
+                    details={"endpoint": path, "retry_after": breaker.retry_after()}
+                )
+
+            attempt_started = limiter.acquire(
+                timeout=remaining,
+                flow=flow or path,
+                priority=priority
+            )
+            try:
+                response = self.session.request(
+                    method,
+                    f"{self.base_url}{path}",
+                    headers=headers,
+                    timeout=max(0.1, min(self.timeout, remaining)),
+                    **kwargs
+                )
+            except (ConnectionError, Timeout) as e:
+                latency = time.monotonic() - attempt_started
+                breaker.record(latency, success=False)
+                limiter.release(attempt_started, latency, success=False, endpoint=path)
+                # A connect failure means the request never reached the backend
+                if not (idempotent or isinstance(e, ConnectTimeout)):
+                    raise
+                error = e
+                reason = type(e).__name__
+                retry_after = None
+            except Exception:
+                limiter.release(attempt_started, time.monotonic() - attempt_started, success=False, endpoint=path)
+                raise
+            else:
+                latency = time.monotonic() - attempt_started
+                success = response.status_code < 500
+                breaker.record(latency, success=success)
+                if kwargs.get("stream"):
+                    self._release_on_close(response, limiter, attempt_started, latency, success, path)
+                else:
+                    limiter.release(attempt_started, latency, success, endpoint=path)
+                if not policy.is_retryable_status(response.status_code, idempotent):
+                    return response
+                reason = str(response.status_code)
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+            delay = policy.next_delay(delay)
+            wait = max(delay, retry_after or 0.0)
+            elapsed = time.monotonic() - started
+
+            give_up = attempt >= policy.max_attempts or elapsed + wait >= policy.max_elapsed
+            if not give_up and not budget.try_withdraw():
+                metrics.increment_counter("api.retry_budget_exhausted", tags={"endpoint": path})
+                give_up = True
+
+            if give_up:
+                if error is not None:
+                    raise error
+                return response
+
+            metrics.increment_counter("api.retries", tags={"endpoint": path, "reason": reason})
+            if response is not None:
+                response.close()
+            time.sleep(wait)
+            attempt += 1
+
+    @staticmethod
+    def _release_on_close(
+        response: requests.Response,
+        limiter,
+        started: float,
+        latency: float,
+        success: bool,
+        endpoint: str
+    ):
+        """
+        Hold a streamed response's concurrency slot until it is closed.
+
+        The slot is also released if the response is garbage collected
+        without being closed, so a leaked response cannot shrink the
+        limiter for good.
+        """
+        release = weakref.finalize(response, limiter.release, started, latency, success, endpoint)
+        close = response.close
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                release()
+
+        response.close = close_and_release
+
+    @staticmethod
+    def _iter_sse_data(response: requests.Response) -> Iterator[str]:
+        """
+        Yield the data payload of each Server-Sent Event in a response.
+
+        Args:
+            response: Streaming response object
+
+        Yields:
+            str: Data field of each event, multi-line fields joined by newlines
+        """
+        data_lines = []
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                # Blank line terminates the current event
+                if data_lines:
+                    yield "\n".join(data_lines)
+                    data_lines = []
+                continue
+            if line.startswith(":"):
+                continue
+            field, _, value = line.partition(":")
+            if field == "data":
+                data_lines.append(value[1:] if value.startswith(" ") else value)
+
+        if data_lines:
+            yield "\n".join(data_lines)
+
+    def _parse_stream_token(self, data: str) -> str:
+        """
+        Extract the text fragment from a stream event payload.
+
+        Token usage carried by an event is recorded in ``last_usage_tokens``.
+
+        Args:
+            data: Event data, either JSON or raw text
+
+        Returns:
+            str: Text fragment, empty if the event carries none
+        """
         try:
-            requests.post(
-                endpoint,
-                json=payload,
-                headers=headers,
-                timeout=self.timeout
+            event = loads(data)
+        except ValueError:
+            return data
+
+        if isinstance(event, dict):
+            if "error" in event:
+                raise APIError(f"Failed to send message: {event['error']}")
+            if "usage" in event:
+                self.last_usage_tokens = self._parse_usage(event["usage"])
+            return event.get("token") or event.get("response") or ""
+        return str(event)
+
+    @staticmethod
+    def _parse_usage(usage: Any) -> Optional[int]:
+        """
+        Get the total token count from a backend usage object.
+
+        Accepts ``total_tokens``, or ``prompt_tokens``/``completion_tokens``
+        and ``input_tokens``/``output_tokens`` pairs.
+
+        Args:
+            usage: Usage object from a response body or stream event
+
+        Returns:
+            Optional[int]: Total tokens, or None if not reported
+        """
+        if not isinstance(usage, dict):
+            return None
+        if isinstance(usage.get("total_tokens"), int):
+            return usage["total_tokens"]
+        for prompt_key, completion_key in (("prompt_tokens", "completion_tokens"),
+                                           ("input_tokens", "output_tokens")):
+            prompt, completion = usage.get(prompt_key), usage.get(completion_key)
+            if isinstance(prompt, int) and isinstance(completion, int):
+                return prompt + completion
+        return None
+
+    def _observe_rate_limit(self, response: requests.Response, guest_mode: bool):
+        """
+        Mirror the backend's rate-limit headers into local admission control.
+
+        A 429 holds the current user back for its ``Retry-After``, or
+        until the reported quota reset. A 503 with ``Retry-After`` means
+        the backend is overloaded and holds back the whole process. A
+        successful response reporting no remaining quota holds the user
+        back until the reset, so the next question is not sent only to be
+        rejected. Both ``RateLimit-*`` and ``X-RateLimit-*`` headers are
+        read.
+
+        Args:
+            response: Response from the backend
+            guest_mode: Whether the user is in guest mode
+
+        Raises:
+            RateLimitError: If the backend rejected the request with 429
+        """
+        headers = response.headers
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        remaining = _header_number(headers, "RateLimit-Remaining", "X-RateLimit-Remaining")
+        reset = _header_number(headers, "RateLimit-Reset", "X-RateLimit-Reset")
+        if reset is not None and reset > RESET_EPOCH_THRESHOLD:
+            reset = max(0.0, reset - time.time())
+
+        if response.status_code == 429:
+            wait = retry_after if retry_after is not None else reset
+            if wait:
+                record_backend_rate_limit(guest_mode, wait)
+            raise RateLimitError(
+                "Rate limit exceeded. Please try again later.",
+                error_code="BACKEND_RATE_LIMITED",
+                details={"retry_after": wait or 0.0}
             )
-        except RequestException:
-            # Silently fail for error reporting
-            pass
+        if response.status_code == 503 and retry_after:
+            record_backend_rate_limit(guest_mode, retry_after, per_user=False)
+        elif remaining is not None and remaining <= 0 and reset:
+            record_backend_rate_limit(guest_mode, reset)
 
     def _get_headers(self) -> Dict[str, str]:
         """
@@ -148,17 +709,7 @@ class APIClient:
         Returns:
             Dict[str, str]: Headers for the request
         """
-        headers = {
-            "Content-Type": "application/json",
-            "X-Client-Version": self.settings.CLIENT_VERSION,
-            "X-Session-ID": st.session_state.get("session_id", "")
-        }
-
-        # Add authentication token if available
-        if token := st.session_state.get("user_token"):
-            headers["Authorization"] = f"Bearer {token}"
-
-        return headers
+        return get_request_headers()
 
     def _handle_response_error(self, response: requests.Response):
         """
@@ -185,4 +736,22 @@ class APIClient:
                 del st.session_state.user_token
             raise APIError("Authentication failed. Please log in again.")
         else:
-            raise APIError(f"API Error: {error_message}")
\ No newline at end of file
+            raise APIError(f"API Error: {error_message}")
+
+def _header_number(headers, *names: str) -> Optional[float]:
+    """
+    Get the first of several headers that holds a number.
+
+    Args:
+        headers: Response headers
+        *names: Header names in order of preference
+
+    Returns:
+        Optional[float]: The value, or None if no header holds a number
+    """
+    for name in names:
+        try:
+            return float(headers[name])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
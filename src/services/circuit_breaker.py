@@ -0,0 +1,182 @@
+"""
+Circuit breaker guarding backend API endpoints.
+"""
+from typing import Deque, Tuple
+from collections import deque
+import threading
+import time
+import streamlit as st
+from utils.config import get_settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker driven by a rolling window.
+
+    The breaker opens when, over the last ``window_seconds``, at least
+    ``min_calls`` calls were made and either the error rate or the rate of
+    calls slower than ``slow_call_seconds`` reaches its threshold. After
+    ``open_seconds`` it lets ``half_open_calls`` probe calls through; if they
+    all succeed it closes again, otherwise it reopens.
+    """
+    def __init__(
+        self,
+        window_seconds: float = 30.0,
+        min_calls: int = 20,
+        error_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate_threshold: float = 0.8,
+        open_seconds: float = 15.0,
+        half_open_calls: int = 3
+    ):
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+        self._lock = threading.Lock()
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()
+        self._failures = 0
+        self._slow = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_started = 0
+        self._probes_succeeded = 0
+
+    @property
+    def state(self) -> str:
+        """Current breaker state."""
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may proceed.
+
+        In the half-open state each permitted call counts as a probe and must
+        be followed by a call to ``record``.
+
+        Returns:
+            bool: True if the call may proceed
+        """
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes_started < self.half_open_calls:
+                self._probes_started += 1
+                return True
+            return False
+
+    def record(self, latency: float, success: bool):
+        """
+        Record the outcome of a call.
+
+        Args:
+            latency: Call duration in seconds
+            success: Whether the backend handled the call successfully
+        """
+        now = time.monotonic()
+        slow = latency >= self.slow_call_seconds
+
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if not success or slow:
+                    self._open(now)
+                    return
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_calls:
+                    self._close()
+                return
+
+            if self._state == OPEN:
+                return
+
+            self._calls.append((now, not success, slow))
+            self._failures += not success
+            self._slow += slow
+            self._prune(now)
+
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            if (self._failures / total >= self.error_rate_threshold
+                    or self._slow / total >= self.slow_call_rate_threshold):
+                self._open(now)
+
+    def retry_after(self) -> float:
+        """
+        Seconds until the breaker next lets probe calls through.
+
+        Returns:
+            float: Remaining open time, 0 if not open
+        """
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def _prune(self, now: float):
+        """Drop calls that fell out of the rolling window."""
+        cutoff = now - self.window_seconds
+        while self._calls and self._calls[0][0] < cutoff:
+            _, failed, slow = self._calls.popleft()
+            self._failures -= failed
+            self._slow -= slow
+
+    def _maybe_half_open(self, now: float):
+        """
+        Move from open to half-open once the open period has elapsed.
+
+        Probes that never reported back are forgotten after another open
+        period so the breaker cannot stay stuck in half-open.
+        """
+        if self._state == CLOSED or now - self._opened_at < self.open_seconds:
+            return
+        self._state = HALF_OPEN
+        self._opened_at = now
+        self._probes_started = 0
+        self._probes_succeeded = 0
+
+    def _open(self, now: float):
+        """Trip the breaker."""
+        self._state = OPEN
+        self._opened_at = now
+
+    def _close(self):
+        """Reset the breaker to closed with an empty window."""
+        self._state = CLOSED
+        self._calls.clear()
+        self._failures = 0
+        self._slow = 0
+
+@st.cache_resource
+def get_circuit_breaker(endpoint: str) -> CircuitBreaker:
+    """
+    Get the process-wide circuit breaker for an endpoint.
+
+    Args:
+        endpoint: API path, e.g. ``/chat``
+
+    Returns:
+        CircuitBreaker: Breaker shared by all sessions for the endpoint
+    """
+    settings = get_settings()
+    return CircuitBreaker(
+        window_seconds=settings.CIRCUIT_WINDOW_SECONDS,
+        min_calls=settings.CIRCUIT_MIN_CALLS,
+        error_rate_threshold=settings.CIRCUIT_ERROR_RATE,
+        slow_call_seconds=settings.CIRCUIT_SLOW_CALL_SECONDS,
+        slow_call_rate_threshold=settings.CIRCUIT_SLOW_CALL_RATE,
+        open_seconds=settings.CIRCUIT_OPEN_SECONDS,
+        half_open_calls=settings.CIRCUIT_HALF_OPEN_CALLS
+    )
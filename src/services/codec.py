@@ -0,0 +1,72 @@
+"""
+JSON codec and body compression for backend API traffic.
+
+Uses ``orjson`` when it is installed and falls back to the standard library
+``json`` module otherwise. Both paths produce compact UTF-8 bytes.
+"""
+from typing import Any, Dict, Tuple, Union
+import gzip
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to JSON.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Deserialize JSON.
+
+    Args:
+        data: JSON document as bytes or text
+
+    Returns:
+        Any: Decoded object
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def encode_body(
+    payload: Any,
+    compress: bool = False,
+    min_compress_bytes: int = 4096
+) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Encode a request payload, gzip-compressing it when large enough.
+
+    Args:
+        payload: JSON-serializable request payload
+        compress: Whether compression is enabled
+        min_compress_bytes: Smallest body worth compressing
+
+    Returns:
+        Tuple[bytes, Dict[str, str]]: Body and the headers describing it
+    """
+    body = dumps(payload)
+    headers = {"Content-Type": "application/json"}
+
+    if compress and len(body) >= min_compress_bytes:
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+
+    return body, headers
@@ -1,23 +1,171 @@
 """
 AWS Cognito service integration for user authentication.
 """
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import threading
 import boto3
-from botocore.exceptions import ClientError
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError, ConnectTimeoutError, ReadTimeoutError
 import streamlit as st
 from utils.config import get_settings
 from utils.exceptions import AuthError
 
+# boto3's default session is not thread-safe, so clients are built under a lock
+_client_lock = threading.Lock()
+
+@st.cache_resource
+def get_cognito_client(region: str):
+    """
+    Get the process-wide Cognito Identity Provider client for a region.
+
+    Building a boto3 client loads service models and allocates a large
+    object graph, so one client (and its connection pool) is shared by all
+    sessions. boto3 clients are safe to use from multiple threads. The
+    client has explicit connect/read timeouts and uses botocore's adaptive
+    retry mode, which backs off client-side when Cognito throttles.
+
+    With ``COGNITO_FAKE`` enabled, an in-process ``FakeCognitoClient``
+    that auto-confirms sign-ups is returned instead, for local development
+    and load tests.
+
+    Args:
+        region: AWS region name
+
+    Returns:
+        CognitoIdentityProvider client
+    """
+    settings = get_settings()
+    if settings.COGNITO_FAKE:
+        from services.fake_cognito import FakeCognitoClient
+        return FakeCognitoClient(
+            latency=settings.COGNITO_FAKE_LATENCY_SECONDS,
+            latency_jitter=settings.COGNITO_FAKE_LATENCY_JITTER_SECONDS,
+            error_rate=settings.COGNITO_FAKE_ERROR_RATE,
+            auto_confirm=True,
+            issuer=f"https://cognito-idp.{region}.amazonaws.com/{settings.COGNITO_USER_POOL_ID}"
+        )
+
+    config = Config(
+        connect_timeout=settings.COGNITO_CONNECT_TIMEOUT,
+        read_timeout=settings.COGNITO_READ_TIMEOUT,
+        retries={"mode": "adaptive", "max_attempts": settings.COGNITO_MAX_ATTEMPTS},
+        max_pool_connections=settings.COGNITO_WORKERS
+    )
+    with _client_lock:
+        return boto3.session.Session().client('cognito-idp', region_name=region, config=config)
+
+class BoundedExecutor:
+    """
+    Thread pool that rejects work once ``workers + queue_depth`` calls are
+    pending, instead of queueing without bound.
+    """
+    def __init__(self, workers: int, queue_depth: int, name: str):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Optional[Future]:
+        """
+        Submit a call if there is capacity.
+
+        Args:
+            fn: Function to run
+            *args: Positional arguments for ``fn``
+            **kwargs: Keyword arguments for ``fn``
+
+        Returns:
+            Optional[Future]: Future for the call, or None if saturated
+        """
+        if not self._slots.acquire(blocking=False):
+            return None
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+@st.cache_resource
+def get_cognito_executor() -> BoundedExecutor:
+    """
+    Get the process-wide worker pool for Cognito calls.
+
+    Returns:
+        BoundedExecutor: Pool shared by all sessions
+    """
+    settings = get_settings()
+    return BoundedExecutor(
+        workers=settings.COGNITO_WORKERS,
+        queue_depth=settings.COGNITO_QUEUE_DEPTH,
+        name="cognito"
+    )
+
+def transport_error(error: BotoCoreError) -> AuthError:
+    """
+    Map a botocore transport error to an ``AuthError``.
+
+    Args:
+        error: Error raised by botocore before Cognito answered
+
+    Returns:
+        AuthError: ``AUTH_TIMEOUT`` for connect and read timeouts,
+        ``AUTH_UNAVAILABLE`` for any other failure to reach Cognito
+    """
+    if isinstance(error, (ConnectTimeoutError, ReadTimeoutError)):
+        return AuthError(
+            "The login service is taking too long to respond. Please try again.",
+            error_code="AUTH_TIMEOUT",
+            details={"reason": type(error).__name__}
+        )
+    return AuthError(
+        "The login service is unavailable. Please try again in a moment.",
+        error_code="AUTH_UNAVAILABLE",
+        details={"reason": type(error).__name__}
+    )
+
+def run_cognito_call(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a Cognito call on the bounded worker pool and wait for it.
+
+    Args:
+        fn: ``CognitoService`` method to call
+        *args: Positional arguments for ``fn``
+        **kwargs: Keyword arguments for ``fn``
+
+    Returns:
+        Any: The call's result
+
+    Raises:
+        AuthError: If the pool is saturated, the call times out, Cognito
+            cannot be reached, or the call itself fails
+    """
+    settings = get_settings()
+    future = get_cognito_executor().submit(fn, *args, **kwargs)
+    if future is None:
+        raise AuthError(
+            "The login service is busy. Please try again in a moment.",
+            error_code="AUTH_BUSY"
+        )
+
+    try:
+        return future.result(timeout=settings.COGNITO_CALL_TIMEOUT)
+    except FutureTimeoutError:
+        future.cancel()
+        raise AuthError(
+            "The login service is taking too long to respond. Please try again.",
+            error_code="AUTH_TIMEOUT"
+        )
+    except BotoCoreError as e:
+        raise transport_error(e)
+
 class CognitoService:
     """
     Handles AWS Cognito authentication operations.
     """
     def __init__(self):
         self.settings = get_settings()
-        self.client = boto3.client(
-            'cognito-idp',
-            region_name=self.settings.AWS_REGION
-        )
+        self.client = get_cognito_client(self.settings.AWS_REGION)
         self.user_pool_id = self.settings.COGNITO_USER_POOL_ID
         self.client_id = self.settings.COGNITO_CLIENT_ID
 
@@ -57,11 +205,13 @@ class CognitoService:
             error_message = e.response['Error']['Message']
             
             if error_code == 'NotAuthorizedException':
-                raise AuthError("Invalid username or password")
+                raise AuthError("Invalid username or password", error_code=error_code)
             elif error_code == 'UserNotConfirmedException':
-                raise AuthError("Please verify your email address")
+                raise AuthError("Please verify your email address", error_code=error_code)
             else:
-                raise AuthError(f"Authentication failed: {error_message}")
+                raise AuthError(f"Authentication failed: {error_message}", error_code=error_code)
+        except BotoCoreError as e:
+            raise transport_error(e)
 
     def sign_up(
         self,
@@ -111,11 +261,13 @@ class CognitoService:
             error_message = e.response['Error']['Message']
             
             if error_code == 'UsernameExistsException':
-                raise AuthError("Username already exists")
+                raise AuthError("Username already exists", error_code=error_code)
             elif error_code == 'InvalidPasswordException':
-                raise AuthError("Password does not meet requirements")
+                raise AuthError("Password does not meet requirements", error_code=error_code)
             else:
-                raise AuthError(f"Sign up failed: {error_message}")
+                raise AuthError(f"Sign up failed: {error_message}", error_code=error_code)
+        except BotoCoreError as e:
+            raise transport_error(e)
 
     def confirm_sign_up(self, username: str, confirmation_code: str):
         """
@@ -139,11 +291,13 @@ class CognitoService:
             error_message = e.response['Error']['Message']
             
             if error_code == 'CodeMismatchException':
-                raise AuthError("Invalid verification code")
+                raise AuthError("Invalid verification code", error_code=error_code)
             elif error_code == 'ExpiredCodeException':
-                raise AuthError("Verification code has expired")
+                raise AuthError("Verification code has expired", error_code=error_code)
             else:
-                raise AuthError(f"Confirmation failed: {error_message}")
+                raise AuthError(f"Confirmation failed: {error_message}", error_code=error_code)
+        except BotoCoreError as e:
+            raise transport_error(e)
 
     def refresh_token(self, refresh_token: str) -> Dict:
         """
@@ -173,8 +327,33 @@ class CognitoService:
             }
             
         except ClientError as e:
+            error_code = e.response['Error']['Code']
             error_message = e.response['Error']['Message']
-            raise AuthError(f"Token refresh failed: {error_message}")
+            raise AuthError(f"Token refresh failed: {error_message}", error_code=error_code)
+        except BotoCoreError as e:
+            raise transport_error(e)
+
+    def revoke_token(self, refresh_token: str):
+        """
+        Revoke a refresh token and the access tokens issued from it.
+
+        Args:
+            refresh_token: Refresh token to revoke
+
+        Raises:
+            AuthError: If revocation fails
+        """
+        params = {'Token': refresh_token, 'ClientId': self.client_id}
+        if self.settings.COGNITO_CLIENT_SECRET:
+            params['ClientSecret'] = self.settings.COGNITO_CLIENT_SECRET
+        try:
+            self.client.revoke_token(**params)
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            error_message = e.response['Error']['Message']
+            raise AuthError(f"Token revocation failed: {error_message}", error_code=error_code)
+        except BotoCoreError as e:
+            raise transport_error(e)
 
     def forgot_password(self, username: str):
         """
@@ -192,8 +371,11 @@ class CognitoService:
                 Username=username
             )
         except ClientError as e:
+            error_code = e.response['Error']['Code']
             error_message = e.response['Error']['Message']
-            raise AuthError(f"Failed to initiate password reset: {error_message}")
+            raise AuthError(f"Failed to initiate password reset: {error_message}", error_code=error_code)
+        except BotoCoreError as e:
+            raise transport_error(e)
 
     def confirm_forgot_password(
         self,
@@ -224,8 +406,10 @@ class CognitoService:
             error_message = e.response['Error']['Message']
             
             if error_code == 'CodeMismatchException':
-                raise AuthError("Invalid verification code")
+                raise AuthError("Invalid verification code", error_code=error_code)
             elif error_code == 'InvalidPasswordException':
-                raise AuthError("Password does not meet requirements")
+                raise AuthError("Password does not meet requirements", error_code=error_code)
             else:
-                raise AuthError(f"Password reset failed: {error_message}")
\ No newline at end of file
+                raise AuthError(f"Password reset failed: {error_message}", error_code=error_code)
+        except BotoCoreError as e:
+            raise transport_error(e)
\ No newline at end of file
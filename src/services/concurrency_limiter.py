@@ -0,0 +1,248 @@
+"""
+Adaptive limit on concurrent backend requests.
+"""
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+import streamlit as st
+from utils.config import get_settings
+from utils.exceptions import OverloadedError
+from utils.metrics import metrics
+from services.fair_queue import FairQueue, PRIORITY, STANDARD
+
+class LatencyWindow:
+    """
+    Recent and baseline response times of one endpoint.
+
+    The baseline follows the median of the last ``baseline_window``
+    successful responses, the recent latency is the median of the last
+    ``recent_window``. Comparing the two, rather than single responses to
+    a fixed target, tolerates endpoints whose normal latency is long or
+    varies with the work done, such as a buffered ``/chat`` answer. The
+    baseline falls at once but rises by at most ``max_rise`` per second,
+    so latency creeping up as the limit grows cannot carry it along.
+    """
+    def __init__(
+        self,
+        recent_window: int,
+        baseline_window: int,
+        min_samples: int,
+        max_rise: float = 0.01
+    ):
+        self.min_samples = min_samples
+        self.max_rise = max_rise
+        self._recent: "deque[float]" = deque(maxlen=recent_window)
+        self._baseline: "deque[float]" = deque(maxlen=baseline_window)
+        self._baseline_median: Optional[float] = None
+        self._updated_at = 0.0
+        self._since_update = 0
+
+    def add(self, latency: float):
+        """Record the latency of a successful response."""
+        self._recent.append(latency)
+        self._baseline.append(latency)
+        self._since_update += 1
+        # The baseline moves slowly; re-sort it once per recent window
+        if self._baseline_median is None or self._since_update >= self._recent.maxlen:
+            median = statistics.median(self._baseline)
+            now = time.monotonic()
+            if self._baseline_median is not None and median > self._baseline_median:
+                ceiling = self._baseline_median * (1 + self.max_rise * (now - self._updated_at))
+                median = min(median, ceiling)
+            self._baseline_median = median
+            self._updated_at = now
+            self._since_update = 0
+
+    def gradient(self) -> Optional[float]:
+        """
+        Get the recent median latency relative to the baseline.
+
+        Returns:
+            Optional[float]: Ratio, or None until both windows hold enough samples
+        """
+        if len(self._recent) < self._recent.maxlen or len(self._baseline) < self.min_samples:
+            return None
+        return statistics.median(self._recent) / max(self._baseline_median, 1e-6)
+
+    def reset_recent(self):
+        """Forget recent samples, e.g. after the limit was lowered."""
+        self._recent.clear()
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Additive-increase/multiplicative-decrease limit on in-flight requests.
+
+    Every completed request is a sample. A success while the limit is
+    fully used raises the limit by ``1 / limit``, i.e. by about one per
+    round of requests. A failure, or recent latencies of the request's
+    endpoint exceeding ``latency_tolerance`` times that endpoint's
+    baseline (see ``LatencyWindow``), multiplies it by ``backoff_ratio``;
+    requests that started before the last decrease cannot decrease it
+    again, so one overload episode shrinks the limit once per round
+    rather than once per failed request. Endpoints are tracked separately
+    so that a slow endpoint is not judged against a fast one.
+
+    Requests over the limit wait in a ``FairQueue``, which hands freed
+    slots to the priority lane (authenticated chat) first and shares them
+    fairly across sessions within a lane. A request waits at most its
+    lane's timeout and is shed when that passes or the lane is full.
+    """
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 2,
+        max_limit: int = 100,
+        latency_tolerance: float = 2.0,
+        recent_window: int = 20,
+        baseline_window: int = 500,
+        min_baseline_samples: int = 50,
+        backoff_ratio: float = 0.9,
+        max_queue: int = 50,
+        queue_timeout: float = 2.0,
+        priority_max_queue: int = 50,
+        priority_queue_timeout: float = 5.0
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.recent_window = recent_window
+        self.baseline_window = baseline_window
+        self.min_baseline_samples = min_baseline_samples
+        self.backoff_ratio = backoff_ratio
+        self.queue_timeouts = {PRIORITY: priority_queue_timeout, STANDARD: queue_timeout}
+
+        self._lock = threading.Lock()
+        self._queue = FairQueue({PRIORITY: priority_max_queue, STANDARD: max_queue})
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._latencies: Dict[str, LatencyWindow] = {}
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently in flight."""
+        return self._in_flight
+
+    def acquire(
+        self,
+        timeout: Optional[float] = None,
+        flow: str = "",
+        priority: bool = False,
+        weight: float = 1.0
+    ) -> float:
+        """
+        Wait for a free slot.
+
+        Args:
+            timeout: Longest wait in seconds, at most the lane's timeout
+            flow: Flow the request belongs to, e.g. a session ID
+            priority: Whether the request goes in the priority lane
+            weight: Flow's share relative to other flows in the lane
+
+        Returns:
+            float: Monotonic start time of the request, to pass to ``release``
+
+        Raises:
+            OverloadedError: If the lane is full or the wait timed out
+        """
+        lane = PRIORITY if priority else STANDARD
+        lane_timeout = self.queue_timeouts[lane]
+        timeout = lane_timeout if timeout is None else min(timeout, lane_timeout)
+
+        with self._lock:
+            if self._in_flight < int(self._limit) and not len(self._queue):
+                self._in_flight += 1
+                return time.monotonic()
+            waiter = self._queue.push(flow, lane, time.monotonic() + timeout, weight)
+            if waiter is None:
+                self._shed("queue_full", lane)
+
+        with metrics.timer("api.concurrency_queue_wait", tags={"lane": lane}):
+            waiter.admitted.wait(timeout)
+
+        with self._lock:
+            # Admission may race the timeout; a slot handed over is kept
+            if not waiter.admitted.is_set():
+                self._queue.cancel(waiter)
+                self._shed("timeout", lane)
+        return time.monotonic()
+
+    def release(self, started: float, latency: float, success: bool, endpoint: str = ""):
+        """
+        Free a slot and adapt the limit to the request's outcome.
+
+        Args:
+            started: Start time returned by ``acquire``
+            latency: Seconds until the backend responded
+            success: Whether the backend handled the request without error
+            endpoint: Endpoint whose latency baseline the request is judged by
+        """
+        with self._lock:
+            saturated = len(self._queue) > 0 or self._in_flight >= int(self._limit)
+            self._in_flight -= 1
+
+            congested = not success
+            if success:
+                window = self._latencies.get(endpoint)
+                if window is None:
+                    window = self._latencies[endpoint] = LatencyWindow(
+                        self.recent_window, self.baseline_window, self.min_baseline_samples
+                    )
+                window.add(latency)
+                gradient = window.gradient()
+                congested = gradient is not None and gradient > self.latency_tolerance
+
+            if congested:
+                if started >= self._last_decrease:
+                    self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                    self._last_decrease = time.monotonic()
+                    if success:
+                        # Judge the lowered limit by responses it admitted
+                        window.reset_recent()
+            elif saturated:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+            while self._in_flight < int(self._limit) and (waiter := self._queue.pop()):
+                self._in_flight += 1
+                waiter.admitted.set()
+            metrics.set_gauge("api.concurrency_limit", self._limit)
+
+    def _shed(self, reason: str, lane: str):
+        """Reject a request that could not get a slot."""
+        metrics.increment_counter("api.concurrency_shed", tags={"reason": reason, "lane": lane})
+        raise OverloadedError(
+            "The assistant is busy right now. Please try again in a few seconds.",
+            error_code="OVERLOADED",
+            details={"limit": int(self._limit), "in_flight": self._in_flight}
+        )
+
+@st.cache_resource
+def get_concurrency_limiter() -> AdaptiveConcurrencyLimiter:
+    """
+    Get the process-wide concurrency limiter for backend requests.
+
+    Returns:
+        AdaptiveConcurrencyLimiter: Limiter shared by all sessions
+    """
+    settings = get_settings()
+    return AdaptiveConcurrencyLimiter(
+        initial_limit=settings.API_CONCURRENCY_INITIAL_LIMIT,
+        min_limit=settings.API_CONCURRENCY_MIN_LIMIT,
+        max_limit=settings.API_CONCURRENCY_MAX_LIMIT,
+        latency_tolerance=settings.API_CONCURRENCY_LATENCY_TOLERANCE,
+        recent_window=settings.API_CONCURRENCY_LATENCY_WINDOW,
+        baseline_window=settings.API_CONCURRENCY_BASELINE_WINDOW,
+        min_baseline_samples=settings.API_CONCURRENCY_BASELINE_MIN_SAMPLES,
+        backoff_ratio=settings.API_CONCURRENCY_BACKOFF_RATIO,
+        max_queue=settings.API_CONCURRENCY_QUEUE_SIZE,
+        queue_timeout=settings.API_CONCURRENCY_QUEUE_TIMEOUT,
+        priority_max_queue=settings.API_PRIORITY_QUEUE_SIZE,
+        priority_queue_timeout=settings.API_PRIORITY_QUEUE_TIMEOUT
+    )
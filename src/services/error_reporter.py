@@ -0,0 +1,205 @@
+"""
+Background delivery of error reports to the backend.
+"""
+from typing import Any, Dict, List, Tuple
+import atexit
+import queue
+import threading
+import time
+from requests.exceptions import RequestException
+import streamlit as st
+from utils.config import get_settings
+from utils.metrics import metrics
+from services.circuit_breaker import get_circuit_breaker
+from services.codec import encode_body
+from services.http_pool import get_http_session
+
+ERROR_PATH = "/error"
+
+class ErrorReporter:
+    """
+    Bounded queue of error reports drained by background worker threads.
+
+    ``submit`` never blocks: when the queue is full the report is dropped
+    and counted. Workers gather up to ``batch_size`` reports, waiting at
+    most ``flush_interval`` seconds for a batch to fill, and post reports
+    from the same caller together. A single report is posted in the
+    original ``/error`` payload shape; several are wrapped in ``errors``,
+    each tagged with its ``session_id``.
+    """
+    def __init__(
+        self,
+        base_url: str,
+        max_queue: int,
+        workers: int,
+        batch_size: int,
+        flush_interval: float,
+        timeout: float
+    ):
+        self.url = f"{base_url}{ERROR_PATH}"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self._queue: "queue.Queue[Tuple[Dict[str, Any], Dict[str, str]]]" = queue.Queue(maxsize=max_queue)
+        self._stopping = threading.Event()
+        self._workers = [
+            threading.Thread(target=self._run, name=f"error-reporter-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, report: Dict[str, Any], headers: Dict[str, str]) -> bool:
+        """
+        Queue an error report for delivery.
+
+        Args:
+            report: Error report payload
+            headers: Request headers captured on the script thread
+
+        Returns:
+            bool: False if the report was dropped
+        """
+        if self._stopping.is_set():
+            metrics.increment_counter("error_reports.dropped", tags={"reason": "shutdown"})
+            return False
+
+        try:
+            self._queue.put_nowait((report, headers))
+        except queue.Full:
+            metrics.increment_counter("error_reports.dropped", tags={"reason": "queue_full"})
+            return False
+
+        metrics.set_gauge("error_reports.queue_depth", self._queue.qsize())
+        return True
+
+    def shutdown(self, timeout: float = 5.0):
+        """
+        Stop accepting reports and flush what is queued.
+
+        Args:
+            timeout: Maximum seconds to wait for the workers
+        """
+        self._stopping.set()
+        deadline = time.monotonic() + timeout
+        for worker in self._workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+
+    def _run(self):
+        """Worker loop: collect batches and send them until stopped and drained."""
+        while True:
+            batch = self._collect_batch()
+            if batch:
+                self._send_batch(batch)
+            elif self._stopping.is_set():
+                return
+
+    def _collect_batch(self) -> List[Tuple[Dict[str, Any], Dict[str, str]]]:
+        """
+        Collect up to ``batch_size`` queued reports.
+
+        Returns:
+            List: Reports with their headers, empty if none arrived
+        """
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stopping.is_set():
+                # Drain without waiting once the interval is over or on shutdown
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except queue.Empty:
+                    break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _send_batch(self, batch: List[Tuple[Dict[str, Any], Dict[str, str]]]):
+        """
+        Post a batch, grouping reports that share request headers.
+
+        A group that cannot be encoded or sent is counted as failed and
+        dropped; nothing is raised, so the worker keeps running.
+
+        Args:
+            batch: Reports with their headers
+        """
+        groups: Dict[Tuple, List[Tuple[Dict[str, Any], Dict[str, str]]]] = {}
+        for report, headers in batch:
+            # Reports from different sessions of the same caller share a POST
+            key = tuple(sorted((k, v) for k, v in headers.items() if k != "X-Session-ID"))
+            groups.setdefault(key, []).append((report, headers))
+
+        breaker = get_circuit_breaker(ERROR_PATH)
+        session = get_http_session()
+
+        for items in groups.values():
+            if len(items) == 1:
+                payload, headers = items[0]
+            else:
+                headers = {k: v for k, v in items[0][1].items() if k != "X-Session-ID"}
+                payload = {"errors": [
+                    {**report, "session_id": report_headers.get("X-Session-ID", "")}
+                    for report, report_headers in items
+                ]}
+
+            try:
+                body, body_headers = encode_body(payload)
+            except Exception:
+                # E.g. a context that is not JSON-serializable; drop the group, keep the worker
+                metrics.increment_counter("error_reports.failed", len(items), tags={"reason": "encode"})
+                continue
+
+            if not breaker.allow():
+                metrics.increment_counter(
+                    "error_reports.dropped",
+                    len(items),
+                    tags={"reason": "circuit_open"}
+                )
+                continue
+
+            started = time.monotonic()
+            try:
+                response = session.post(
+                    self.url,
+                    data=body,
+                    headers={**headers, **body_headers},
+                    timeout=self.timeout
+                )
+                response.close()
+                breaker.record(time.monotonic() - started, success=response.status_code < 500)
+                metrics.increment_counter("error_reports.sent", len(items))
+            except Exception as e:
+                # Any failure is counted; letting it escape would kill the worker thread
+                breaker.record(time.monotonic() - started, success=False)
+                reason = "request" if isinstance(e, RequestException) else "error"
+                metrics.increment_counter("error_reports.failed", len(items), tags={"reason": reason})
+
+@st.cache_resource
+def get_error_reporter() -> ErrorReporter:
+    """
+    Get the process-wide error reporter, flushed at interpreter exit.
+
+    Returns:
+        ErrorReporter: Shared background reporter
+    """
+    settings = get_settings()
+    reporter = ErrorReporter(
+        base_url=settings.API_URL,
+        max_queue=settings.ERROR_REPORT_QUEUE_SIZE,
+        workers=settings.ERROR_REPORT_WORKERS,
+        batch_size=settings.ERROR_REPORT_BATCH_SIZE,
+        flush_interval=settings.ERROR_REPORT_FLUSH_SECONDS,
+        timeout=settings.ERROR_REPORT_TIMEOUT
+    )
+    atexit.register(reporter.shutdown)
+    return reporter
@@ -0,0 +1,130 @@
+"""
+Weighted fair queueing of waiting backend requests.
+"""
+from typing import Dict, List, Optional, Tuple
+import heapq
+import itertools
+import threading
+import time
+
+PRIORITY = "priority"
+STANDARD = "standard"
+LANES = (PRIORITY, STANDARD)
+
+class Waiter:
+    """A request waiting in a ``FairQueue`` to be admitted."""
+    def __init__(self, flow: str, lane: str, deadline: float):
+        self.flow = flow
+        self.lane = lane
+        self.deadline = deadline
+        self.admitted = threading.Event()
+        self.cancelled = False
+
+class FairQueue:
+    """
+    Two-lane queue ordering waiting requests fairly across flows.
+
+    The priority lane is always served before the standard lane. Within a
+    lane, flows (sessions) are served by weighted fair queueing: a
+    request starts at ``max(virtual time, flow's last finish)`` and
+    finishes ``cost / weight`` later, the lowest finish is served first,
+    and the virtual time advances to the start of each request served. A
+    flow thus gets a share of admissions proportional to its weight
+    however many requests it queues, and a newly active flow is served
+    promptly instead of behind a busy flow's backlog. Each lane holds at
+    most its configured depth, and a request whose deadline passes is
+    dropped rather than admitted.
+
+    Not thread-safe; the owner serializes access.
+    """
+    def __init__(self, depths: Dict[str, int]):
+        self.depths = depths
+        self._heaps: Dict[str, List[Tuple[float, int, float, Waiter]]] = {lane: [] for lane in LANES}
+        self._sizes = {lane: 0 for lane in LANES}
+        self._virtual_time = {lane: 0.0 for lane in LANES}
+        self._finish: Dict[str, Dict[str, float]] = {lane: {} for lane in LANES}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return sum(self._sizes.values())
+
+    def size(self, lane: str) -> int:
+        """Number of requests waiting in a lane."""
+        return self._sizes[lane]
+
+    def push(
+        self,
+        flow: str,
+        lane: str,
+        deadline: float,
+        weight: float = 1.0,
+        cost: float = 1.0
+    ) -> Optional[Waiter]:
+        """
+        Queue a request.
+
+        Args:
+            flow: Flow the request belongs to, e.g. a session ID
+            lane: ``PRIORITY`` or ``STANDARD``
+            deadline: Monotonic time after which the request is dropped
+            weight: Flow's share relative to other flows in the lane
+            cost: Size of the request relative to others
+
+        Returns:
+            Optional[Waiter]: The queued request, or None if the lane is full
+        """
+        if self._sizes[lane] >= self.depths[lane]:
+            return None
+
+        finishes = self._finish[lane]
+        start = max(self._virtual_time[lane], finishes.get(flow, 0.0))
+        finish = start + cost / weight
+        finishes[flow] = finish
+
+        waiter = Waiter(flow, lane, deadline)
+        heapq.heappush(self._heaps[lane], (finish, next(self._seq), start, waiter))
+        self._sizes[lane] += 1
+        return waiter
+
+    def pop(self) -> Optional[Waiter]:
+        """
+        Take the next request to admit.
+
+        Returns:
+            Optional[Waiter]: The request, or None if none is waiting
+        """
+        now = time.monotonic()
+        for lane in LANES:
+            heap = self._heaps[lane]
+            while heap:
+                _, _, start, waiter = heapq.heappop(heap)
+                if waiter.cancelled:
+                    continue
+                self._sizes[lane] -= 1
+                if waiter.deadline <= now:
+                    # Its caller is about to give up; admitting it would waste the slot
+                    waiter.cancelled = True
+                    continue
+                self._virtual_time[lane] = max(self._virtual_time[lane], start)
+                self._prune(lane)
+                return waiter
+        return None
+
+    def cancel(self, waiter: Waiter):
+        """
+        Withdraw a request that is still waiting.
+
+        Args:
+            waiter: Request returned by ``push``
+        """
+        if not waiter.cancelled:
+            waiter.cancelled = True
+            self._sizes[waiter.lane] -= 1
+
+    def _prune(self, lane: str):
+        """Forget flows that have nothing queued beyond the virtual time."""
+        finishes = self._finish[lane]
+        if len(finishes) > 2 * self._sizes[lane] + 64:
+            virtual_time = self._virtual_time[lane]
+            for flow in [flow for flow, finish in finishes.items() if finish <= virtual_time]:
+                del finishes[flow]
@@ -0,0 +1,304 @@
+"""
+In-process stand-in for the ``cognito-idp`` operations used by CognitoService.
+
+For local development and load tests only; it never contacts AWS.
+"""
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+import random
+import secrets
+import threading
+import time
+import uuid
+from botocore.exceptions import ClientError
+from jwt import JWT, jwk_from_pem
+
+FAKE_KEY_ID = "fake-cognito-1"
+
+@dataclass
+class _User:
+    """A user stored by the fake."""
+    password: str
+    email: str
+    sub: str
+    confirmed: bool
+    code: Optional[str] = None
+
+class FakeCognitoClient:
+    """
+    Thread-safe fake of the boto3 ``cognito-idp`` client.
+
+    Implements ``initiate_auth`` (``USER_PASSWORD_AUTH`` and
+    ``REFRESH_TOKEN_AUTH``), ``sign_up``, ``confirm_sign_up``, ``revoke_token``,
+    ``forgot_password`` and ``confirm_forgot_password``, returning the same
+    response shapes and raising ``ClientError`` with the same error codes as
+    Cognito. Verification codes are not sent anywhere; read them with
+    ``get_code``. Access and ID tokens are RS256-signed with a key
+    generated on first use; ``jwks`` returns the matching public keys, so
+    local JWT verification works against the fake.
+
+    Each call sleeps for ``latency`` seconds plus up to ``latency_jitter``
+    seconds and fails with probability ``error_rate`` with one of
+    ``error_codes``. ``fail_next`` injects specific failures.
+    """
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_codes: Optional[List[str]] = None,
+        auto_confirm: bool = False,
+        expires_in: int = 3600,
+        seed: Optional[int] = None,
+        issuer: str = "https://cognito-idp.local/fake"
+    ):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_codes = error_codes or ["TooManyRequestsException", "InternalErrorException"]
+        self.auto_confirm = auto_confirm
+        self.expires_in = expires_in
+        self.issuer = issuer
+
+        self._random = random.Random(seed)
+        self._users: Dict[str, _User] = {}
+        self._refresh_tokens: Dict[str, str] = {}
+        self._injected: Dict[str, List[str]] = {}
+        self._calls: Dict[str, int] = {}
+        self._signing_key = None
+        self._key_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def add_user(self, username: str, password: str, email: str = "", confirmed: bool = True):
+        """
+        Create a user directly, bypassing sign-up.
+
+        Args:
+            username: Username
+            password: Password
+            email: Email address
+            confirmed: Whether the user can log in immediately
+        """
+        with self._lock:
+            self._users[username] = _User(password, email, str(uuid.uuid4()), confirmed)
+
+    def get_code(self, username: str) -> Optional[str]:
+        """
+        Get the pending verification code for a user.
+
+        Args:
+            username: Username
+
+        Returns:
+            Optional[str]: The code, or None if none is pending
+        """
+        with self._lock:
+            user = self._users.get(username)
+            return user.code if user else None
+
+    def fail_next(self, operation: str, error_code: str, count: int = 1):
+        """
+        Make the next calls of an operation fail.
+
+        Args:
+            operation: Operation name, e.g. ``initiate_auth``
+            error_code: Cognito error code to raise
+            count: Number of calls to fail
+        """
+        with self._lock:
+            self._injected.setdefault(operation, []).extend([error_code] * count)
+
+    def call_counts(self) -> Dict[str, int]:
+        """
+        Get the number of calls per operation.
+
+        Returns:
+            Dict[str, int]: Calls made, including failed ones
+        """
+        with self._lock:
+            return dict(self._calls)
+
+    def initiate_auth(self, AuthFlow: str, AuthParameters: Dict[str, str], ClientId: str, **kwargs) -> Dict:
+        """Fake of ``initiate_auth``."""
+        self._begin("initiate_auth")
+        with self._lock:
+            if AuthFlow == "USER_PASSWORD_AUTH":
+                username = AuthParameters.get("USERNAME", "")
+                user = self._users.get(username)
+                if user is None or user.password != AuthParameters.get("PASSWORD"):
+                    raise _error("NotAuthorizedException", "Incorrect username or password.", "initiate_auth")
+                if not user.confirmed:
+                    raise _error("UserNotConfirmedException", "User is not confirmed.", "initiate_auth")
+                refresh_token = _opaque_token(1200)
+                self._refresh_tokens[refresh_token] = username
+                return self._auth_result(user, ClientId, refresh_token)
+
+            if AuthFlow == "REFRESH_TOKEN_AUTH":
+                username = self._refresh_tokens.get(AuthParameters.get("REFRESH_TOKEN", ""))
+                if username is None or username not in self._users:
+                    raise _error("NotAuthorizedException", "Invalid Refresh Token", "initiate_auth")
+                return self._auth_result(self._users[username], ClientId, None)
+
+        raise _error("InvalidParameterException", f"Unsupported AuthFlow {AuthFlow}", "initiate_auth")
+
+    def sign_up(self, ClientId: str, Username: str, Password: str,
+                UserAttributes: Optional[List[Dict[str, str]]] = None, **kwargs) -> Dict:
+        """Fake of ``sign_up``."""
+        self._begin("sign_up")
+        if len(Password) < 8:
+            raise _error("InvalidPasswordException", "Password did not conform with policy", "sign_up")
+        email = next((a["Value"] for a in UserAttributes or [] if a["Name"] == "email"), "")
+
+        with self._lock:
+            if Username in self._users:
+                raise _error("UsernameExistsException", "User already exists", "sign_up")
+            user = _User(Password, email, str(uuid.uuid4()), self.auto_confirm)
+            if not user.confirmed:
+                user.code = _verification_code(self._random)
+            self._users[Username] = user
+            return {"UserSub": user.sub, "UserConfirmed": user.confirmed}
+
+    def confirm_sign_up(self, ClientId: str, Username: str, ConfirmationCode: str, **kwargs) -> Dict:
+        """Fake of ``confirm_sign_up``."""
+        self._begin("confirm_sign_up")
+        with self._lock:
+            user = self._get_user(Username, "confirm_sign_up")
+            if user.confirmed:
+                raise _error("NotAuthorizedException", "User cannot be confirmed. Current status is CONFIRMED",
+                             "confirm_sign_up")
+            self._check_code(user, ConfirmationCode, "confirm_sign_up")
+            user.confirmed = True
+            return {}
+
+    def revoke_token(self, Token: str, ClientId: str, **kwargs) -> Dict:
+        """Fake of ``revoke_token``."""
+        self._begin("revoke_token")
+        with self._lock:
+            self._refresh_tokens.pop(Token, None)
+            return {}
+
+    def forgot_password(self, ClientId: str, Username: str, **kwargs) -> Dict:
+        """Fake of ``forgot_password``."""
+        self._begin("forgot_password")
+        with self._lock:
+            user = self._get_user(Username, "forgot_password")
+            user.code = _verification_code(self._random)
+            return {"CodeDeliveryDetails": {
+                "Destination": user.email,
+                "DeliveryMedium": "EMAIL",
+                "AttributeName": "email"
+            }}
+
+    def confirm_forgot_password(self, ClientId: str, Username: str, ConfirmationCode: str,
+                                Password: str, **kwargs) -> Dict:
+        """Fake of ``confirm_forgot_password``."""
+        self._begin("confirm_forgot_password")
+        if len(Password) < 8:
+            raise _error("InvalidPasswordException", "Password did not conform with policy",
+                         "confirm_forgot_password")
+        with self._lock:
+            user = self._get_user(Username, "confirm_forgot_password")
+            self._check_code(user, ConfirmationCode, "confirm_forgot_password")
+            user.password = Password
+            user.confirmed = True
+            return {}
+
+    def _begin(self, operation: str):
+        """Count the call, apply latency and raise any injected error."""
+        with self._lock:
+            self._calls[operation] = self._calls.get(operation, 0) + 1
+            delay = self.latency + self._random.uniform(0, self.latency_jitter)
+            injected = self._injected.get(operation)
+            if injected:
+                error_code = injected.pop(0)
+            elif self.error_rate and self._random.random() < self.error_rate:
+                error_code = self._random.choice(self.error_codes)
+            else:
+                error_code = None
+
+        if delay > 0:
+            time.sleep(delay)
+        if error_code:
+            raise _error(error_code, f"Injected {error_code}", operation)
+
+    def _get_user(self, username: str, operation: str) -> _User:
+        """Look up a user; the caller must hold the lock."""
+        user = self._users.get(username)
+        if user is None:
+            raise _error("UserNotFoundException", "Username/client id combination not found.", operation)
+        return user
+
+    def _check_code(self, user: _User, code: str, operation: str):
+        """Check and consume a verification code; the caller must hold the lock."""
+        if user.code is None:
+            raise _error("ExpiredCodeException", "Invalid code provided, please request a code again.", operation)
+        if code != user.code:
+            raise _error("CodeMismatchException", "Invalid verification code provided, please try again.",
+                         operation)
+        user.code = None
+
+    def jwks(self) -> Dict[str, Any]:
+        """
+        Get the public signing keys, as the user pool's ``jwks.json``.
+
+        Returns:
+            Dict[str, Any]: JWKS document
+        """
+        public = self._get_signing_key().to_dict(public_only=True)
+        return {"keys": [{**public, "kid": FAKE_KEY_ID, "alg": "RS256", "use": "sig"}]}
+
+    def _get_signing_key(self):
+        """Get the token signing key, generating it on first use."""
+        with self._key_lock:
+            if self._signing_key is None:
+                from cryptography.hazmat.primitives import serialization
+                from cryptography.hazmat.primitives.asymmetric import rsa
+
+                private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+                self._signing_key = jwk_from_pem(private_key.private_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PrivateFormat.PKCS8,
+                    serialization.NoEncryption()
+                ))
+            return self._signing_key
+
+    def _token(self, sub: str, client_id: str, token_use: str) -> str:
+        """Sign a Cognito-shaped access or ID token."""
+        now = int(time.time())
+        claims = {
+            "sub": sub,
+            "iss": self.issuer,
+            "token_use": token_use,
+            "iat": now,
+            "exp": now + self.expires_in
+        }
+        claims["client_id" if token_use == "access" else "aud"] = client_id
+        return JWT().encode(claims, self._get_signing_key(), alg="RS256",
+                            optional_headers={"kid": FAKE_KEY_ID})
+
+    def _auth_result(self, user: _User, client_id: str, refresh_token: Optional[str]) -> Dict:
+        """Build an ``initiate_auth`` response."""
+        result = {
+            "AccessToken": self._token(user.sub, client_id, "access"),
+            "IdToken": self._token(user.sub, client_id, "id"),
+            "ExpiresIn": self.expires_in,
+            "TokenType": "Bearer"
+        }
+        if refresh_token:
+            result["RefreshToken"] = refresh_token
+        return {"ChallengeParameters": {}, "AuthenticationResult": result}
+
+def _error(code: str, message: str, operation: str) -> ClientError:
+    """Build a ClientError shaped like the ones botocore raises."""
+    return ClientError(
+        {"Error": {"Code": code, "Message": message}, "ResponseMetadata": {"HTTPStatusCode": 400}},
+        operation
+    )
+
+def _verification_code(rng: random.Random) -> str:
+    """Generate a six-digit verification code."""
+    return f"{rng.randrange(10 ** 6):06d}"
+
+def _opaque_token(size: int) -> str:
+    """Generate an opaque token of roughly ``size`` characters."""
+    return secrets.token_urlsafe(size * 3 // 4)
@@ -0,0 +1,129 @@
+"""
+Hedged requests for cutting backend tail latency.
+"""
+from typing import Callable, Optional
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+import threading
+import requests
+import streamlit as st
+from utils.config import get_settings
+from utils.metrics import metrics
+from services.retry import RetryBudget
+
+class Hedger:
+    """
+    Runs a request and, if it is slower than a latency percentile, races a
+    second identical request against it.
+
+    The first 2xx response wins. Requests must be idempotent, since
+    both copies may reach the backend. Blocking ``requests`` calls cannot be
+    interrupted, so the losing request is cancelled if it has not started
+    and otherwise has its response closed as soon as it arrives; issuing
+    both with ``stream=True`` keeps the loser's body from being downloaded.
+
+    Extra load is bounded twice: hedges draw from a token budget refilled
+    by a fixed fraction of requests, and only a limited number of hedged
+    calls may be in flight at once. A call keeps its slot until its losing
+    request has finished too, since that request still occupies a worker;
+    when no slot is free the request runs inline, unhedged, rather than
+    queueing behind other calls' workers.
+    """
+    def __init__(self, max_workers: int, budget_ratio: float):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="api-hedge"
+        )
+        # Each hedged call may occupy two workers
+        self._slots = threading.BoundedSemaphore(max(1, max_workers // 2))
+        self._budget = RetryBudget(ratio=budget_ratio, min_per_second=0.0, max_tokens=10.0)
+
+    def run(
+        self,
+        request: Callable[[], requests.Response],
+        delay: Optional[float],
+        name: str
+    ) -> requests.Response:
+        """
+        Run a request, hedging it after ``delay`` seconds.
+
+        Args:
+            request: Callable performing one request
+            delay: Seconds to wait before hedging, None to never hedge
+            name: Metric name prefix, e.g. ``api.chat``
+
+        Returns:
+            requests.Response: The winning response
+        """
+        self._budget.record_request()
+
+        if delay is None or not self._slots.acquire(blocking=False):
+            return request()
+
+        release_slot = True
+        try:
+            primary = self._executor.submit(request)
+            done, _ = wait([primary], timeout=delay)
+            if done or not self._budget.try_withdraw():
+                return primary.result()
+
+            metrics.increment_counter(f"{name}.hedged")
+            hedge = self._executor.submit(request)
+            winner = self._first_success([primary, hedge])
+
+            if winner is hedge:
+                metrics.increment_counter(f"{name}.hedge_wins")
+
+            loser = hedge if winner is primary else primary
+            if not loser.cancel():
+                loser.add_done_callback(self._close_response)
+                loser.add_done_callback(lambda _: self._slots.release())
+                release_slot = False
+            return winner.result()
+        finally:
+            if release_slot:
+                self._slots.release()
+
+    @staticmethod
+    def _first_success(futures: list) -> Future:
+        """
+        Wait for the first future that yields a 2xx response.
+
+        A 409 or 429 is not a success: the hedge may be refused because
+        the primary, sent with the same ``Idempotency-Key``, is still in
+        flight, and must not beat a primary that would succeed.
+
+        Args:
+            futures: Primary and hedge futures
+
+        Returns:
+            Future: The winning future, or the primary if neither succeeded
+        """
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and 200 <= future.result().status_code < 300:
+                    return future
+
+        # Both failed: surface the primary's outcome and discard the other
+        return futures[0]
+
+    @staticmethod
+    def _close_response(future: Future):
+        """Release the connection held by a losing request."""
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+@st.cache_resource
+def get_hedger() -> Hedger:
+    """
+    Get the process-wide hedger.
+
+    Returns:
+        Hedger: Shared hedger for backend requests
+    """
+    settings = get_settings()
+    return Hedger(
+        max_workers=settings.API_HEDGE_MAX_WORKERS,
+        budget_ratio=settings.API_HEDGE_BUDGET_RATIO
+    )
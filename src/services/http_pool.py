@@ -0,0 +1,83 @@
+"""
+Process-wide pooled HTTP session for backend API traffic.
+"""
+import socket
+from http.cookiejar import DefaultCookiePolicy
+from typing import List, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+import streamlit as st
+from utils.config import get_settings
+
+class KeepAliveAdapter(HTTPAdapter):
+    """
+    HTTP adapter that enables TCP keep-alive on pooled connections.
+
+    Idle pooled connections to API Gateway are otherwise silently dropped by
+    intermediate load balancers, which forces a fresh TCP + TLS handshake on
+    the next request.
+    """
+    def __init__(self, keepalive_idle: int, keepalive_interval: int, **kwargs):
+        self.keepalive_idle = keepalive_idle
+        self.keepalive_interval = keepalive_interval
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the urllib3 pool manager with keep-alive socket options."""
+        kwargs["socket_options"] = self._socket_options()
+        super().init_poolmanager(*args, **kwargs)
+
+    def _socket_options(self) -> List[Tuple[int, int, int]]:
+        """
+        Build socket options for new pooled connections.
+
+        Returns:
+            List[Tuple[int, int, int]]: Options passed to ``setsockopt``
+        """
+        options = [
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+
+        # Fine-grained keep-alive tuning is not available on every platform
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.keepalive_idle))
+        if hasattr(socket, "TCP_KEEPINTVL"):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, self.keepalive_interval))
+
+        return options
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    Get the shared HTTP session used for all backend API calls.
+
+    The session is created once per process and reused by every
+    ``APIClient`` instance so connections to the backend stay warm across
+    Streamlit sessions and reruns.
+
+    Returns:
+        requests.Session: Shared session with a bounded connection pool
+    """
+    settings = get_settings()
+
+    adapter = KeepAliveAdapter(
+        keepalive_idle=settings.API_KEEPALIVE_IDLE,
+        keepalive_interval=settings.API_KEEPALIVE_INTERVAL,
+        pool_connections=settings.API_POOL_CONNECTIONS,
+        pool_maxsize=settings.API_POOL_MAXSIZE,
+        pool_block=settings.API_POOL_BLOCK
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Connection": "keep-alive",
+        "Accept-Encoding": "gzip, deflate"
+    })
+
+    # The session is shared by every user, so never persist backend cookies
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    return session
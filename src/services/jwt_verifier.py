@@ -0,0 +1,236 @@
+"""
+Local verification of Cognito-issued JWTs against the user pool JWKS.
+"""
+from typing import Any, Callable, Dict, Optional
+from collections import OrderedDict
+import base64
+import threading
+import time
+from jwt import JWT, jwk_from_dict
+from jwt.exceptions import JWTException
+import streamlit as st
+from utils.config import get_settings
+from utils.exceptions import AuthError
+from services.codec import loads
+
+ALLOWED_ALGORITHMS = {"RS256"}
+
+class JWTVerifier:
+    """
+    Verifies Cognito access and ID tokens in-process.
+
+    The JWKS is fetched once and cached; a token signed with an unknown
+    ``kid`` triggers a refresh, at most once per ``min_refresh_interval``
+    after a successful fetch. A failed fetch is retried by the next caller
+    and reported as ``JWKS_UNAVAILABLE``, never as an invalid token.
+    Signature, ``exp``, ``iss``, ``token_use`` and the audience (``aud`` for
+    ID tokens, ``client_id`` for access tokens) are checked locally. Claims
+    of verified tokens are memoized until the token expires, so repeated
+    checks on reruns cost a dictionary lookup.
+
+    ``fetch_jwks`` can be replaced to verify tokens signed with locally
+    generated keys.
+    """
+    def __init__(
+        self,
+        issuer: str,
+        client_id: str,
+        fetch_jwks: Callable[[], Dict[str, Any]],
+        leeway: float = 30.0,
+        max_cached_tokens: int = 10000,
+        min_refresh_interval: float = 60.0
+    ):
+        self.issuer = issuer
+        self.client_id = client_id
+        self.fetch_jwks = fetch_jwks
+        self.leeway = leeway
+        self.max_cached_tokens = max_cached_tokens
+        self.min_refresh_interval = min_refresh_interval
+
+        self._jwt = JWT()
+        self._keys: Dict[str, Any] = {}
+        self._keys_fetched_at = float("-inf")
+        self._claims: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes JWKS fetches so concurrent callers wait for one fetch
+        self._fetch_lock = threading.Lock()
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a token and return its claims.
+
+        Args:
+            token: Encoded JWT
+
+        Returns:
+            Dict[str, Any]: Verified claims
+
+        Raises:
+            AuthError: If the token is malformed, forged, expired or was
+                issued for another pool or client
+        """
+        now = time.time()
+
+        with self._lock:
+            claims = self._claims.get(token)
+            if claims is not None:
+                if claims["exp"] + self.leeway > now:
+                    self._claims.move_to_end(token)
+                    return claims
+                del self._claims[token]
+
+        claims = self._decode(token)
+        self._validate_claims(claims, now)
+
+        with self._lock:
+            self._claims[token] = claims
+            while len(self._claims) > self.max_cached_tokens:
+                self._claims.popitem(last=False)
+
+        return claims
+
+    def claims_if_valid(self, token: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Verify a token, returning None instead of raising.
+
+        Args:
+            token: Encoded JWT or None
+
+        Returns:
+            Optional[Dict[str, Any]]: Verified claims, or None if invalid
+        """
+        if not token:
+            return None
+        try:
+            return self.verify(token)
+        except AuthError:
+            return None
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        """
+        Check the token's signature and decode its claims.
+
+        Raises:
+            AuthError: If the token is malformed or its signature is invalid
+        """
+        try:
+            header = loads(_b64url_decode(token.split(".")[0]))
+        except (ValueError, IndexError):
+            raise AuthError("Malformed token", error_code="INVALID_TOKEN")
+
+        if not isinstance(header, dict) or header.get("alg") not in ALLOWED_ALGORITHMS:
+            raise AuthError("Unsupported token algorithm", error_code="INVALID_TOKEN")
+
+        key = self._get_key(header.get("kid", ""))
+        try:
+            return self._jwt.decode(
+                token,
+                key,
+                do_verify=True,
+                algorithms=ALLOWED_ALGORITHMS,
+                do_time_check=False
+            )
+        except JWTException:
+            raise AuthError("Invalid token signature", error_code="INVALID_TOKEN")
+
+    def _validate_claims(self, claims: Dict[str, Any], now: float):
+        """
+        Validate registered and Cognito-specific claims.
+
+        Raises:
+            AuthError: If any claim is missing or does not match
+        """
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or exp + self.leeway <= now:
+            raise AuthError("Token has expired", error_code="TOKEN_EXPIRED")
+
+        if claims.get("iss") != self.issuer:
+            raise AuthError("Token issuer mismatch", error_code="INVALID_TOKEN")
+
+        token_use = claims.get("token_use")
+        if token_use == "access":
+            audience = claims.get("client_id")
+        elif token_use == "id":
+            audience = claims.get("aud")
+        else:
+            raise AuthError("Unexpected token use", error_code="INVALID_TOKEN")
+
+        if audience != self.client_id:
+            raise AuthError("Token audience mismatch", error_code="INVALID_TOKEN")
+
+    def _get_key(self, kid: str) -> Any:
+        """
+        Get the signing key for a key id, refreshing the JWKS if unknown.
+
+        Raises:
+            AuthError: If no key with the id exists, or with
+                ``JWKS_UNAVAILABLE`` if the JWKS could not be fetched
+        """
+        with self._lock:
+            key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        with self._fetch_lock:
+            with self._lock:
+                # Another caller may have fetched while this one waited
+                key = self._keys.get(kid)
+                refresh = (key is None
+                           and time.monotonic() - self._keys_fetched_at >= self.min_refresh_interval)
+
+            if refresh:
+                # Raises JWKS_UNAVAILABLE, leaving the next caller free to retry
+                keys = {
+                    jwk["kid"]: jwk_from_dict(jwk)
+                    for jwk in self.fetch_jwks().get("keys", [])
+                    if "kid" in jwk
+                }
+                with self._lock:
+                    self._keys = keys
+                    self._keys_fetched_at = time.monotonic()
+                    key = keys.get(kid)
+
+        if key is None:
+            raise AuthError("Unknown token signing key", error_code="INVALID_TOKEN")
+        return key
+
+def _b64url_decode(segment: str) -> bytes:
+    """Decode an unpadded base64url JWT segment."""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+@st.cache_resource
+def get_jwt_verifier() -> JWTVerifier:
+    """
+    Get the process-wide verifier for the configured Cognito user pool.
+
+    Returns:
+        JWTVerifier: Shared verifier with cached JWKS and claims
+    """
+    from services.http_pool import get_http_session
+
+    settings = get_settings()
+    issuer = (f"https://cognito-idp.{settings.AWS_REGION}.amazonaws.com/"
+              f"{settings.COGNITO_USER_POOL_ID}")
+
+    def fetch_jwks() -> Dict[str, Any]:
+        try:
+            response = get_http_session().get(
+                f"{issuer}/.well-known/jwks.json",
+                timeout=settings.JWKS_FETCH_TIMEOUT
+            )
+            response.raise_for_status()
+            return loads(response.content)
+        except Exception as e:
+            raise AuthError(f"Failed to fetch signing keys: {str(e)}", error_code="JWKS_UNAVAILABLE")
+
+    if settings.COGNITO_FAKE:
+        # The fake signs its own tokens; verify them against its keys
+        from services.cognito import get_cognito_client
+        fetch_jwks = get_cognito_client(settings.AWS_REGION).jwks
+
+    return JWTVerifier(
+        issuer=issuer,
+        client_id=settings.COGNITO_CLIENT_ID,
+        fetch_jwks=fetch_jwks,
+        leeway=settings.JWT_LEEWAY_SECONDS
+    )
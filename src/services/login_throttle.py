@@ -0,0 +1,207 @@
+"""
+In-process throttle for repeated failed logins.
+"""
+from typing import List, Tuple
+from collections import OrderedDict
+import threading
+import time
+import streamlit as st
+from utils.config import get_settings
+from utils.metrics import metrics
+
+class LoginThrottle:
+    """
+    Bounded LRU map of failed login attempts per requester and per
+    (requester, username).
+
+    The requester is the client sending the attempts, e.g. its remote
+    address. After ``free_attempts`` consecutive failures for one username
+    from one requester, or ``requester_free_attempts`` failures across all
+    usernames from one requester, each further failure locks that key for
+    ``base_lockout * 2 ** n`` seconds, capped at ``max_lockout``. An
+    attempt is rejected locally without calling Cognito while either of
+    its keys is locked. Keying on the requester means one client's bad
+    passwords cannot lock a user out everywhere, and the per-requester key
+    throttles guessing across many usernames, including nonexistent ones.
+    A (requester, username) key's history is forgotten after a successful
+    login; any key's after ``reset_after`` seconds without failures.
+
+    Failures for a username are also counted across all requesters. That
+    key never locks the account; past ``username_free_attempts`` it only
+    spaces out attempts at Cognito (see ``pace``), by at most
+    ``username_max_delay`` seconds each, so guessing one password from
+    many clients is slowed while the owner can still log in.
+    """
+    def __init__(
+        self,
+        free_attempts: int = 5,
+        requester_free_attempts: int = 20,
+        username_free_attempts: int = 10,
+        username_max_delay: float = 5.0,
+        base_lockout: float = 1.0,
+        max_lockout: float = 900.0,
+        reset_after: float = 3600.0,
+        max_entries: int = 100000
+    ):
+        self.free_attempts = free_attempts
+        self.requester_free_attempts = requester_free_attempts
+        self.username_free_attempts = username_free_attempts
+        self.username_max_delay = username_max_delay
+        self.base_lockout = base_lockout
+        self.max_lockout = max_lockout
+        self.reset_after = reset_after
+        self.max_entries = max_entries
+        # key -> [failures, locked_until (next attempt for username keys), last_failure]
+        self._entries: "OrderedDict[Tuple[str, ...], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _keys(self, client_id: str, username: str, requester: str) -> List[Tuple[Tuple[str, ...], int]]:
+        """Get the lockout keys of an attempt with their free attempts."""
+        return [
+            (("requester_user", client_id, requester, username.strip().lower()), self.free_attempts),
+            (("requester", client_id, requester), self.requester_free_attempts),
+        ]
+
+    @staticmethod
+    def _username_key(client_id: str, username: str) -> Tuple[str, ...]:
+        """Get the pacing key of a username across all requesters."""
+        return "user", client_id, username.strip().lower()
+
+    def pace(self, client_id: str, username: str) -> float:
+        """
+        Reserve an attempt for a username and get how long to wait first.
+
+        Args:
+            client_id: Cognito app client id
+            username: Submitted username
+
+        Returns:
+            float: Seconds to wait before calling Cognito, at most
+            ``username_max_delay``
+        """
+        key = self._username_key(client_id, username)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry[2] > self.reset_after:
+                return 0.0
+            excess = entry[0] - self.username_free_attempts
+            if excess <= 0:
+                return 0.0
+            spacing = min(self.username_max_delay, self.base_lockout * 2 ** (excess - 1))
+            wait = min(max(0.0, entry[1] - now), self.username_max_delay)
+            entry[1] = now + wait + spacing
+
+        if wait > 0:
+            metrics.increment_counter("auth.login_paced")
+        return wait
+
+    def check(self, client_id: str, username: str, requester: str) -> float:
+        """
+        Check whether a login attempt may reach Cognito.
+
+        Args:
+            client_id: Cognito app client id
+            username: Submitted username
+            requester: Identity of the client making the attempt
+
+        Returns:
+            float: Seconds until the attempt's keys unlock, 0 if it may proceed
+        """
+        now = time.monotonic()
+        remaining = 0.0
+
+        with self._lock:
+            for key, _ in self._keys(client_id, username, requester):
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if now - entry[2] > self.reset_after:
+                    del self._entries[key]
+                    continue
+                remaining = max(remaining, entry[1] - now)
+
+        if remaining > 0:
+            metrics.increment_counter("auth.login_throttled")
+            return remaining
+        return 0.0
+
+    def record_failure(self, client_id: str, username: str, requester: str):
+        """
+        Record a failed login and extend the lockouts if needed.
+
+        Args:
+            client_id: Cognito app client id
+            username: Submitted username
+            requester: Identity of the client making the attempt
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            for key, free_attempts in self._keys(client_id, username, requester):
+                entry = self._entries.get(key)
+                if entry is None or now - entry[2] > self.reset_after:
+                    entry = [0, 0.0, now]
+                entry[0] += 1
+                entry[2] = now
+
+                excess = entry[0] - free_attempts
+                if excess > 0:
+                    lockout = min(self.max_lockout, self.base_lockout * 2 ** (excess - 1))
+                    entry[1] = now + lockout
+
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+
+            key = self._username_key(client_id, username)
+            entry = self._entries.get(key)
+            if entry is None or now - entry[2] > self.reset_after:
+                entry = [0, 0.0, now]
+            entry[0] += 1
+            entry[2] = now
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            size = len(self._entries)
+
+        metrics.increment_counter("auth.login_failures")
+        metrics.set_gauge("auth.login_throttle_entries", size)
+
+    def record_success(self, client_id: str, username: str, requester: str):
+        """
+        Forget the username's failures after a successful login.
+
+        The requester's failures across usernames are kept, so one valid
+        account does not reset a spraying client's lockout.
+
+        Args:
+            client_id: Cognito app client id
+            username: Submitted username
+            requester: Identity of the client making the attempt
+        """
+        user_key, _ = self._keys(client_id, username, requester)[0]
+        with self._lock:
+            self._entries.pop(user_key, None)
+            self._entries.pop(self._username_key(client_id, username), None)
+
+@st.cache_resource
+def get_login_throttle() -> LoginThrottle:
+    """
+    Get the process-wide failed-login throttle.
+
+    Returns:
+        LoginThrottle: Throttle shared by all sessions
+    """
+    settings = get_settings()
+    return LoginThrottle(
+        free_attempts=settings.LOGIN_FREE_ATTEMPTS,
+        requester_free_attempts=settings.LOGIN_REQUESTER_FREE_ATTEMPTS,
+        username_free_attempts=settings.LOGIN_USERNAME_FREE_ATTEMPTS,
+        username_max_delay=settings.LOGIN_USERNAME_MAX_DELAY_SECONDS,
+        base_lockout=settings.LOGIN_BASE_LOCKOUT_SECONDS,
+        max_lockout=settings.LOGIN_MAX_LOCKOUT_SECONDS,
+        reset_after=settings.LOGIN_FAILURE_RESET_SECONDS,
+        max_entries=settings.LOGIN_THROTTLE_MAX_ENTRIES
+    )
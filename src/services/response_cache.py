@@ -0,0 +1,126 @@
+"""
+In-process cache of chat responses for context-free guest prompts.
+"""
+from typing import Optional, Tuple
+from collections import OrderedDict
+import re
+import threading
+import time
+import streamlit as st
+from utils.config import get_settings
+from utils.metrics import metrics
+
+GUEST_SCOPE = "guest"
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and a memory cap.
+
+    Entries are keyed on a scope plus the normalized prompt. Callers are
+    responsible for only caching answers that do not depend on user or
+    conversation context; ``APIClient`` restricts this to the opening
+    question of an unauthenticated guest session.
+    """
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, str, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(prompt: str) -> str:
+        """
+        Normalize a prompt so trivially different phrasings share an entry.
+
+        Args:
+            prompt: Raw user prompt
+
+        Returns:
+            str: Lower-cased prompt with collapsed whitespace and no
+            trailing punctuation
+        """
+        prompt = re.sub(r"\s+", " ", prompt).strip().lower()
+        return prompt.rstrip("?!. ")
+
+    def get(self, scope: str, prompt: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            scope: Cache scope, e.g. ``GUEST_SCOPE``
+            prompt: Raw user prompt
+
+        Returns:
+            Optional[str]: Cached response, or None on a miss
+        """
+        key = (scope, self.normalize(prompt))
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None:
+            metrics.increment_counter("response_cache.misses", tags={"scope": scope})
+            return None
+
+        metrics.increment_counter("response_cache.hits", tags={"scope": scope})
+        return entry[1]
+
+    def put(self, scope: str, prompt: str, response: str):
+        """
+        Store a response, evicting least recently used entries as needed.
+
+        Args:
+            scope: Cache scope, e.g. ``GUEST_SCOPE``
+            prompt: Raw user prompt
+            response: Response text to cache
+        """
+        key = (scope, self.normalize(prompt))
+        size = len(key[1].encode("utf-8")) + len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        evicted = 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, response, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+
+            total_bytes = self._bytes
+
+        if evicted:
+            metrics.increment_counter("response_cache.evictions", evicted)
+        metrics.set_gauge("response_cache.bytes", total_bytes)
+
+    def _remove(self, key: Tuple[str, str]):
+        """Remove an entry; the caller must hold the lock."""
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+@st.cache_resource
+def get_response_cache() -> ResponseCache:
+    """
+    Get the process-wide response cache.
+
+    Returns:
+        ResponseCache: Cache shared by all sessions in the process
+    """
+    settings = get_settings()
+    return ResponseCache(
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+        ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS
+    )
@@ -0,0 +1,169 @@
+"""
+Retry policy and retry budgets for backend API calls.
+"""
+from typing import Optional, FrozenSet
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+import threading
+import time
+import streamlit as st
+from utils.config import get_settings
+
+# Statuses that indicate the backend rejected the request without processing it
+REJECTED_STATUSES = frozenset({429, 503})
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed backend call is retried.
+
+    Backoff uses decorrelated jitter: each delay is drawn uniformly between
+    the base delay and three times the previous delay, capped at
+    ``max_delay``. The total time spent on a call, including waits, never
+    exceeds ``max_elapsed``.
+    """
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 5.0,
+        max_elapsed: float = 20.0,
+        retry_statuses: FrozenSet[int] = frozenset({429, 502, 503, 504})
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_elapsed = max_elapsed
+        self.retry_statuses = retry_statuses
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        """
+        Build the policy from application settings.
+
+        Returns:
+            RetryPolicy: Policy configured from settings
+        """
+        settings = get_settings()
+        return cls(
+            max_attempts=settings.API_RETRY_MAX_ATTEMPTS,
+            base_delay=settings.API_RETRY_BASE_DELAY,
+            max_delay=settings.API_RETRY_MAX_DELAY,
+            max_elapsed=settings.API_RETRY_MAX_ELAPSED
+        )
+
+    def next_delay(self, previous_delay: float) -> float:
+        """
+        Compute the next backoff delay.
+
+        Args:
+            previous_delay: Delay used before the previous attempt
+
+        Returns:
+            float: Seconds to wait before the next attempt
+        """
+        upper = max(self.base_delay, previous_delay * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+    def is_retryable_status(self, status_code: int, idempotent: bool) -> bool:
+        """
+        Check whether a response status warrants a retry.
+
+        Args:
+            status_code: HTTP status of the response
+            idempotent: Whether repeating the request is safe
+
+        Returns:
+            bool: True if the request should be retried
+        """
+        if status_code not in self.retry_statuses:
+            return False
+        # Non-idempotent requests are only repeated when the backend refused them
+        return idempotent or status_code in REJECTED_STATUSES
+
+class RetryBudget:
+    """
+    Token bucket bounding retries to a fraction of recent traffic.
+
+    Every request deposits ``ratio`` tokens and every retry withdraws one, on
+    top of a small time-based allowance so low-traffic endpoints can still
+    retry. When the backend is failing broadly the budget drains and calls
+    fail fast instead of multiplying load.
+    """
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 20.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        """Deposit tokens for a new request."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """
+        Withdraw a token for a retry.
+
+        Returns:
+            bool: True if the retry is within budget
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def _refill(self):
+        """Add the time-based allowance accrued since the last update."""
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.max_tokens, self._tokens + elapsed * self.min_per_second)
+
+@st.cache_resource
+def get_retry_budget(endpoint: str) -> RetryBudget:
+    """
+    Get the process-wide retry budget for an endpoint.
+
+    Args:
+        endpoint: API path, e.g. ``/chat``
+
+    Returns:
+        RetryBudget: Budget shared by all sessions for the endpoint
+    """
+    settings = get_settings()
+    return RetryBudget(
+        ratio=settings.API_RETRY_BUDGET_RATIO,
+        min_per_second=settings.API_RETRY_BUDGET_MIN_PER_SECOND
+    )
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header value.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if absent or invalid
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
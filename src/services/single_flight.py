@@ -0,0 +1,116 @@
+"""
+Request coalescing for identical concurrent backend reads.
+"""
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+import copy
+import threading
+import time
+import streamlit as st
+from utils.config import get_settings
+from utils.metrics import metrics
+
+class _Call:
+    """An in-flight call whose result is shared with waiting callers."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into a single call.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for and share its outcome. Successful results are also
+    kept for ``ttl_seconds`` so rapid reruns are served without a call.
+    Every caller receives its own deep copy, so callers may mutate results
+    freely.
+    """
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._inflight: Dict[Hashable, _Call] = {}
+        self._results: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any], name: str = "single_flight") -> Any:
+        """
+        Run ``fn`` for ``key`` unless an identical call is cached or in flight.
+
+        Args:
+            key: Identity of the call, must include the caller's identity
+            fn: Function performing the call
+            name: Metric name prefix
+
+        Returns:
+            A copy of the call's result
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and cached[0] > now:
+                self._results.move_to_end(key)
+                metrics.increment_counter(f"{name}.cache_hits")
+                return copy.deepcopy(cached[1])
+
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+
+        if not leader:
+            metrics.increment_counter(f"{name}.coalesced")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+                if call.error is None:
+                    self._store(key, call.result)
+            call.done.set()
+
+        return copy.deepcopy(call.result)
+
+    def invalidate(self, key: Hashable):
+        """
+        Drop a cached result.
+
+        Args:
+            key: Identity of the call
+        """
+        with self._lock:
+            self._results.pop(key, None)
+
+    def _store(self, key: Hashable, result: Any):
+        """Cache a result; the caller must hold the lock."""
+        self._results[key] = (time.monotonic() + self.ttl_seconds, result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+@st.cache_resource
+def get_history_flight() -> SingleFlight:
+    """
+    Get the process-wide coalescing group for chat history fetches.
+
+    Returns:
+        SingleFlight: Group shared by all sessions in the process
+    """
+    settings = get_settings()
+    return SingleFlight(
+        ttl_seconds=settings.HISTORY_CACHE_TTL_SECONDS,
+        max_entries=settings.HISTORY_CACHE_MAX_ENTRIES
+    )
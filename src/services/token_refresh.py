@@ -0,0 +1,188 @@
+"""
+Background scheduler that refreshes Cognito tokens ahead of expiry.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import itertools
+import random
+import threading
+import time
+import streamlit as st
+from utils.config import get_settings
+from utils.metrics import metrics
+
+class _Entry:
+    """Refresh state for one authenticated session."""
+    def __init__(self, refresh_token: str, expires_at: float):
+        self.refresh_token = refresh_token
+        self.expires_at = expires_at
+        self.due = 0.0
+        self.touched = True
+        self.failures = 0
+
+class TokenRefreshScheduler:
+    """
+    Refreshes access tokens off the script thread before they expire.
+
+    Each session is refreshed at ``refresh_ratio`` of its token lifetime,
+    shifted by up to ``jitter_ratio`` of the lifetime in either direction
+    so sessions that logged in together spread their refreshes out. New
+    tokens are parked until the session's script thread collects them with
+    ``take_result``, since background threads cannot write session state.
+
+    Sessions that have not collected a result or called ``touch`` since
+    their last refresh are considered idle and dropped; they refresh
+    synchronously when they come back.
+    """
+    def __init__(
+        self,
+        refresh_fn: Callable[[str], Dict[str, Any]],
+        refresh_ratio: float = 0.8,
+        jitter_ratio: float = 0.05,
+        retry_delay: float = 15.0,
+        workers: int = 4
+    ):
+        self.refresh_fn = refresh_fn
+        self.refresh_ratio = refresh_ratio
+        self.jitter_ratio = jitter_ratio
+        self.retry_delay = retry_delay
+
+        self._entries: Dict[str, _Entry] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="token-refresh")
+        self._thread = threading.Thread(target=self._run, name="token-refresh-scheduler", daemon=True)
+        self._thread.start()
+
+    def schedule(self, session_key: str, refresh_token: str, expires_in: float):
+        """
+        Track a session's token and schedule its next refresh.
+
+        Args:
+            session_key: Stable identifier of the authenticated session
+            refresh_token: Cognito refresh token
+            expires_in: Access token lifetime in seconds
+        """
+        entry = _Entry(refresh_token, time.time() + expires_in)
+        with self._cond:
+            self._entries[session_key] = entry
+            self._push(session_key, entry, expires_in)
+
+    def cancel(self, session_key: str):
+        """
+        Stop refreshing a session.
+
+        Args:
+            session_key: Stable identifier of the authenticated session
+        """
+        with self._cond:
+            self._entries.pop(session_key, None)
+            self._results.pop(session_key, None)
+
+    def touch(self, session_key: str):
+        """
+        Mark a session as active so it keeps being refreshed.
+
+        Args:
+            session_key: Stable identifier of the authenticated session
+        """
+        with self._cond:
+            if entry := self._entries.get(session_key):
+                entry.touched = True
+
+    def take_result(self, session_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Collect tokens refreshed in the background, if any.
+
+        Also marks the session as active.
+
+        Args:
+            session_key: Stable identifier of the authenticated session
+
+        Returns:
+            Optional[Dict[str, Any]]: Refresh result with ``AccessToken``,
+            ``ExpiresIn`` and ``ExpiresAt``, the Unix time the token expires
+            counted from when it was refreshed, or None if nothing new is
+            available
+        """
+        with self._cond:
+            if entry := self._entries.get(session_key):
+                entry.touched = True
+            return self._results.pop(session_key, None)
+
+    def _push(self, session_key: str, entry: _Entry, lifetime: float):
+        """Schedule the next refresh; the caller must hold the lock."""
+        jitter = random.uniform(-self.jitter_ratio, self.jitter_ratio) * lifetime
+        entry.due = time.time() + lifetime * self.refresh_ratio + jitter
+        heapq.heappush(self._heap, (entry.due, next(self._counter), session_key))
+        self._cond.notify()
+
+    def _run(self):
+        """Scheduler loop dispatching due refreshes to the worker pool."""
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.time():
+                    timeout = self._heap[0][0] - time.time() if self._heap else None
+                    self._cond.wait(timeout)
+
+                due, _, session_key = heapq.heappop(self._heap)
+                entry = self._entries.get(session_key)
+                # Skip cancelled sessions and entries superseded by a reschedule
+                if entry is None or entry.due != due:
+                    continue
+                if not entry.touched:
+                    del self._entries[session_key]
+                    self._results.pop(session_key, None)
+                    metrics.increment_counter("auth.refresh_idle_dropped")
+                    continue
+                entry.touched = False
+
+            self._executor.submit(self._refresh, session_key, entry)
+
+    def _refresh(self, session_key: str, entry: _Entry):
+        """Refresh one session's token on a worker thread."""
+        try:
+            result = self.refresh_fn(entry.refresh_token)
+        except Exception:
+            metrics.increment_counter("auth.refresh_failures")
+            with self._cond:
+                if self._entries.get(session_key) is not entry:
+                    return
+                entry.failures += 1
+                entry.touched = True
+                if time.time() + self.retry_delay < entry.expires_at:
+                    entry.due = time.time() + self.retry_delay * random.uniform(1, 2) ** entry.failures
+                    heapq.heappush(self._heap, (entry.due, next(self._counter), session_key))
+                    self._cond.notify()
+            return
+
+        metrics.increment_counter("auth.refreshes")
+        with self._cond:
+            if self._entries.get(session_key) is not entry:
+                return
+            entry.failures = 0
+            entry.expires_at = time.time() + result["ExpiresIn"]
+            self._results[session_key] = {**result, "ExpiresAt": entry.expires_at}
+            entry.refresh_token = result.get("RefreshToken") or entry.refresh_token
+            self._push(session_key, entry, result["ExpiresIn"])
+
+@st.cache_resource
+def get_token_refresh_scheduler() -> TokenRefreshScheduler:
+    """
+    Get the process-wide token refresh scheduler.
+
+    Returns:
+        TokenRefreshScheduler: Scheduler shared by all sessions
+    """
+    from services.cognito import CognitoService
+
+    settings = get_settings()
+    return TokenRefreshScheduler(
+        refresh_fn=lambda refresh_token: CognitoService().refresh_token(refresh_token),
+        refresh_ratio=settings.TOKEN_REFRESH_RATIO,
+        jitter_ratio=settings.TOKEN_REFRESH_JITTER_RATIO,
+        workers=settings.TOKEN_REFRESH_WORKERS
+    )
@@ -0,0 +1,82 @@
+"""
+Waits imposed by the backend, mirrored into local admission control.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+from .config import get_settings
+
+class BackendBackoff:
+    """
+    Deadlines until which the backend asked this frontend to wait.
+
+    Holds one deadline for the whole process, set when the backend is
+    overloaded, and one per limiter key, set when a user's quota at the
+    backend is exhausted. Checking these before a call avoids sending
+    requests the backend has already said it will reject. Deadlines are
+    wall-clock times so they can be shown as countdowns.
+    """
+    def __init__(self, max_wait: float = 3600.0, max_keys: int = 10000):
+        self.max_wait = max_wait
+        self.max_keys = max_keys
+        self._process_until = 0.0
+        self._keys: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def block(self, seconds: float, key: Optional[str] = None) -> float:
+        """
+        Record that the backend asked to wait.
+
+        Args:
+            seconds: Seconds to wait, capped at ``max_wait``
+            key: Limiter key the wait applies to, or None for the whole
+                process
+
+        Returns:
+            float: Wall-clock time until which calls are held back
+        """
+        until = time.time() + min(max(0.0, seconds), self.max_wait)
+        with self._lock:
+            if key is None:
+                self._process_until = max(self._process_until, until)
+                return self._process_until
+
+            until = max(until, self._keys.pop(key, 0.0))
+            self._keys[key] = until
+            while len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        return until
+
+    def retry_after(self, key: str) -> float:
+        """
+        Get the seconds until a call for a key may be sent.
+
+        Args:
+            key: Limiter key of the caller
+
+        Returns:
+            float: Seconds to wait, 0 if calls may be sent now
+        """
+        now = time.time()
+        with self._lock:
+            until = self._keys.get(key, 0.0)
+            if until and until <= now:
+                del self._keys[key]
+            until = max(until, self._process_until)
+        return max(0.0, until - now)
+
+@lru_cache()
+def get_backend_backoff() -> BackendBackoff:
+    """
+    Get the process-wide backend backoff state.
+
+    Returns:
+        BackendBackoff: Shared backoff state
+    """
+    settings = get_settings()
+    return BackendBackoff(
+        max_wait=settings.BACKEND_BACKOFF_MAX_SECONDS,
+        max_keys=settings.BACKEND_BACKOFF_MAX_KEYS
+    )
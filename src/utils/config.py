@@ -25,16 +25,112 @@ class Settings(BaseSettings):
     COGNITO_USER_POOL_ID: str = Field(..., description="Cognito User Pool ID")
     COGNITO_CLIENT_ID: str = Field(..., description="Cognito Client ID")
     COGNITO_CLIENT_SECRET: Optional[str] = Field(None, description="Cognito Client Secret")
+    COGNITO_CONNECT_TIMEOUT: float = Field(2.0, description="Cognito connect timeout in seconds")
+    COGNITO_READ_TIMEOUT: float = Field(5.0, description="Cognito read timeout in seconds")
+    COGNITO_MAX_ATTEMPTS: int = Field(3, description="Attempts per Cognito call in adaptive retry mode")
+    COGNITO_CALL_TIMEOUT: float = Field(15.0, description="Maximum seconds the UI waits for a Cognito call")
+    COGNITO_WORKERS: int = Field(16, description="Worker threads for Cognito calls")
+    COGNITO_QUEUE_DEPTH: int = Field(64, description="Cognito calls allowed to wait for a worker")
+    COGNITO_FAKE: bool = Field(False, description="Use the in-process Cognito fake (development and load tests only)")
+    COGNITO_FAKE_LATENCY_SECONDS: float = Field(0.05, description="Base latency of each fake Cognito call")
+    COGNITO_FAKE_LATENCY_JITTER_SECONDS: float = Field(0.05, description="Random extra latency of each fake Cognito call")
+    COGNITO_FAKE_ERROR_RATE: float = Field(0.0, description="Probability that a fake Cognito call fails")
+    LOGIN_FREE_ATTEMPTS: int = Field(5, description="Failed logins for one username from one client before lockouts start")
+    LOGIN_REQUESTER_FREE_ATTEMPTS: int = Field(20, description="Failed logins from one client, across usernames, before lockouts start")
+    LOGIN_USERNAME_FREE_ATTEMPTS: int = Field(10, description="Failed logins for one username, across clients, before attempts are spaced out")
+    LOGIN_USERNAME_MAX_DELAY_SECONDS: float = Field(5.0, description="Longest wait before a login attempt for a username under attack")
+    LOGIN_BASE_LOCKOUT_SECONDS: float = Field(1.0, description="First lockout after the free attempts")
+    LOGIN_MAX_LOCKOUT_SECONDS: float = Field(900.0, description="Longest lockout for repeated failed logins")
+    LOGIN_FAILURE_RESET_SECONDS: float = Field(3600.0, description="Seconds without failures before history resets")
+    LOGIN_THROTTLE_MAX_ENTRIES: int = Field(100000, description="Maximum keys tracked by the login throttle")
+    TRUST_FORWARDED_FOR: bool = Field(False, description="Identify clients by the X-Forwarded-For address; enable only behind a reverse proxy")
+    ENABLE_LOCAL_JWT_VERIFICATION: bool = Field(True, description="Verify Cognito tokens locally against the JWKS")
+    JWT_LEEWAY_SECONDS: float = Field(30.0, description="Allowed clock skew when checking token expiry")
+    JWKS_FETCH_TIMEOUT: float = Field(5.0, description="Timeout for fetching the Cognito JWKS in seconds")
+    TOKEN_REFRESH_RATIO: float = Field(0.8, description="Fraction of token lifetime after which it is refreshed")
+    TOKEN_REFRESH_JITTER_RATIO: float = Field(0.05, description="Random spread of refresh time as a fraction of lifetime")
+    TOKEN_REFRESH_MIN_REMAINING: float = Field(60.0, description="Refresh synchronously when fewer seconds remain")
+    TOKEN_REFRESH_WORKERS: int = Field(4, description="Background threads performing token refreshes")
+    SESSION_RESUMPTION_KEYS: Optional[str] = Field(None, description="Comma-separated Fernet keys for resumption cookies; newest first")
+    SESSION_RESUMPTION_COOKIE: str = Field("onionai_resume", description="Name of the session resumption cookie")
+    SESSION_RESUMPTION_MAX_AGE_SECONDS: int = Field(12 * 3600, description="Lifetime of a resumption cookie, which carries a refresh token, in seconds")
 
     # API Configuration
     API_URL: str = Field(..., description="Backend API URL")
     API_VERSION: str = Field("v1", description="API Version")
     API_TIMEOUT: int = Field(30, description="API Timeout in seconds")
+    API_POOL_CONNECTIONS: int = Field(10, description="Number of host connection pools to cache")
+    API_POOL_MAXSIZE: int = Field(100, description="Maximum pooled connections per host")
+    API_POOL_BLOCK: bool = Field(False, description="Block when the per-host pool is exhausted")
+    API_KEEPALIVE_IDLE: int = Field(60, description="Seconds idle before TCP keep-alive probes start")
+    API_KEEPALIVE_INTERVAL: int = Field(15, description="Seconds between TCP keep-alive probes")
+    API_COMPRESS_REQUESTS: bool = Field(False, description="Gzip large request bodies")
+    API_COMPRESS_MIN_BYTES: int = Field(4096, description="Smallest request body that is compressed")
+    API_RETRY_MAX_ATTEMPTS: int = Field(3, description="Maximum attempts per backend call")
+    API_RETRY_BASE_DELAY: float = Field(0.1, description="Minimum retry backoff in seconds")
+    API_RETRY_MAX_DELAY: float = Field(5.0, description="Maximum retry backoff in seconds")
+    API_RETRY_MAX_ELAPSED: float = Field(30.0, description="Maximum total seconds spent on a call including retries")
+    API_RETRY_BUDGET_RATIO: float = Field(0.2, description="Retries allowed per request on each endpoint")
+    API_RETRY_BUDGET_MIN_PER_SECOND: float = Field(1.0, description="Baseline retries per second on each endpoint")
+    API_HEDGE_ENABLED: bool = Field(True, description="Hedge slow chat requests with a second attempt")
+    API_HEDGE_PERCENTILE: float = Field(95.0, description="Latency percentile after which a chat request is hedged")
+    API_HEDGE_MIN_SAMPLES: int = Field(50, description="Latency samples required before hedging starts")
+    API_HEDGE_BUDGET_RATIO: float = Field(0.05, description="Maximum fraction of chat requests that may be hedged")
+    API_HEDGE_MAX_WORKERS: int = Field(32, description="Worker threads available for hedged requests")
+    API_CONCURRENCY_INITIAL_LIMIT: int = Field(20, description="Initial concurrent backend requests per process")
+    API_CONCURRENCY_MIN_LIMIT: int = Field(2, description="Lowest adaptive concurrency limit")
+    API_CONCURRENCY_MAX_LIMIT: int = Field(100, description="Highest adaptive concurrency limit")
+    API_CONCURRENCY_LATENCY_TOLERANCE: float = Field(2.0, description="Recent over baseline median latency of an endpoint at which the concurrency limit is lowered")
+    API_CONCURRENCY_LATENCY_WINDOW: int = Field(20, description="Responses in an endpoint's recent latency median")
+    API_CONCURRENCY_BASELINE_WINDOW: int = Field(500, description="Responses in an endpoint's baseline latency median")
+    API_CONCURRENCY_BASELINE_MIN_SAMPLES: int = Field(50, description="Responses needed before latency can lower the concurrency limit")
+    API_CONCURRENCY_BACKOFF_RATIO: float = Field(0.9, description="Factor applied to the concurrency limit on congestion")
+    API_CONCURRENCY_QUEUE_SIZE: int = Field(50, description="Guest and other requests that may wait for a concurrency slot")
+    API_CONCURRENCY_QUEUE_TIMEOUT: float = Field(2.0, description="Seconds a guest or other request waits for a slot before it is shed")
+    API_PRIORITY_QUEUE_SIZE: int = Field(50, description="Authenticated chat requests that may wait for a slot")
+    API_PRIORITY_QUEUE_TIMEOUT: float = Field(5.0, description="Seconds an authenticated chat request waits for a slot")
+
+    # Guest Response Cache
+    ENABLE_GUEST_RESPONSE_CACHE: bool = Field(False, description="Serve cached answers to context-free guest prompts")
+    API_STATELESS_GUEST_SESSIONS: bool = Field(False, description="Backend keeps no transcript for guest sessions; required by the guest response cache")
+    RESPONSE_CACHE_TTL_SECONDS: float = Field(3600.0, description="Seconds a cached response stays valid")
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(1000, description="Maximum cached responses")
+    RESPONSE_CACHE_MAX_BYTES: int = Field(16 * 1024 * 1024, description="Maximum memory used by cached responses")
+
+    # Chat History Coalescing
+    HISTORY_CACHE_TTL_SECONDS: float = Field(5.0, description="Seconds a fetched chat history is reused")
+    HISTORY_CACHE_MAX_ENTRIES: int = Field(1000, description="Maximum cached chat history results")
+
+    # Error Reporting
+    ERROR_REPORT_QUEUE_SIZE: int = Field(1000, description="Maximum queued error reports before dropping")
+    ERROR_REPORT_WORKERS: int = Field(2, description="Background threads delivering error reports")
+    ERROR_REPORT_BATCH_SIZE: int = Field(50, description="Maximum error reports per POST")
+    ERROR_REPORT_FLUSH_SECONDS: float = Field(2.0, description="Maximum seconds to wait for a batch to fill")
+    ERROR_REPORT_TIMEOUT: float = Field(5.0, description="Timeout for error report requests in seconds")
+
+    # Circuit Breaker
+    CIRCUIT_WINDOW_SECONDS: float = Field(30.0, description="Rolling window for circuit breaker statistics")
+    CIRCUIT_MIN_CALLS: int = Field(20, description="Minimum calls in the window before the breaker can open")
+    CIRCUIT_ERROR_RATE: float = Field(0.5, description="Error rate that opens the breaker")
+    CIRCUIT_SLOW_CALL_SECONDS: float = Field(10.0, description="Latency above which a call counts as slow")
+    CIRCUIT_SLOW_CALL_RATE: float = Field(0.8, description="Slow call rate that opens the breaker")
+    CIRCUIT_OPEN_SECONDS: float = Field(15.0, description="Seconds the breaker stays open before probing")
+    CIRCUIT_HALF_OPEN_CALLS: int = Field(3, description="Probe calls allowed while half-open")
 
     # Rate Limiting
     ANONYMOUS_RATE_LIMIT: int = Field(10, description="Rate limit for anonymous users")
     AUTHENTICATED_RATE_LIMIT: int = Field(50, description="Rate limit for authenticated users")
     RATE_LIMIT_WINDOW_HOURS: int = Field(1, description="Rate limit window in hours")
+    RATE_LIMIT_BURST_RATIO: float = Field(1.0, description="Questions usable at once as a fraction of the limit")
+    RATE_LIMIT_MODE: str = Field("questions", description="Quota units (questions/tokens)")
+    RATE_LIMIT_TOKENS_PER_UNIT: int = Field(500, description="Tokens per quota unit in tokens mode")
+    RATE_LIMIT_EXPECTED_RESPONSE_TOKENS: int = Field(400, description="Response tokens charged up front in tokens mode")
+    RATE_LIMIT_BACKEND: str = Field("memory", description="Limiter store (memory/sqlite/redis)")
+    RATE_LIMIT_SQLITE_PATH: str = Field("data/rate_limits.db", description="Database file for the sqlite limiter store")
+    RATE_LIMIT_REDIS_URL: Optional[str] = Field(None, description="Redis URL for the redis limiter store")
+    RATE_LIMIT_KEY_PREFIX: str = Field("onionai:rl:", description="Key prefix in the redis limiter store")
+    BACKEND_BACKOFF_MAX_SECONDS: float = Field(3600.0, description="Longest backend Retry-After honoured locally")
+    BACKEND_BACKOFF_MAX_KEYS: int = Field(10000, description="Users and sessions tracked for backend backoff")
 
     # Application Configuration
     DEBUG: bool = Field(False, description="Debug mode")
@@ -42,6 +138,10 @@ class Settings(BaseSettings):
     CLIENT_VERSION: str = Field("1.0.0", description="Client version")
     ENABLE_ANALYTICS: bool = Field(True, description="Enable analytics tracking")
     ENABLE_ERROR_REPORTING: bool = Field(True, description="Enable error reporting")
+    ENABLE_METRICS: bool = Field(False, description="Report metrics to the metrics backend")
+    METRICS_TIMER_SAMPLES: int = Field(1000, description="Recent samples kept per timer")
+    ENABLE_STREAMING: bool = Field(True, description="Render chat responses as they are generated")
+    STREAM_RENDER_INTERVAL: float = Field(0.075, description="Minimum seconds between re-renders of a streaming response")
 
     # Streamlit Configuration
     STREAMLIT_SERVER_PORT: int = Field(8501, description="Streamlit server port")
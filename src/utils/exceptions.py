@@ -20,6 +20,14 @@ class APIError(ChatAppError):
     """Raised when API requests fail."""
     pass
 
+class CircuitOpenError(APIError):
+    """Raised when a backend endpoint's circuit breaker is open."""
+    pass
+
+class OverloadedError(APIError):
+    """Raised when a backend call is shed because too many are in flight."""
+    pass
+
 class AuthError(ChatAppError):
     """Raised for authentication-related errors."""
     pass
@@ -0,0 +1,359 @@
+"""
+Shared storage backends for rate limit counters.
+
+Every backend keeps a single timestamp per key and applies a
+check-and-consume atomically and in a single round trip, so limits hold
+across tabs, restarts, processes and replicas that share a store.
+"""
+from typing import Dict, NamedTuple, Optional, Tuple
+from abc import ABC, abstractmethod
+from functools import lru_cache
+import os
+import sqlite3
+import threading
+import time
+from .config import get_settings
+from .exceptions import ConfigurationError
+
+class LimitResult(NamedTuple):
+    """Outcome of a limiter check."""
+    allowed: bool
+    remaining: int
+    retry_after: float
+    reset_at: float
+
+class LimiterStore(ABC):
+    """
+    Base class for GCRA (generic cell rate algorithm) limiter stores.
+
+    A key's whole state is its theoretical arrival time (TAT): the time at
+    which its quota would be fully replenished. Units are replenished one
+    every ``interval`` seconds, and up to ``burst`` units may be used at
+    once. ``hit`` consumes ``cost`` units if ``max(cost, 1)`` units are
+    available; a cost of 0 only checks whether one more unit is.
+    """
+    @abstractmethod
+    def hit(self, key: str, cost: int, interval: float, burst: int) -> LimitResult:
+        """
+        Atomically check and consume quota for a key.
+
+        Args:
+            key: Limiter key
+            cost: Units to consume, or 0 to only check
+            interval: Seconds to replenish one unit
+            burst: Maximum units available at once
+
+        Returns:
+            LimitResult: Whether the request is allowed, the units left,
+            seconds until the next unit (or ``cost`` units, if rejected)
+            is available and the Unix time of full replenishment
+        """
+
+    @abstractmethod
+    def adjust(self, key: str, delta: float, interval: float, burst: int) -> LimitResult:
+        """
+        Atomically charge or refund units without an admission check.
+
+        Used to reconcile an up-front estimate with the actual cost. The
+        TAT never moves before the current time, so refunds cannot create
+        quota beyond ``burst``.
+
+        Args:
+            key: Limiter key
+            delta: Units to charge, or to refund if negative
+            interval: Seconds to replenish one unit
+            burst: Maximum units available at once
+
+        Returns:
+            LimitResult: State after the adjustment
+        """
+
+def apply_gcra(tat: Optional[float], now: float, cost: int, interval: float,
+               burst: int) -> Tuple[bool, float, bool]:
+    """
+    GCRA transition shared by all backends.
+
+    Args:
+        tat: Stored theoretical arrival time, or None for a new key
+        now: Current Unix time
+        cost: Units to consume, or 0 to only check
+        interval: Seconds to replenish one unit
+        burst: Maximum units available at once
+
+    Returns:
+        Tuple[bool, float, bool]: Whether the request is allowed, the
+        resulting TAT, and whether it must be stored
+    """
+    tat = now if tat is None else max(tat, now)
+    allowed = tat + max(cost, 1) * interval - burst * interval <= now
+    if allowed and cost > 0:
+        return True, tat + cost * interval, True
+    return allowed, tat, False
+
+def apply_adjust(tat: Optional[float], now: float, delta: float, interval: float) -> float:
+    """
+    Charge or refund transition shared by all backends.
+
+    Args:
+        tat: Stored theoretical arrival time, or None for a new key
+        now: Current Unix time
+        delta: Units to charge, or to refund if negative
+        interval: Seconds to replenish one unit
+
+    Returns:
+        float: The resulting TAT
+    """
+    tat = now if tat is None else max(tat, now)
+    return max(tat + delta * interval, now)
+
+def gcra_result(allowed: bool, tat: float, now: float, cost: int, interval: float,
+                burst: int) -> LimitResult:
+    """
+    Derive the reported limiter state from a key's TAT.
+
+    Args:
+        allowed: Whether the request was allowed
+        tat: TAT after the request
+        now: Time of the request
+        cost: Units requested
+        interval: Seconds to replenish one unit
+        burst: Maximum units available at once
+
+    Returns:
+        LimitResult: Result of the request
+    """
+    tat = max(tat, now)
+    # Unix timestamps carry sub-microsecond float error; allow 1us of it on unit boundaries
+    remaining = min(burst, max(0, int((burst * interval - (tat - now) + 1e-6) / interval)))
+    needed = 1 if allowed else max(cost, 1)
+    retry_after = max(0.0, tat + needed * interval - burst * interval - now)
+    return LimitResult(allowed, remaining, retry_after, tat)
+
+class MemoryLimiterStore(LimiterStore):
+    """
+    Process-local store; limits are shared by the sessions of one process.
+    """
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._tats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, cost: int, interval: float, burst: int) -> LimitResult:
+        now = time.time()
+        with self._lock:
+            allowed, tat, changed = apply_gcra(self._tats.get(key), now, cost, interval, burst)
+            if changed:
+                self._tats[key] = tat
+                if len(self._tats) > self.max_entries:
+                    self._prune(now)
+        return gcra_result(allowed, tat, now, cost, interval, burst)
+
+    def adjust(self, key: str, delta: float, interval: float, burst: int) -> LimitResult:
+        now = time.time()
+        with self._lock:
+            tat = apply_adjust(self._tats.get(key), now, delta, interval)
+            if tat > now:
+                self._tats[key] = tat
+            else:
+                self._tats.pop(key, None)
+        return gcra_result(True, tat, now, 0, interval, burst)
+
+    def _prune(self, now: float):
+        """Drop fully replenished keys; the caller must hold the lock."""
+        for key in [key for key, tat in self._tats.items() if tat <= now]:
+            del self._tats[key]
+
+class SQLiteLimiterStore(LimiterStore):
+    """
+    Store in a SQLite database in WAL mode, shared by the processes of one
+    node.
+
+    Each check is a single ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING``
+    statement, which SQLite executes atomically under its write lock.
+    """
+    _UPSERT = """
+        INSERT INTO rate_limit_tat (key, tat, allowed)
+        VALUES (
+            :key,
+            CASE WHEN :cost > 0 AND :now + :needed * :interval - :burst * :interval <= :now
+                 THEN :now + :cost * :interval ELSE :now END,
+            :now + :needed * :interval - :burst * :interval <= :now
+        )
+        ON CONFLICT (key) DO UPDATE SET
+            tat = CASE
+                WHEN :cost > 0 AND MAX(tat, :now) + :needed * :interval - :burst * :interval <= :now
+                THEN MAX(tat, :now) + :cost * :interval
+                ELSE tat END,
+            allowed = MAX(tat, :now) + :needed * :interval - :burst * :interval <= :now
+        RETURNING allowed, tat
+    """
+    _ADJUST = """
+        INSERT INTO rate_limit_tat (key, tat, allowed)
+        VALUES (:key, MAX(:now + :delta * :interval, :now), 1)
+        ON CONFLICT (key) DO UPDATE SET
+            tat = MAX(MAX(tat, :now) + :delta * :interval, :now)
+        RETURNING tat
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0, prune_every: int = 10000):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.prune_every = prune_every
+        self._local = threading.local()
+        self._calls = 0
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_tat ("
+                "key TEXT PRIMARY KEY, tat REAL NOT NULL, allowed INTEGER NOT NULL)"
+            )
+
+    def hit(self, key: str, cost: int, interval: float, burst: int) -> LimitResult:
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            allowed, tat = conn.execute(self._UPSERT, {
+                "key": key,
+                "cost": cost,
+                "needed": max(cost, 1),
+                "interval": interval,
+                "burst": burst,
+                "now": now
+            }).fetchone()
+
+        self._calls += 1
+        if self._calls % self.prune_every == 0:
+            with conn:
+                conn.execute("DELETE FROM rate_limit_tat WHERE tat <= ?", (now,))
+        return gcra_result(bool(allowed), tat, now, cost, interval, burst)
+
+    def adjust(self, key: str, delta: float, interval: float, burst: int) -> LimitResult:
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            (tat,) = conn.execute(self._ADJUST, {
+                "key": key,
+                "delta": delta,
+                "interval": interval,
+                "now": now
+            }).fetchone()
+        return gcra_result(True, tat, now, 0, interval, burst)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection; sqlite3 connections are not shared."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in WAL mode."""
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+# KEYS[1] = key; ARGV = now, cost, interval, burst. Mirrors apply_gcra.
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local interval = tonumber(ARGV[3])
+local burst = tonumber(ARGV[4])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local allowed = 0
+if tat + math.max(cost, 1) * interval - burst * interval <= now then
+    allowed = 1
+    if cost > 0 then
+        tat = tat + cost * interval
+        redis.call('SET', KEYS[1], string.format('%.6f', tat), 'PX', math.ceil((tat - now) * 1000))
+    end
+end
+return {allowed, string.format('%.6f', tat)}
+"""
+
+# KEYS[1] = key; ARGV = now, delta, interval. Mirrors apply_adjust.
+ADJUST_SCRIPT = """
+local now = tonumber(ARGV[1])
+local delta = tonumber(ARGV[2])
+local interval = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+tat = math.max(tat + delta * interval, now)
+if tat > now then
+    redis.call('SET', KEYS[1], string.format('%.6f', tat), 'PX', math.ceil((tat - now) * 1000))
+else
+    redis.call('DEL', KEYS[1])
+end
+return string.format('%.6f', tat)
+"""
+
+class RedisLimiterStore(LimiterStore):
+    """
+    Store in Redis (or any server speaking the Redis protocol), shared by
+    all replicas.
+
+    Each check is one ``EVALSHA`` of ``GCRA_SCRIPT`` (``ADJUST_SCRIPT``
+    for adjustments), which Redis runs atomically. Keys expire once their quota is fully replenished.
+    Requires the ``redis`` package.
+    """
+    def __init__(self, url: str, key_prefix: str = "", timeout: float = 1.0):
+        try:
+            import redis
+        except ImportError:
+            raise ConfigurationError(
+                "RATE_LIMIT_BACKEND=redis requires the 'redis' package",
+                error_code="MISSING_DEPENDENCY"
+            )
+
+        self.key_prefix = key_prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self._script = self._client.register_script(GCRA_SCRIPT)
+        self._adjust_script = self._client.register_script(ADJUST_SCRIPT)
+
+    def hit(self, key: str, cost: int, interval: float, burst: int) -> LimitResult:
+        now = time.time()
+        allowed, tat = self._script(
+            keys=[self.key_prefix + key],
+            args=[f"{now:.6f}", cost, repr(float(interval)), burst]
+        )
+        return gcra_result(bool(allowed), float(tat), now, cost, interval, burst)
+
+    def adjust(self, key: str, delta: float, interval: float, burst: int) -> LimitResult:
+        now = time.time()
+        tat = self._adjust_script(
+            keys=[self.key_prefix + key],
+            args=[f"{now:.6f}", repr(float(delta)), repr(float(interval))]
+        )
+        return gcra_result(True, float(tat), now, 0, interval, burst)
+
+@lru_cache()
+def get_limiter_store() -> LimiterStore:
+    """
+    Get the process-wide limiter store selected by ``RATE_LIMIT_BACKEND``.
+
+    Returns:
+        LimiterStore: Shared store
+
+    Raises:
+        ConfigurationError: If the backend is unknown or misconfigured
+    """
+    settings = get_settings()
+    backend = settings.RATE_LIMIT_BACKEND.lower()
+
+    if backend == "memory":
+        return MemoryLimiterStore()
+    if backend == "sqlite":
+        directory = os.path.dirname(os.path.abspath(settings.RATE_LIMIT_SQLITE_PATH))
+        os.makedirs(directory, exist_ok=True)
+        return SQLiteLimiterStore(settings.RATE_LIMIT_SQLITE_PATH)
+    if backend == "redis":
+        if not settings.RATE_LIMIT_REDIS_URL:
+            raise ConfigurationError("RATE_LIMIT_REDIS_URL is required for the redis backend")
+        return RedisLimiterStore(settings.RATE_LIMIT_REDIS_URL, key_prefix=settings.RATE_LIMIT_KEY_PREFIX)
+
+    raise ConfigurationError(f"Unknown RATE_LIMIT_BACKEND: {settings.RATE_LIMIT_BACKEND}")
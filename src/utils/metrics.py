@@ -2,14 +2,36 @@
 Metrics collection and reporting utilities.
 """
 from typing import Dict, Any, Optional
+from collections import deque
 from datetime import datetime
+import threading
 import time
 from contextlib import contextmanager
 from .logger import logger
 from .config import get_settings
 
+def metric_key(name: str, tags: Optional[Dict] = None) -> str:
+    """
+    Build the local key of a metric and its tags.
+
+    Args:
+        name: Metric name
+        tags: Optional metric tags
+
+    Returns:
+        str: ``name`` alone, or ``name[key=value,...]`` with the tags sorted
+    """
+    if not tags:
+        return name
+    return name + "[" + ",".join(f"{k}={tags[k]}" for k in sorted(tags)) + "]"
+
 class MetricsCollector:
-    """Collects and reports application metrics."""
+    """
+    Collects and reports application metrics.
+
+    Counters and gauges are kept locally per name and tag set, so each
+    tagged variant of a metric has its own value.
+    """
     
     def __init__(self):
         self.settings = get_settings()
@@ -18,6 +40,7 @@ class MetricsCollector:
             'timers': {},
             'gauges': {}
         }
+        self._lock = threading.Lock()
     
     def increment_counter(self, name: str, value: int = 1, tags: Optional[Dict] = None):
         """
@@ -28,9 +51,10 @@ class MetricsCollector:
             value: Value to increment by
             tags: Optional metric tags
         """
-        if name not in self.metrics['counters']:
-            self.metrics['counters'][name] = 0
-        self.metrics['counters'][name] += value
+        key = metric_key(name, tags)
+        with self._lock:
+            counters = self.metrics['counters']
+            counters[key] = counters.get(key, 0) + value
         
         if self.settings.ENABLE_METRICS:
             self._report_metric('counter', name, value, tags)
@@ -44,7 +68,8 @@ class MetricsCollector:
             value: Gauge value
             tags: Optional metric tags
         """
-        self.metrics['gauges'][name] = value
+        with self._lock:
+            self.metrics['gauges'][metric_key(name, tags)] = value
         
         if self.settings.ENABLE_METRICS:
             self._report_metric('gauge', name, value, tags)
@@ -62,14 +87,45 @@ class MetricsCollector:
         try:
             yield
         finally:
-            duration = time.time() - start_time
+            self.record_timing(name, time.time() - start_time, tags)
+
+    def record_timing(self, name: str, duration: float, tags: Optional[Dict] = None):
+        """
+        Record a duration measured by the caller.
+
+        Args:
+            name: Timer name
+            duration: Duration in seconds
+            tags: Optional metric tags
+        """
+        with self._lock:
             if name not in self.metrics['timers']:
-                self.metrics['timers'][name] = []
+                self.metrics['timers'][name] = deque(maxlen=self.settings.METRICS_TIMER_SAMPLES)
             self.metrics['timers'][name].append(duration)
-            
-            if self.settings.ENABLE_METRICS:
-                self._report_metric('timing', name, duration, tags)
+
+        if self.settings.ENABLE_METRICS:
+            self._report_metric('timing', name, duration, tags)
     
+    def percentile(self, name: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Get a percentile of the recent samples of a timer.
+
+        Args:
+            name: Timer name
+            percentile: Percentile between 0 and 100
+            min_samples: Minimum samples required for a meaningful result
+
+        Returns:
+            Optional[float]: Duration in seconds, or None if too few samples
+        """
+        with self._lock:
+            samples = sorted(self.metrics['timers'].get(name, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
     def _report_metric(
         self,
         metric_type: str,
@@ -1,91 +1,300 @@
 """
 Rate limiting utilities for the frontend application.
 """
-from datetime import datetime, timedelta
+from datetime import datetime
+import math
+import time
 import streamlit as st
 from typing import Optional
+from .backend_backoff import get_backend_backoff
 from .config import get_settings
-from .exceptions import RateLimitError
+from .limiter_store import LimitResult, gcra_result, get_limiter_store
+from .logger import logger
+from .metrics import metrics
+from .session import get_requester_id
+from .tokens import estimate_tokens
 
-def check_rate_limit(guest_mode: bool = True) -> bool:
+class QuotaEngine:
     """
-    Check if the current session is within rate limits.
-    
-    Args:
-        guest_mode: Whether the user is in guest mode
-        
-    Returns:
-        bool: True if within rate limit, False otherwise
-    """
-    settings = get_settings()
-    current_time = datetime.utcnow()
-    
-    # Initialize rate limit state if needed
-    if "rate_limit_start" not in st.session_state:
-        st.session_state.rate_limit_start = current_time
-        st.session_state.questions_used = 0
-    
-    # Check if we need to reset the window
-    window_hours = settings.RATE_LIMIT_WINDOW_HOURS
-    if current_time - st.session_state.rate_limit_start > timedelta(hours=window_hours):
-        st.session_state.rate_limit_start = current_time
-        st.session_state.questions_used = 0
-    
-    # Get appropriate limit based on auth status
-    limit = (settings.AUTHENTICATED_RATE_LIMIT 
-             if not guest_mode 
-             else settings.ANONYMOUS_RATE_LIMIT)
-    
-    return st.session_state.questions_used < limit
-
-def increment_rate_limit():
-    """
-    Increment the rate limit counter.
-    
-    Raises:
-        RateLimitError: If rate limit would be exceeded
+    Question quota of one user or guest session.
+
+    Quota is tracked in the shared limiter store. A logged-in user's quota
+    is keyed on the user, so it is shared by their tabs, survives restarts
+    and holds across replicas; a guest's is keyed on the requesting client
+    (see ``get_requester_id``), so new tabs and reconnects from the same
+    address share it. Quota replenishes continuously: one
+    unit every ``window / limit`` seconds, with at most ``limit *
+    RATE_LIMIT_BURST_RATIO`` available at once, instead of all at once
+    when a fixed window ends.
+
+    The limit, interval, burst, key and cost settings are resolved once
+    when the engine is built. The engine keeps the key's TAT from the
+    last store call, so ``remaining``, ``reset_at`` and ``retry_after``
+    are constant-time reads that replenish with the clock; only
+    ``refresh``, ``try_consume`` and ``adjust`` call the store.
     """
-    if not check_rate_limit(st.session_state.get("guest_mode", True)):
-        raise RateLimitError("Rate limit exceeded. Please try again later.")
-    
-    st.session_state.questions_used += 1
+    def __init__(
+        self,
+        key: str,
+        guest_mode: bool,
+        limit: int,
+        interval: float,
+        burst: int,
+        tokens_per_unit: Optional[int] = None,
+        expected_response_tokens: int = 0
+    ):
+        self.key = key
+        self.guest_mode = guest_mode
+        self.limit = limit
+        self.interval = interval
+        self.burst = burst
+        self.tokens_per_unit = tokens_per_unit
+        self.expected_response_tokens = expected_response_tokens
+        self._tat = 0.0
+
+    @classmethod
+    def from_settings(cls, key: str, guest_mode: bool) -> "QuotaEngine":
+        """
+        Build an engine for a user class from the application settings.
+
+        Args:
+            key: Limiter key of the user or guest session
+            guest_mode: Whether the user is in guest mode
+
+        Returns:
+            QuotaEngine: New engine
+        """
+        settings = get_settings()
+        limit = (settings.AUTHENTICATED_RATE_LIMIT
+                 if not guest_mode
+                 else settings.ANONYMOUS_RATE_LIMIT)
+        return cls(
+            key=key,
+            guest_mode=guest_mode,
+            limit=limit,
+            interval=settings.RATE_LIMIT_WINDOW_HOURS * 3600 / limit,
+            burst=max(1, round(limit * settings.RATE_LIMIT_BURST_RATIO)),
+            tokens_per_unit=(settings.RATE_LIMIT_TOKENS_PER_UNIT
+                             if settings.RATE_LIMIT_MODE == "tokens"
+                             else None),
+            expected_response_tokens=settings.RATE_LIMIT_EXPECTED_RESPONSE_TOKENS
+        )
+
+    def remaining(self) -> int:
+        """Units available now."""
+        return self._state().remaining
+
+    def reset_at(self) -> Optional[datetime]:
+        """Time when the full quota is available again, or None if it is."""
+        if self._tat <= time.time():
+            return None
+        return datetime.utcfromtimestamp(self._tat)
+
+    def retry_after(self) -> float:
+        """
+        Seconds until a question is allowed, by the quota or by a wait
+        the backend requested, whichever is later.
+        """
+        return max(self._state().retry_after, self.backend_wait())
+
+    def backend_wait(self) -> float:
+        """Seconds the backend asked this user, or the whole process, to wait."""
+        return get_backend_backoff().retry_after(self.key)
+
+    def refresh(self):
+        """Reload the quota from the store, picking up other tabs and replicas."""
+        self._hit(0)
+
+    def try_consume(self, cost: int = 1) -> bool:
+        """
+        Consume quota for a question.
+
+        The check and the consumption are a single atomic store operation,
+        so concurrent requests cannot exceed the limit.
+
+        Args:
+            cost: Units to consume, see ``estimate_cost``
+
+        Returns:
+            bool: True if the question is allowed
+        """
+        if self.backend_wait():
+            return False
+        result = self._hit(cost)
+        if result is not None and not result.allowed:
+            metrics.increment_counter("rate_limit.rejected", tags={"guest": str(self.guest_mode).lower()})
+            return False
+        return True
+
+    def adjust(self, delta: int):
+        """
+        Charge or refund units without an admission check.
+
+        Args:
+            delta: Units to charge, negative to refund
+        """
+        try:
+            result = get_limiter_store().adjust(self.key, delta, self.interval, self.burst)
+        except Exception as e:
+            logger.warning(f"Rate limiter store unavailable: {str(e)}")
+            metrics.increment_counter("rate_limit.store_errors")
+            return
+        self._tat = result.reset_at
+
+    def estimate_cost(self, prompt: str) -> int:
+        """
+        Estimate the units a question will cost before it is sent.
+
+        In the default ``questions`` mode every question costs 1. In
+        ``tokens`` mode a question costs one unit per
+        ``RATE_LIMIT_TOKENS_PER_UNIT`` estimated tokens of prompt plus an
+        expected response, so long requests use more quota.
+
+        Args:
+            prompt: User's input message
+
+        Returns:
+            int: Units to charge up front
+        """
+        if self.tokens_per_unit is None:
+            return 1
+        return self._tokens_to_units(estimate_tokens(prompt) + self.expected_response_tokens)
 
-def get_rate_limit_reset_time() -> Optional[datetime]:
+    def settle(self, charged: int, prompt: str, response: str, usage_tokens: Optional[int] = None):
+        """
+        Reconcile the units charged up front with the question's actual size.
+
+        Uses the token usage reported by the backend when available, which
+        also covers conversation context, and local estimates of the prompt
+        and response otherwise. Does nothing in ``questions`` mode.
+
+        Args:
+            charged: Units charged by ``try_consume``
+            prompt: User's input message
+            response: Complete AI response
+            usage_tokens: Total tokens reported by the backend, if any
+        """
+        if self.tokens_per_unit is None:
+            return
+
+        if usage_tokens is None:
+            usage_tokens = estimate_tokens(prompt) + estimate_tokens(response)
+            metrics.increment_counter("rate_limit.usage_estimated")
+        delta = self._tokens_to_units(usage_tokens) - charged
+        if delta:
+            self.adjust(delta)
+            metrics.increment_counter("rate_limit.units_reconciled", value=delta)
+
+    def record_backend_wait(self, retry_after: float, per_user: bool = True):
+        """
+        Mirror a wait requested by the backend into local admission control.
+
+        Args:
+            retry_after: Seconds the backend asked to wait
+            per_user: Whether the wait applies to this user only rather
+                than the whole process
+        """
+        get_backend_backoff().block(retry_after, self.key if per_user else None)
+        scope = "user" if per_user else "process"
+        metrics.increment_counter("rate_limit.backend_limited", tags={"scope": scope})
+        logger.info(f"Backend asked to wait {retry_after:.0f}s ({scope})")
+
+    def status_message(self) -> str:
+        """
+        Get a formatted message about the quota.
+
+        Returns:
+            str: Formatted rate limit message
+        """
+        remaining = self.remaining()
+        if (wait := self.retry_after()) > 0:
+            prefix = "No questions remaining. " if remaining <= 0 else ""
+            return f"{prefix}Next question available in {_format_duration(wait)}"
+
+        if (time_to_reset := self._tat - time.time()) > 0:
+            return (f"{remaining} questions remaining. "
+                    f"Fully replenished in {_format_duration(time_to_reset)}")
+        return f"{remaining} questions remaining"
+
+    def _state(self) -> LimitResult:
+        """Derive the current quota from the last known TAT."""
+        return gcra_result(True, self._tat, time.time(), 1, self.interval, self.burst)
+
+    def _hit(self, cost: int) -> Optional[LimitResult]:
+        """
+        Check and consume quota in the limiter store.
+
+        Returns:
+            Optional[LimitResult]: Store result, or None if the store failed,
+            in which case the request is allowed
+        """
+        try:
+            result = get_limiter_store().hit(self.key, cost, self.interval, self.burst)
+        except Exception as e:
+            # Fail open: an unavailable store must not take the chat down
+            logger.warning(f"Rate limiter store unavailable: {str(e)}")
+            metrics.increment_counter("rate_limit.store_errors")
+            return None
+        self._tat = result.reset_at
+        return result
+
+    def _tokens_to_units(self, tokens: int) -> int:
+        """Convert tokens to quota units, rounding up to at least one unit."""
+        return max(1, math.ceil(tokens / self.tokens_per_unit))
+
+def get_quota(guest_mode: Optional[bool] = None) -> QuotaEngine:
     """
-    Get the time when the rate limit will reset.
-    
+    Get the quota engine of the current session.
+
+    The engine is kept in the session state and rebuilt only when the
+    user logs in or out.
+
+    Args:
+        guest_mode: Whether the user is in guest mode; defaults to the
+            session's mode
+
     Returns:
-        Optional[datetime]: Time when rate limit will reset, or None if not set
+        QuotaEngine: Engine for the current user or guest session
     """
-    if "rate_limit_start" in st.session_state:
-        settings = get_settings()
-        return (st.session_state.rate_limit_start + 
-                timedelta(hours=settings.RATE_LIMIT_WINDOW_HOURS))
-    return None
+    if guest_mode is None:
+        guest_mode = st.session_state.get("guest_mode", True)
+
+    key = _limiter_key(guest_mode)
+    engine = st.session_state.get("quota_engine")
+    if engine is None or engine.key != key or engine.guest_mode != guest_mode:
+        engine = QuotaEngine.from_settings(key, guest_mode)
+        engine.refresh()
+        st.session_state.quota_engine = engine
+    return engine
 
-def format_rate_limit_message() -> str:
+def record_backend_rate_limit(guest_mode: bool, retry_after: float, per_user: bool = True):
     """
-    Get a formatted message about rate limit status.
-    
-    Returns:
-        str: Formatted rate limit message
+    Mirror a wait requested by the backend into local admission control.
+
+    Until the wait is over, ``QuotaEngine.try_consume`` rejects questions
+    without calling the backend.
+    A per-user wait applies to the current user or guest session in this
+    process; a process-wide wait, for an overloaded backend, to everyone.
+
+    Args:
+        guest_mode: Whether the user is in guest mode
+        retry_after: Seconds the backend asked to wait
+        per_user: Whether the wait applies to the current user only
     """
-    settings = get_settings()
-    questions_used = st.session_state.get("questions_used", 0)
-    guest_mode = st.session_state.get("guest_mode", True)
-    
-    limit = (settings.AUTHENTICATED_RATE_LIMIT 
-             if not guest_mode 
-             else settings.ANONYMOUS_RATE_LIMIT)
-    
-    remaining = limit - questions_used
-    
-    if reset_time := get_rate_limit_reset_time():
-        time_to_reset = reset_time - datetime.utcnow()
-        hours = int(time_to_reset.total_seconds() // 3600)
-        minutes = int((time_to_reset.total_seconds() % 3600) // 60)
-        
-        return (f"{remaining} questions remaining. "
-                f"Resets in {hours}h {minutes}m")
-    
-    return f"{remaining} questions remaining"
\ No newline at end of file
+    get_quota(guest_mode).record_backend_wait(retry_after, per_user)
+
+def _limiter_key(guest_mode: bool) -> str:
+    """Get the limiter key for the current user or guest client."""
+    if not guest_mode and (username := st.session_state.get("username")):
+        # Cognito usernames are case-insensitive; match the login throttle
+        return f"user:{username.strip().lower()}"
+    return f"guest:{get_requester_id()}"
+
+def _format_duration(seconds: float) -> str:
+    """Format a wait as hours and minutes, or minutes and seconds."""
+    seconds = math.ceil(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60}s"
+    return f"{seconds}s"
@@ -0,0 +1,101 @@
+"""
+Encrypted, signed session-resumption tokens kept in a browser cookie.
+"""
+from typing import Any, Dict, Optional
+from functools import lru_cache
+import json
+import zlib
+from .config import get_settings
+from .logger import logger
+
+# Browsers reject cookies larger than 4096 bytes including name and attributes
+MAX_TOKEN_BYTES = 3800
+
+class ResumptionCodec:
+    """
+    Seals authentication state into an opaque token and opens it again.
+
+    Tokens are Fernet tokens (AES-128-CBC encrypted, HMAC-SHA256 signed)
+    over zlib-compressed JSON, so the client can store them but can neither
+    read nor alter them. Several keys may be configured for rotation: new
+    tokens use the first key and any key opens them. Tokens older than
+    ``max_age`` seconds are rejected.
+    """
+    def __init__(self, keys: str, max_age: int):
+        from cryptography.fernet import Fernet, MultiFernet
+
+        self.max_age = max_age
+        self._fernet = MultiFernet([Fernet(key.strip()) for key in keys.split(",") if key.strip()])
+
+    def seal(self, state: Dict[str, Any]) -> Optional[str]:
+        """
+        Encrypt and sign authentication state.
+
+        Args:
+            state: JSON-serializable authentication state
+
+        Returns:
+            Optional[str]: Token, or None if it would not fit in a cookie
+        """
+        plaintext = zlib.compress(json.dumps(state, separators=(",", ":")).encode("utf-8"))
+        token = self._fernet.encrypt(plaintext).decode("ascii")
+        if len(token) > MAX_TOKEN_BYTES:
+            logger.warning(f"Session resumption token too large for a cookie ({len(token)} bytes)")
+            return None
+        return token
+
+    def open(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Verify and decrypt a token.
+
+        Args:
+            token: Token produced by ``seal``
+
+        Returns:
+            Optional[Dict[str, Any]]: Authentication state, or None if the
+            token was forged, tampered with, sealed with an unknown key or
+            is older than ``max_age``
+        """
+        from cryptography.fernet import InvalidToken
+
+        try:
+            plaintext = self._fernet.decrypt(token.encode("ascii"), ttl=self.max_age)
+            state = json.loads(zlib.decompress(plaintext))
+        except (InvalidToken, UnicodeEncodeError, zlib.error, ValueError):
+            return None
+        return state if isinstance(state, dict) else None
+
+@lru_cache()
+def get_resumption_codec() -> Optional[ResumptionCodec]:
+    """
+    Get the codec for the configured resumption keys.
+
+    Returns:
+        Optional[ResumptionCodec]: Shared codec, or None if session
+        resumption is not configured
+    """
+    settings = get_settings()
+    if not settings.SESSION_RESUMPTION_KEYS:
+        return None
+    return ResumptionCodec(settings.SESSION_RESUMPTION_KEYS, settings.SESSION_RESUMPTION_MAX_AGE_SECONDS)
+
+def build_resumption_state(username: Optional[str], access_token: str, refresh_token: str,
+                           expires_at: float) -> Dict[str, Any]:
+    """
+    Build the state stored in a resumption token.
+
+    Args:
+        username: Authenticated username
+        access_token: Cognito access token
+        refresh_token: Cognito refresh token
+        expires_at: Unix time at which the access token expires
+
+    Returns:
+        Dict[str, Any]: State for ``ResumptionCodec.seal``
+    """
+    return {
+        "u": username,
+        "a": access_token,
+        "r": refresh_token,
+        "e": int(expires_at)
+    }
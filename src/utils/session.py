@@ -1,21 +1,160 @@
 """
 Session management utilities for the frontend application.
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional
+import json
 import uuid
 from datetime import datetime
+import threading
 import streamlit as st
 from .config import get_settings
+from .logger import logger
+from .metrics import metrics
+from .resumption import build_resumption_state, get_resumption_codec
+
+# Requester identification problems already logged by this process
+_requester_warnings = set()
+_requester_warnings_lock = threading.Lock()
 
 def initialize_session_state():
-    """Initialize or reset the session state with default values."""
+    """
+    Initialize or reset the session state with default values.
+
+    A new session whose browser holds a valid resumption cookie gets its
+    authentication state restored locally, without a Cognito call.
+    """
     if "initialized" not in st.session_state:
         st.session_state.initialized = True
         st.session_state.session_id = str(uuid.uuid4())
         st.session_state.messages = []
-        st.session_state.questions_used = 0
         st.session_state.last_reset_time = datetime.utcnow()
         st.session_state.guest_mode = True
+        _resume_authentication()
+
+    _flush_resumption_cookie()
+
+def save_resumption_cookie(username: Optional[str], access_token: str, refresh_token: str,
+                           expires_at: float):
+    """
+    Queue the resumption cookie for the current authentication state.
+
+    The cookie is written to the browser at the start of the next run.
+
+    Args:
+        username: Authenticated username
+        access_token: Cognito access token
+        refresh_token: Cognito refresh token
+        expires_at: Unix time at which the access token expires
+    """
+    codec = get_resumption_codec()
+    if codec is None:
+        return
+    token = codec.seal(build_resumption_state(username, access_token, refresh_token, expires_at))
+    if token:
+        st.session_state.resumption_cookie_pending = token
+
+def clear_resumption_cookie():
+    """Queue removal of the resumption cookie from the browser."""
+    if get_resumption_codec() is not None:
+        st.session_state.resumption_cookie_pending = ""
+
+def _resume_authentication():
+    """Restore authentication state from a valid resumption cookie."""
+    codec = get_resumption_codec()
+    if codec is None:
+        return
+
+    token = _get_request_cookies().get(get_settings().SESSION_RESUMPTION_COOKIE)
+    if not token:
+        return
+
+    state = codec.open(token)
+    if state is None or not state.get("a") or not state.get("r"):
+        metrics.increment_counter("auth.resumption_rejected")
+        clear_resumption_cookie()
+        return
+
+    st.session_state.user_token = state["a"]
+    st.session_state.refresh_token = state["r"]
+    st.session_state.token_expires_at = state["e"]
+    if state.get("u"):
+        st.session_state.username = state["u"]
+    metrics.increment_counter("auth.resumed_sessions")
+
+def _get_request_cookies() -> Mapping[str, str]:
+    """Get the cookies sent with the session's initial request."""
+    # st.context is only available on Streamlit 1.37 and later
+    context = getattr(st, "context", None)
+    return getattr(context, "cookies", None) or {}
+
+def get_requester_id() -> str:
+    """
+    Identify the client behind the current session, for abuse limits.
+
+    Behind a reverse proxy (``TRUST_FORWARDED_FOR``) this is the address
+    the nearest proxy appended to ``X-Forwarded-For``; otherwise the remote
+    address, where Streamlit exposes it (1.45 and later). Falls back to
+    the session ID, which a reconnect resets. A warning is logged once per
+    process when the client cannot be identified or the configuration
+    looks wrong for the deployment.
+
+    Returns:
+        str: Requester identity
+    """
+    context = getattr(st, "context", None)
+    headers = getattr(context, "headers", None) or {}
+    forwarded = headers.get("X-Forwarded-For")
+
+    if get_settings().TRUST_FORWARDED_FOR:
+        if forwarded:
+            return "ip:" + forwarded.split(",")[-1].strip()
+        _warn_requester_once(
+            "no_forwarded_for",
+            "TRUST_FORWARDED_FOR is set but a request has no X-Forwarded-For header; "
+            "login throttling and guest quotas fall back to the session ID"
+        )
+    else:
+        if forwarded:
+            _warn_requester_once(
+                "untrusted_forwarded_for",
+                "Requests carry X-Forwarded-For but TRUST_FORWARDED_FOR is off; behind a "
+                "reverse proxy every client shares the proxy's address for login "
+                "throttling and guest quotas"
+            )
+        if ip_address := getattr(context, "ip_address", None):
+            return f"ip:{ip_address}"
+        _warn_requester_once(
+            "no_ip_address",
+            "Streamlit does not expose the client address (st.context.ip_address needs "
+            "1.45 or later); login throttling and guest quotas fall back to the "
+            "session ID, which a reconnect resets. Set TRUST_FORWARDED_FOR behind a "
+            "reverse proxy."
+        )
+    return f"session:{get_session_id()}"
+
+def _warn_requester_once(reason: str, message: str):
+    """Log a requester identification problem the first time it occurs."""
+    with _requester_warnings_lock:
+        if reason in _requester_warnings:
+            return
+        _requester_warnings.add(reason)
+    logger.warning(message)
+
+def _flush_resumption_cookie():
+    """Write or delete a queued resumption cookie in the browser."""
+    token = st.session_state.pop("resumption_cookie_pending", None)
+    if token is None:
+        return
+
+    import streamlit.components.v1 as components
+
+    settings = get_settings()
+    max_age = settings.SESSION_RESUMPTION_MAX_AGE_SECONDS if token else 0
+    cookie = f"{settings.SESSION_RESUMPTION_COOKIE}={token}; Max-Age={max_age}; Path=/; SameSite=Strict"
+    if settings.ENVIRONMENT != "development":
+        cookie += "; Secure"
+    # Components run in a same-origin iframe, so the app's cookie jar is the parent's
+    components.html(f"<script>window.parent.document.cookie = {json.dumps(cookie)};</script>", height=0)
 
 def get_session_id() -> str:
     """
@@ -32,7 +171,6 @@ def reset_session():
     """Reset the current chat session."""
     st.session_state.messages = []
     st.session_state.session_id = str(uuid.uuid4())
-    st.session_state.questions_used = 0
     st.session_state.last_reset_time = datetime.utcnow()
 
 def get_chat_history() -> List[Dict]:
@@ -66,40 +204,6 @@ def get_current_messages() -> List[Dict]:
     """
     return st.session_state.get("messages", [])
 
-def is_rate_limited() -> bool:
-    """
-    Check if the current session is rate limited.
-    
-    Returns:
-        bool: True if rate limited
-    """
-    settings = get_settings()
-    questions_used = st.session_state.get("questions_used", 0)
-    limit = (settings.AUTHENTICATED_RATE_LIMIT 
-             if not st.session_state.get("guest_mode") 
-             else settings.ANONYMOUS_RATE_LIMIT)
-    return questions_used >= limit
-
-def increment_question_count():
-    """Increment the question counter for rate limiting."""
-    if "questions_used" not in st.session_state:
-        st.session_state.questions_used = 0
-    st.session_state.questions_used += 1
-
-def get_remaining_questions() -> int:
-    """
-    Get remaining questions for the current time window.
-    
-    Returns:
-        int: Number of remaining questions
-    """
-    settings = get_settings()
-    questions_used = st.session_state.get("questions_used", 0)
-    limit = (settings.AUTHENTICATED_RATE_LIMIT 
-             if not st.session_state.get("guest_mode") 
-             else settings.ANONYMOUS_RATE_LIMIT)
-    return max(0, limit - questions_used)
-
 def set_session_metadata(metadata: Dict):
     """
     Set metadata for the current session.
@@ -0,0 +1,28 @@
+"""
+Fast local estimation of LLM token counts.
+"""
+import math
+import re
+
+# Runs of word characters, or single punctuation marks
+_PIECES = re.compile(r"\w+|[^\w\s]")
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens a BPE tokenizer produces for a text.
+
+    Takes the larger of the number of words and punctuation marks, and the
+    UTF-8 size divided by four. The first dominates for short, punctuated
+    English; the second for long words, code and non-Latin scripts, whose
+    characters take several bytes and roughly one token each. This is a
+    rough estimate for admission control, not an exact count.
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        int: Estimated token count
+    """
+    if not text:
+        return 0
+    return max(len(_PIECES.findall(text)), math.ceil(len(text.encode("utf-8")) / 4))
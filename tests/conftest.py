@@ -0,0 +1,8 @@
+"""
+Shared pytest configuration.
+"""
+import os
+import sys
+
+# The app imports its packages relative to src/, as Streamlit runs it
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -0,0 +1,93 @@
+"""Tests for the endpoint circuit breaker."""
+import pytest
+
+from services import circuit_breaker
+from services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return clock
+
+def make_breaker(**overrides):
+    options = dict(window_seconds=30.0, min_calls=4, error_rate_threshold=0.5, slow_call_seconds=10.0,
+                   slow_call_rate_threshold=0.8, open_seconds=15.0, half_open_calls=2)
+    options.update(overrides)
+    return CircuitBreaker(**options)
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record(0.1, success=False)
+    assert breaker.state == CLOSED and breaker.allow()
+
+def test_opens_on_error_rate(clock):
+    breaker = make_breaker()
+    for success in (True, True, False, False):
+        breaker.record(0.1, success=success)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after() == pytest.approx(15.0)
+
+def test_opens_on_slow_call_rate(clock):
+    breaker = make_breaker()
+    for latency in (12.0, 12.0, 12.0, 12.0):
+        breaker.record(latency, success=True)
+    assert breaker.state == OPEN
+
+def test_old_calls_leave_the_window(clock):
+    breaker = make_breaker()
+    breaker.record(0.1, success=False)
+    breaker.record(0.1, success=False)
+    clock.now += 31.0
+    for _ in range(4):
+        breaker.record(0.1, success=True)
+    assert breaker.state == CLOSED
+
+def test_half_open_probes_close_the_breaker(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record(0.1, success=False)
+    clock.now += 15.0
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() and breaker.allow()
+    assert not breaker.allow()
+    breaker.record(0.1, success=True)
+    assert breaker.state == HALF_OPEN
+    breaker.record(0.1, success=True)
+    assert breaker.state == CLOSED
+    # The window restarts empty after closing
+    breaker.record(0.1, success=False)
+    assert breaker.state == CLOSED
+
+def test_failed_probe_reopens(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record(0.1, success=False)
+    clock.now += 15.0
+
+    assert breaker.allow()
+    breaker.record(0.1, success=False)
+    assert breaker.state == OPEN
+    assert breaker.retry_after() == pytest.approx(15.0)
+
+def test_lost_probes_are_forgotten(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record(0.1, success=False)
+    clock.now += 15.0
+    assert breaker.allow() and breaker.allow()
+    assert not breaker.allow()
+
+    # Probes that never report back do not keep the breaker stuck
+    clock.now += 15.0
+    assert breaker.allow()
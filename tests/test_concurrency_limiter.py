@@ -0,0 +1,113 @@
+"""Tests for the adaptive (AIMD) concurrency limiter."""
+import threading
+import time
+
+import pytest
+
+from services.concurrency_limiter import AdaptiveConcurrencyLimiter, LatencyWindow
+from utils.exceptions import OverloadedError
+
+def make_limiter(**overrides):
+    options = dict(
+        initial_limit=4,
+        min_limit=1,
+        max_limit=10,
+        recent_window=5,
+        baseline_window=50,
+        min_baseline_samples=10,
+        max_queue=2,
+        queue_timeout=0.2,
+        priority_max_queue=2,
+        priority_queue_timeout=0.2
+    )
+    options.update(overrides)
+    return AdaptiveConcurrencyLimiter(**options)
+
+def fill(limiter):
+    """Acquire every slot and return their start times."""
+    return [limiter.acquire() for _ in range(limiter.limit)]
+
+def test_failure_decreases_limit_once_per_round():
+    limiter = make_limiter()
+    starts = fill(limiter)
+    for started in starts:
+        limiter.release(started, 0.1, success=False)
+    assert limiter.limit == 3  # 4 * 0.9, applied once
+    assert limiter.in_flight == 0
+
+def test_saturated_successes_increase_limit():
+    limiter = make_limiter()
+    for _ in range(8):
+        for started in fill(limiter):
+            limiter.release(started, 0.1, success=True)
+    assert limiter.limit > 4
+
+def test_unsaturated_successes_keep_limit():
+    limiter = make_limiter()
+    for _ in range(20):
+        limiter.release(limiter.acquire(), 0.1, success=True)
+    assert limiter.limit == 4
+
+def test_slow_endpoint_is_not_judged_by_a_fixed_target():
+    limiter = make_limiter()
+    # A buffered /chat answer routinely takes far longer than /chat/history
+    for _ in range(30):
+        limiter.release(limiter.acquire(), 0.05, success=True, endpoint="/chat/history")
+        limiter.release(limiter.acquire(), 20.0, success=True, endpoint="/chat")
+    assert limiter.limit == 4
+
+def test_latency_rising_over_baseline_decreases_limit():
+    limiter = make_limiter()
+    for _ in range(20):
+        limiter.release(limiter.acquire(), 1.0, success=True, endpoint="/chat")
+    for _ in range(5):
+        limiter.release(limiter.acquire(), 5.0, success=True, endpoint="/chat")
+    assert limiter.limit == 3
+
+def test_full_queue_sheds():
+    limiter = make_limiter(initial_limit=1, max_queue=0)
+    limiter.acquire()
+    with pytest.raises(OverloadedError) as info:
+        limiter.acquire(flow="other")
+    assert info.value.error_code == "OVERLOADED"
+
+def test_queued_request_times_out():
+    limiter = make_limiter(initial_limit=1)
+    limiter.acquire()
+    started = time.monotonic()
+    with pytest.raises(OverloadedError):
+        limiter.acquire(timeout=0.05)
+    assert time.monotonic() - started < 0.2
+    assert limiter.in_flight == 1
+
+def test_release_admits_priority_waiter_first():
+    limiter = make_limiter(initial_limit=1, max_limit=1)
+    held = limiter.acquire()
+    admitted = []
+
+    def wait(name, priority):
+        limiter.acquire(timeout=1.0, flow=name, priority=priority)
+        admitted.append(name)
+
+    guest = threading.Thread(target=wait, args=("guest", False))
+    guest.start()
+    time.sleep(0.02)
+    user = threading.Thread(target=wait, args=("user", True))
+    user.start()
+    time.sleep(0.02)
+
+    limiter.release(held, 0.1, success=True)
+    user.join(1.0)
+    assert admitted == ["user"]
+    limiter.release(time.monotonic(), 0.1, success=True)
+    guest.join(1.0)
+    assert admitted == ["user", "guest"]
+
+def test_baseline_rises_slowly():
+    window = LatencyWindow(recent_window=5, baseline_window=20, min_samples=5, max_rise=0.01)
+    for _ in range(20):
+        window.add(1.0)
+    for _ in range(20):
+        window.add(10.0)
+    # The baseline cannot have followed the jump within a fraction of a second
+    assert window.gradient() > 5
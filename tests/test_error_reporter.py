@@ -0,0 +1,110 @@
+"""Tests for background error report delivery."""
+import json
+import threading
+
+import pytest
+
+from services import error_reporter
+from services.circuit_breaker import CircuitBreaker
+from services.error_reporter import ErrorReporter
+from utils.metrics import metric_key, metrics
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def close(self):
+        pass
+
+class Session:
+    """Records posts; ``fail`` makes the next posts raise."""
+    def __init__(self):
+        self.posts = []
+        self.fail = 0
+        self.posted = threading.Event()
+
+    def post(self, url, data, headers, timeout):
+        if self.fail:
+            self.fail -= 1
+            self.posted.set()
+            raise RuntimeError("boom")
+        self.posts.append((url, json.loads(data), headers))
+        self.posted.set()
+        return Response(200)
+
+@pytest.fixture
+def session(monkeypatch):
+    session = Session()
+    breaker = CircuitBreaker(min_calls=1000)
+    monkeypatch.setattr(error_reporter, "get_http_session", lambda: session)
+    monkeypatch.setattr(error_reporter, "get_circuit_breaker", lambda endpoint: breaker)
+    session.breaker = breaker
+    return session
+
+def make_reporter(**overrides):
+    options = dict(base_url="http://backend", max_queue=10, workers=1, batch_size=10,
+                   flush_interval=0.05, timeout=1.0)
+    options.update(overrides)
+    return ErrorReporter(**options)
+
+def counter(name, **tags):
+    return metrics.metrics['counters'].get(metric_key(name, tags), 0)
+
+def test_single_report_keeps_original_payload(session):
+    reporter = make_reporter()
+    reporter.submit({"error_type": "APIError"}, {"X-Session-ID": "s1"})
+    reporter.shutdown()
+
+    [(url, payload, headers)] = session.posts
+    assert url == "http://backend/error"
+    assert payload == {"error_type": "APIError"}
+    assert headers["X-Session-ID"] == "s1"
+
+def test_reports_from_one_caller_are_batched(session):
+    reporter = make_reporter(flush_interval=0.5)
+    reporter.submit({"error_type": "A"}, {"X-Session-ID": "s1", "X-Client": "web"})
+    reporter.submit({"error_type": "B"}, {"X-Session-ID": "s2", "X-Client": "web"})
+    reporter.submit({"error_type": "C"}, {"X-Session-ID": "s3", "X-Client": "other"})
+    reporter.shutdown()
+
+    payloads = sorted((p for _, p, _ in session.posts), key=lambda p: "errors" not in p)
+    assert payloads[0] == {"errors": [
+        {"error_type": "A", "session_id": "s1"},
+        {"error_type": "B", "session_id": "s2"},
+    ]}
+    assert payloads[1] == {"error_type": "C"}
+
+def test_full_queue_drops_without_blocking(session):
+    # Stopped workers leave the queue to fill up
+    reporter = make_reporter(max_queue=2, workers=0)
+    dropped = counter("error_reports.dropped", reason="queue_full")
+    assert reporter.submit({}, {}) and reporter.submit({}, {})
+    assert not reporter.submit({}, {})
+    assert counter("error_reports.dropped", reason="queue_full") == dropped + 1
+
+def test_submit_after_shutdown_is_dropped(session):
+    reporter = make_reporter()
+    reporter.shutdown()
+    assert not reporter.submit({}, {})
+
+def test_worker_survives_send_and_encode_failures(session):
+    reporter = make_reporter()
+    session.fail = 1
+    reporter.submit({"error_type": "first"}, {})
+    assert session.posted.wait(1.0)
+    reporter.submit({"context": object()}, {"X-Client": "bad"})
+    reporter.submit({"error_type": "last"}, {"X-Client": "ok"})
+    reporter.shutdown()
+
+    assert [p for _, p, _ in session.posts] == [{"error_type": "last"}]
+
+def test_open_circuit_drops_reports(session):
+    session.breaker.min_calls = 1
+    session.breaker.record(0.0, success=False)
+    reporter = make_reporter()
+    dropped = counter("error_reports.dropped", reason="circuit_open")
+    reporter.submit({"error_type": "A"}, {})
+    reporter.shutdown()
+
+    assert session.posts == []
+    assert counter("error_reports.dropped", reason="circuit_open") == dropped + 1
@@ -0,0 +1,54 @@
+"""Tests for the two-lane weighted fair queue."""
+import time
+
+from services.fair_queue import FairQueue, PRIORITY, STANDARD
+
+def far_deadline():
+    return time.monotonic() + 60
+
+def drain(queue):
+    order = []
+    while (waiter := queue.pop()) is not None:
+        order.append((waiter.lane, waiter.flow))
+    return order
+
+def test_priority_lane_is_served_first():
+    queue = FairQueue({PRIORITY: 10, STANDARD: 10})
+    queue.push("guest", STANDARD, far_deadline())
+    queue.push("user", PRIORITY, far_deadline())
+    assert drain(queue) == [(PRIORITY, "user"), (STANDARD, "guest")]
+
+def test_busy_flow_does_not_starve_others():
+    queue = FairQueue({PRIORITY: 10, STANDARD: 10})
+    for _ in range(5):
+        queue.push("chatty", STANDARD, far_deadline())
+    queue.push("quiet", STANDARD, far_deadline())
+    flows = [flow for _, flow in drain(queue)]
+    assert flows.index("quiet") <= 1
+
+def test_flows_are_interleaved_by_weight():
+    queue = FairQueue({PRIORITY: 10, STANDARD: 10})
+    for _ in range(4):
+        queue.push("heavy", STANDARD, far_deadline(), weight=2.0)
+        queue.push("light", STANDARD, far_deadline())
+    flows = [flow for _, flow in drain(queue)][:6]
+    assert flows.count("heavy") == 4
+
+def test_full_lane_rejects_without_affecting_other_lane():
+    queue = FairQueue({PRIORITY: 1, STANDARD: 1})
+    assert queue.push("a", STANDARD, far_deadline()) is not None
+    assert queue.push("b", STANDARD, far_deadline()) is None
+    assert queue.push("c", PRIORITY, far_deadline()) is not None
+    assert len(queue) == 2
+
+def test_expired_and_cancelled_waiters_are_skipped():
+    queue = FairQueue({PRIORITY: 10, STANDARD: 10})
+    expired = queue.push("late", STANDARD, time.monotonic() - 1)
+    cancelled = queue.push("gone", STANDARD, far_deadline())
+    queue.push("live", STANDARD, far_deadline())
+    queue.cancel(cancelled)
+
+    assert drain(queue) == [(STANDARD, "live")]
+    assert expired.cancelled
+    assert len(queue) == 0
+    assert queue.size(STANDARD) == 0
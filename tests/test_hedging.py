@@ -0,0 +1,80 @@
+"""Tests for hedged requests."""
+import threading
+import time
+
+from services.hedging import Hedger
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+def scripted(*steps):
+    """Build a request whose n-th call sleeps and returns the n-th step."""
+    calls = iter(steps)
+    lock = threading.Lock()
+    responses = []
+
+    def request():
+        with lock:
+            delay, status = next(calls)
+        time.sleep(delay)
+        response = Response(status)
+        responses.append(response)
+        return response
+
+    request.responses = responses
+    return request
+
+def make_hedger(max_workers=4):
+    return Hedger(max_workers=max_workers, budget_ratio=1.0)
+
+def test_fast_primary_is_not_hedged():
+    request = scripted((0.0, 200))
+    assert make_hedger().run(request, delay=0.5, name="test").status_code == 200
+    assert len(request.responses) == 1
+
+def test_no_delay_runs_inline():
+    request = scripted((0.0, 200))
+    assert make_hedger().run(request, delay=None, name="test").status_code == 200
+
+def test_hedge_beats_slow_primary_and_loser_is_closed():
+    request = scripted((0.3, 200), (0.0, 201))
+    response = make_hedger().run(request, delay=0.05, name="test")
+    assert response.status_code == 201
+
+    time.sleep(0.35)
+    primary = next(r for r in request.responses if r.status_code == 200)
+    assert primary.closed
+
+def test_non_2xx_hedge_does_not_beat_primary():
+    # The hedge is refused while the primary with the same key is in flight
+    request = scripted((0.2, 200), (0.0, 409))
+    assert make_hedger().run(request, delay=0.05, name="test").status_code == 200
+
+def test_primary_outcome_is_returned_when_both_fail():
+    request = scripted((0.1, 503), (0.0, 429))
+    assert make_hedger().run(request, delay=0.05, name="test").status_code == 503
+
+def test_slot_is_held_until_loser_finishes():
+    hedger = make_hedger(max_workers=2)
+    # Won by the hedge; the slow primary keeps a worker busy afterwards
+    hedger.run(scripted((0.5, 200), (0.0, 200)), delay=0.05, name="test")
+
+    threads = []
+
+    def request():
+        threads.append(threading.current_thread())
+        return Response(200)
+
+    # No worker is free, so the call runs inline instead of queueing behind the loser
+    hedger.run(request, delay=0.05, name="test")
+    assert threads == [threading.current_thread()]
+
+    time.sleep(0.5)
+    threads.clear()
+    hedger.run(request, delay=0.05, name="test")
+    assert threads != [threading.current_thread()]
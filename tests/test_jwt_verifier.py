@@ -0,0 +1,145 @@
+"""
+Tests for local JWT verification with locally generated RSA keys.
+"""
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt import JWT, jwk_from_pem
+
+from services.fake_cognito import FakeCognitoClient
+from services.jwt_verifier import JWTVerifier
+from utils.exceptions import AuthError
+
+ISSUER = "https://cognito-idp.us-west-2.amazonaws.com/us-west-2_test"
+CLIENT_ID = "test-client"
+
+def _generate_key():
+    """Generate an RSA signing key as a JWK."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return jwk_from_pem(private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ))
+
+class FakeJWKS:
+    """JWKS endpoint serving public keys, counting fetches."""
+    def __init__(self, keys):
+        self.keys = keys
+        self.fetches = 0
+        self.error = None
+
+    def __call__(self):
+        self.fetches += 1
+        if self.error:
+            raise self.error
+        return {"keys": [{**key.to_dict(public_only=True), "kid": kid, "alg": "RS256"}
+                         for kid, key in self.keys.items()]}
+
+@pytest.fixture(scope="module")
+def signing_key():
+    return _generate_key()
+
+@pytest.fixture
+def jwks(signing_key):
+    return FakeJWKS({"key-1": signing_key})
+
+@pytest.fixture
+def verifier(jwks):
+    return JWTVerifier(issuer=ISSUER, client_id=CLIENT_ID, fetch_jwks=jwks, leeway=0)
+
+def make_token(key, kid="key-1", token_use="access", **overrides):
+    """Sign a Cognito-shaped token."""
+    claims = {
+        "sub": "user-123",
+        "iss": ISSUER,
+        "token_use": token_use,
+        "exp": int(time.time()) + 3600,
+        "iat": int(time.time()),
+    }
+    claims["client_id" if token_use == "access" else "aud"] = CLIENT_ID
+    claims.update(overrides)
+    return JWT().encode(claims, key, alg="RS256", optional_headers={"kid": kid})
+
+def assert_rejected(verifier, token, error_code):
+    with pytest.raises(AuthError) as info:
+        verifier.verify(token)
+    assert info.value.error_code == error_code
+
+def test_valid_access_token(verifier, signing_key):
+    claims = verifier.verify(make_token(signing_key))
+    assert claims["sub"] == "user-123"
+
+def test_valid_id_token(verifier, signing_key):
+    claims = verifier.verify(make_token(signing_key, token_use="id"))
+    assert claims["aud"] == CLIENT_ID
+
+def test_verified_claims_are_memoized(verifier, jwks, signing_key):
+    token = make_token(signing_key)
+    verifier.verify(token)
+    verifier.verify(token)
+    assert jwks.fetches == 1
+
+def test_unknown_kid_is_rejected_and_refreshes_once(verifier, jwks, signing_key):
+    verifier.verify(make_token(signing_key))
+    assert_rejected(verifier, make_token(signing_key, kid="other"), "INVALID_TOKEN")
+    assert_rejected(verifier, make_token(signing_key, kid="other"), "INVALID_TOKEN")
+    # The first unknown kid is inside the refresh interval of the initial fetch
+    assert jwks.fetches == 1
+
+def test_rotated_key_is_fetched(jwks, signing_key):
+    verifier = JWTVerifier(issuer=ISSUER, client_id=CLIENT_ID, fetch_jwks=jwks, min_refresh_interval=0)
+    verifier.verify(make_token(signing_key))
+    rotated = _generate_key()
+    jwks.keys["key-2"] = rotated
+    assert verifier.verify(make_token(rotated, kid="key-2"))["sub"] == "user-123"
+    assert jwks.fetches == 2
+
+def test_forged_signature_is_rejected(verifier):
+    assert_rejected(verifier, make_token(_generate_key()), "INVALID_TOKEN")
+
+def test_unsigned_token_is_rejected(verifier):
+    header = "eyJhbGciOiJub25lIiwia2lkIjoia2V5LTEifQ"  # {"alg":"none","kid":"key-1"}
+    assert_rejected(verifier, f"{header}.e30.", "INVALID_TOKEN")
+
+def test_expired_token_is_rejected(verifier, signing_key):
+    token = make_token(signing_key, exp=int(time.time()) - 10)
+    assert_rejected(verifier, token, "TOKEN_EXPIRED")
+
+def test_wrong_issuer_is_rejected(verifier, signing_key):
+    token = make_token(signing_key, iss="https://cognito-idp.us-west-2.amazonaws.com/us-west-2_other")
+    assert_rejected(verifier, token, "INVALID_TOKEN")
+
+def test_wrong_client_id_is_rejected(verifier, signing_key):
+    assert_rejected(verifier, make_token(signing_key, client_id="other-client"), "INVALID_TOKEN")
+
+def test_wrong_audience_is_rejected(verifier, signing_key):
+    assert_rejected(verifier, make_token(signing_key, token_use="id", aud="other-client"), "INVALID_TOKEN")
+
+def test_unexpected_token_use_is_rejected(verifier, signing_key):
+    assert_rejected(verifier, make_token(signing_key, token_use="refresh"), "INVALID_TOKEN")
+
+def test_failed_jwks_fetch_is_retried_not_reported_as_invalid(verifier, jwks, signing_key):
+    jwks.error = AuthError("Failed to fetch signing keys", error_code="JWKS_UNAVAILABLE")
+    token = make_token(signing_key)
+    assert_rejected(verifier, token, "JWKS_UNAVAILABLE")
+    assert_rejected(verifier, token, "JWKS_UNAVAILABLE")
+    assert jwks.fetches == 2
+
+    jwks.error = None
+    assert verifier.verify(token)["sub"] == "user-123"
+
+def test_fake_cognito_tokens_verify_against_its_jwks():
+    fake = FakeCognitoClient(latency=0, latency_jitter=0, auto_confirm=True, issuer=ISSUER)
+    fake.sign_up(ClientId=CLIENT_ID, Username="alice", Password="correct-horse")
+    tokens = fake.initiate_auth(
+        AuthFlow="USER_PASSWORD_AUTH",
+        AuthParameters={"USERNAME": "alice", "PASSWORD": "correct-horse"},
+        ClientId=CLIENT_ID
+    )["AuthenticationResult"]
+
+    verifier = JWTVerifier(issuer=ISSUER, client_id=CLIENT_ID, fetch_jwks=fake.jwks)
+    assert verifier.verify(tokens["AccessToken"])["token_use"] == "access"
+    assert verifier.verify(tokens["IdToken"])["token_use"] == "id"
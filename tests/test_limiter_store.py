@@ -0,0 +1,149 @@
+"""
+GCRA behaviour shared by every limiter store backend.
+
+Each test runs against the memory and SQLite stores, the Redis store
+against the stand-in server from ``benchmarks/redis_standin.py``, and the
+Redis store with its Lua scripts run by an embedded Lua interpreter. The
+last two need the ``redis`` and ``lupa`` packages and are skipped without
+them.
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from utils import limiter_store
+from utils.limiter_store import MemoryLimiterStore, RedisLimiterStore, SQLiteLimiterStore, apply_gcra
+
+BENCHMARKS_DIR = os.path.join(os.path.dirname(__file__), "..", "benchmarks")
+
+class LuaRedis:
+    """In-process Redis client that runs registered scripts with Lua."""
+    def __init__(self, lupa):
+        self.data = {}
+        self._lock = threading.Lock()
+        self._lua = lupa.LuaRuntime(unpack_returned_tuples=True)
+        self._lua.execute("redis = {}")
+        self._lua.globals().redis.call = self._call
+
+    def _call(self, command, key, *args):
+        if command == "GET":
+            return self.data.get(key)
+        if command == "SET":
+            self.data[key] = args[0]
+            return "OK"
+        if command == "DEL":
+            return int(self.data.pop(key, None) is not None)
+        raise ValueError(f"Unsupported command {command}")
+
+    def register_script(self, script):
+        function = self._lua.eval(f"function(KEYS, ARGV) {script} end")
+
+        def run(keys, args):
+            table = self._lua.table_from
+            with self._lock:
+                result = function(table(keys), table([str(arg) for arg in args]))
+            if hasattr(result, "values"):
+                # Redis converts Lua numbers in a table reply to integers
+                return [value.encode() if isinstance(value, str) else int(value) for value in result.values()]
+            return result.encode()
+        return run
+
+@pytest.fixture(params=["memory", "sqlite", "redis-standin", "redis-lua"])
+def store(request, tmp_path, monkeypatch):
+    if request.param == "memory":
+        return MemoryLimiterStore()
+    if request.param == "sqlite":
+        return SQLiteLimiterStore(str(tmp_path / "limits.db"))
+
+    redis = pytest.importorskip("redis")
+    if request.param == "redis-standin":
+        sys.path.insert(0, BENCHMARKS_DIR)
+        try:
+            import redis_standin
+        finally:
+            sys.path.remove(BENCHMARKS_DIR)
+        server = redis_standin.serve_in_background()
+        request.addfinalizer(server.shutdown)
+        host, port = server.server_address
+        return RedisLimiterStore(f"redis://{host}:{port}/0", key_prefix="test:")
+
+    client = LuaRedis(pytest.importorskip("lupa"))
+    monkeypatch.setattr(redis.Redis, "from_url", classmethod(lambda cls, *args, **kwargs: client))
+    return RedisLimiterStore("redis://lua", key_prefix="test:")
+
+def test_new_key_allows_burst_then_rejects(store):
+    results = [store.hit("k", 1, 60.0, 3) for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results] == [2, 1, 0, 0]
+    assert results[3].retry_after == pytest.approx(60.0, abs=1.0)
+
+def test_cost_above_one_needs_that_many_units(store):
+    assert store.hit("k", 2, 60.0, 3).remaining == 1
+    rejected = store.hit("k", 2, 60.0, 3)
+    assert not rejected.allowed
+    assert rejected.retry_after == pytest.approx(60.0, abs=1.0)
+    # A rejected request consumes nothing
+    assert store.hit("k", 1, 60.0, 3).allowed
+
+def test_zero_cost_only_checks(store):
+    for _ in range(5):
+        result = store.hit("k", 0, 60.0, 1)
+        assert result.allowed and result.remaining == 1
+    assert store.hit("k", 1, 60.0, 1).allowed
+    assert not store.hit("k", 0, 60.0, 1).allowed
+
+def test_units_replenish_over_time(store):
+    assert store.hit("k", 1, 0.05, 1).allowed
+    assert not store.hit("k", 1, 0.05, 1).allowed
+    time.sleep(0.08)
+    assert store.hit("k", 1, 0.05, 1).allowed
+
+def test_keys_are_independent(store):
+    assert store.hit("a", 1, 60.0, 1).allowed
+    assert not store.hit("a", 1, 60.0, 1).allowed
+    assert store.hit("b", 1, 60.0, 1).allowed
+
+def test_refund_returns_units_but_not_beyond_burst(store):
+    store.hit("k", 2, 60.0, 3)
+    assert store.adjust("k", -1, 60.0, 3).remaining == 2
+    assert store.adjust("k", -10, 60.0, 3).remaining == 3
+    assert [store.hit("k", 1, 60.0, 3).allowed for _ in range(4)] == [True, True, True, False]
+
+def test_charge_can_exceed_remaining(store):
+    store.hit("k", 1, 60.0, 3)
+    result = store.adjust("k", 4, 60.0, 3)
+    assert result.remaining == 0
+    assert result.retry_after == pytest.approx(3 * 60.0, abs=1.0)
+    assert not store.hit("k", 1, 60.0, 3).allowed
+
+def test_concurrent_hits_admit_exactly_the_burst(store):
+    allowed = []
+    lock = threading.Lock()
+    start = threading.Barrier(8)
+
+    def worker():
+        start.wait()
+        for _ in range(10):
+            result = store.hit("shared", 1, 60.0, 25)
+            with lock:
+                allowed.append(result.allowed)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert allowed.count(True) == 25
+
+def test_apply_gcra_matches_lua_transition():
+    # Shared by all backends: a new key starts at now, consumption moves the TAT
+    assert apply_gcra(None, 100.0, 1, 10.0, 2) == (True, 110.0, True)
+    assert apply_gcra(115.0, 100.0, 1, 10.0, 2) == (False, 115.0, False)
+    assert apply_gcra(50.0, 100.0, 0, 10.0, 2) == (True, 100.0, False)
+
+def test_scripts_are_defined():
+    assert "redis.call" in limiter_store.GCRA_SCRIPT
+    assert "redis.call" in limiter_store.ADJUST_SCRIPT
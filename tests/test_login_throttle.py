@@ -0,0 +1,110 @@
+"""Tests for the failed-login throttle."""
+import pytest
+
+from services import login_throttle
+from services.login_throttle import LoginThrottle
+
+CLIENT = "client"
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(login_throttle, "time", clock)
+    return clock
+
+def make_throttle(**overrides):
+    options = dict(free_attempts=3, requester_free_attempts=5, username_free_attempts=4,
+                   username_max_delay=5.0, base_lockout=1.0, max_lockout=8.0, reset_after=3600.0)
+    options.update(overrides)
+    return LoginThrottle(**options)
+
+def fail(throttle, username, requester, times=1):
+    for _ in range(times):
+        throttle.record_failure(CLIENT, username, requester)
+
+def test_free_attempts_then_exponential_lockout(clock):
+    throttle = make_throttle()
+    fail(throttle, "alice", "ip:1", 3)
+    assert throttle.check(CLIENT, "alice", "ip:1") == 0.0
+
+    fail(throttle, "alice", "ip:1")
+    assert throttle.check(CLIENT, "alice", "ip:1") == pytest.approx(1.0)
+    fail(throttle, "alice", "ip:1")
+    assert throttle.check(CLIENT, "alice", "ip:1") == pytest.approx(2.0)
+    fail(throttle, "alice", "ip:1", 5)
+    assert throttle.check(CLIENT, "alice", "ip:1") == pytest.approx(8.0)
+
+def test_lockout_is_per_requester(clock):
+    throttle = make_throttle()
+    fail(throttle, "alice", "ip:1", 4)
+    assert throttle.check(CLIENT, "alice", "ip:1") > 0
+    assert throttle.check(CLIENT, "alice", "ip:2") == 0.0
+
+def test_usernames_are_normalized(clock):
+    throttle = make_throttle()
+    fail(throttle, "Alice ", "ip:1", 4)
+    assert throttle.check(CLIENT, "alice", "ip:1") > 0
+
+def test_requester_key_throttles_spraying(clock):
+    throttle = make_throttle()
+    for n in range(6):
+        fail(throttle, f"user{n}", "ip:1")
+    assert throttle.check(CLIENT, "someone-else", "ip:1") == pytest.approx(1.0)
+    assert throttle.check(CLIENT, "someone-else", "ip:2") == 0.0
+
+def test_success_clears_username_but_not_requester(clock):
+    throttle = make_throttle()
+    for n in range(5):
+        fail(throttle, f"user{n}", "ip:1")
+    fail(throttle, "alice", "ip:1", 3)
+    assert throttle.check(CLIENT, "alice", "ip:1") > 0
+
+    throttle.record_success(CLIENT, "alice", "ip:1")
+    # The requester has 8 failures across usernames and stays locked
+    assert throttle.check(CLIENT, "alice", "ip:1") > 0
+    clock.now += 10.0
+    assert throttle.check(CLIENT, "alice", "ip:1") == 0.0
+    assert throttle.pace(CLIENT, "alice") == 0.0
+
+def test_failures_reset_after_quiet_period(clock):
+    throttle = make_throttle()
+    fail(throttle, "alice", "ip:1", 4)
+    clock.now += 3601.0
+    assert throttle.check(CLIENT, "alice", "ip:1") == 0.0
+    fail(throttle, "alice", "ip:1")
+    assert throttle.check(CLIENT, "alice", "ip:1") == 0.0
+
+def test_pace_spaces_attempts_without_locking(clock):
+    throttle = make_throttle()
+    # Many requesters, each below its own lockout
+    for n in range(4):
+        fail(throttle, "alice", f"ip:{n}")
+    assert throttle.pace(CLIENT, "alice") == 0.0
+
+    fail(throttle, "alice", "ip:9")
+    # First excess failure: spacing of base_lockout between attempts
+    assert throttle.pace(CLIENT, "alice") == 0.0
+    assert throttle.pace(CLIENT, "alice") == pytest.approx(1.0)
+    assert throttle.pace(CLIENT, "alice") == pytest.approx(2.0)
+    # Never locked out: check only consults requester keys
+    assert throttle.check(CLIENT, "alice", "ip:new") == 0.0
+
+def test_pace_wait_is_bounded(clock):
+    throttle = make_throttle(username_max_delay=3.0)
+    for n in range(20):
+        fail(throttle, "alice", f"ip:{n}")
+    waits = [throttle.pace(CLIENT, "alice") for _ in range(10)]
+    assert max(waits) == pytest.approx(3.0)
+
+def test_entries_are_bounded(clock):
+    throttle = make_throttle(max_entries=10)
+    for n in range(20):
+        fail(throttle, f"user{n}", f"ip:{n}")
+    assert len(throttle._entries) == 10
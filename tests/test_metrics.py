@@ -0,0 +1,43 @@
+"""
+Tests for the local metrics collector.
+"""
+import threading
+
+from utils.metrics import MetricsCollector, metric_key
+
+def test_metric_key_sorts_tags():
+    assert metric_key("api.retries") == "api.retries"
+    assert metric_key("api.retries", {"reason": "timeout", "endpoint": "/chat"}) == \
+        "api.retries[endpoint=/chat,reason=timeout]"
+
+def test_tagged_counters_are_kept_apart():
+    collector = MetricsCollector()
+    collector.increment_counter("api.retries", tags={"reason": "timeout"})
+    collector.increment_counter("api.retries", tags={"reason": "timeout"})
+    collector.increment_counter("api.retries", tags={"reason": "status"})
+    collector.increment_counter("api.retries")
+
+    counters = collector.metrics['counters']
+    assert counters["api.retries[reason=timeout]"] == 2
+    assert counters["api.retries[reason=status]"] == 1
+    assert counters["api.retries"] == 1
+
+def test_gauges_are_keyed_by_tags():
+    collector = MetricsCollector()
+    collector.set_gauge("api.limit", 10, tags={"lane": "priority"})
+    collector.set_gauge("api.limit", 4, tags={"lane": "other"})
+    assert collector.metrics['gauges'] == {"api.limit[lane=priority]": 10, "api.limit[lane=other]": 4}
+
+def test_concurrent_increments_are_not_lost():
+    collector = MetricsCollector()
+
+    def worker():
+        for _ in range(2000):
+            collector.increment_counter("hits")
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert collector.metrics['counters']["hits"] == 16000
@@ -0,0 +1,74 @@
+"""Tests for the session-resumption cookie codec."""
+import os
+import time
+
+import pytest
+
+pytest.importorskip("cryptography")
+from cryptography.fernet import Fernet
+
+from utils import resumption
+from utils.resumption import MAX_TOKEN_BYTES, ResumptionCodec, build_resumption_state
+
+@pytest.fixture
+def key():
+    return Fernet.generate_key().decode()
+
+def state():
+    return build_resumption_state("alice", "access", "refresh", 1700000000.9)
+
+def test_round_trip(key):
+    codec = ResumptionCodec(key, max_age=3600)
+    token = codec.seal(state())
+    assert "alice" not in token and "refresh" not in token
+    assert codec.open(token) == {"u": "alice", "a": "access", "r": "refresh", "e": 1700000000}
+
+def test_tampered_and_garbage_tokens_are_rejected(key):
+    codec = ResumptionCodec(key, max_age=3600)
+    token = codec.seal(state())
+    tampered = token[:-6] + ("A" if token[-6] != "A" else "B") + token[-5:]
+    assert codec.open(tampered) is None
+    assert codec.open("not-a-token") is None
+    assert codec.open("é") is None
+
+def test_unknown_key_is_rejected(key):
+    token = ResumptionCodec(key, max_age=3600).seal(state())
+    assert ResumptionCodec(Fernet.generate_key().decode(), max_age=3600).open(token) is None
+
+def test_key_rotation(key):
+    old_token = ResumptionCodec(key, max_age=3600).seal(state())
+    new_key = Fernet.generate_key().decode()
+    rotated = ResumptionCodec(f"{new_key}, {key}", max_age=3600)
+
+    assert rotated.open(old_token)["u"] == "alice"
+    # New tokens use the first key only
+    assert ResumptionCodec(new_key, max_age=3600).open(rotated.seal(state()))["u"] == "alice"
+
+def test_expired_token_is_rejected(key, monkeypatch):
+    codec = ResumptionCodec(key, max_age=60)
+    token = codec.seal(state())
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 120)
+    assert codec.open(token) is None
+
+def test_oversized_state_is_not_sealed(key):
+    codec = ResumptionCodec(key, max_age=3600)
+    # Random-looking data does not compress below the cookie limit
+    big = os.urandom(MAX_TOKEN_BYTES).hex()
+    assert codec.seal({"a": big}) is None
+
+def test_non_dict_state_is_rejected(key):
+    codec = ResumptionCodec(key, max_age=3600)
+    assert codec.open(codec.seal(["not", "a", "dict"])) is None
+
+def test_codec_requires_configured_keys(monkeypatch):
+    class Settings:
+        SESSION_RESUMPTION_KEYS = ""
+        SESSION_RESUMPTION_MAX_AGE_SECONDS = 60
+
+    resumption.get_resumption_codec.cache_clear()
+    monkeypatch.setattr(resumption, "get_settings", lambda: Settings)
+    try:
+        assert resumption.get_resumption_codec() is None
+    finally:
+        resumption.get_resumption_codec.cache_clear()
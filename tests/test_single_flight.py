@@ -0,0 +1,94 @@
+"""Tests for request coalescing."""
+import threading
+import time
+
+import pytest
+
+from services.single_flight import SingleFlight
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight(ttl_seconds=0.0, max_entries=10)
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(1.0)
+        return [{"role": "user"}]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", fetch))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [[{"role": "user"}]] * 5
+    # Every caller gets its own copy
+    assert len({id(result) for result in results}) == 5
+
+def test_error_is_shared_and_not_cached():
+    flight = SingleFlight(ttl_seconds=60.0, max_entries=10)
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(1.0)
+        raise ValueError("backend down")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("k", fail)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    assert started.wait(1.0)
+    follower = threading.Thread(target=call)
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert len(errors) == 2
+    assert flight.do("k", lambda: "recovered") == "recovered"
+
+def test_results_are_cached_for_the_ttl():
+    flight = SingleFlight(ttl_seconds=0.05, max_entries=10)
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 1
+    time.sleep(0.08)
+    assert flight.do("k", lambda: 3) == 3
+
+def test_cached_result_cannot_be_mutated_by_callers():
+    flight = SingleFlight(ttl_seconds=60.0, max_entries=10)
+    flight.do("k", lambda: [1]).append(2)
+    assert flight.do("k", lambda: None) == [1]
+
+def test_invalidate_and_eviction():
+    flight = SingleFlight(ttl_seconds=60.0, max_entries=2)
+    for key in ("a", "b", "c"):
+        flight.do(key, lambda key=key: key)
+    # "a" was evicted as least recently used
+    assert flight.do("a", lambda: "new") == "new"
+    flight.invalidate("c")
+    assert flight.do("c", lambda: "fresh") == "fresh"
+
+def test_keys_do_not_share_results():
+    flight = SingleFlight(ttl_seconds=60.0, max_entries=10)
+    assert flight.do(("alice", "/chat/history"), lambda: "a") == "a"
+    assert flight.do(("bob", "/chat/history"), lambda: "b") == "b"
+
+@pytest.mark.parametrize("ttl", [0.0, 60.0])
+def test_leader_error_propagates(ttl):
+    flight = SingleFlight(ttl_seconds=ttl, max_entries=10)
+    with pytest.raises(KeyError):
+        flight.do("k", lambda: {}["missing"])